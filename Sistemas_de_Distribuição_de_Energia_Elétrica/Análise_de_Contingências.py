@@ -0,0 +1,283 @@
+import os
+import time
+import numpy as np
+import scipy.sparse as sp
+from concurrent.futures import ProcessPoolExecutor
+
+from Fluxo_de_Carga_Probabilístico import anexar_arrays, liberar_blocos, publicar_arrays
+from Matriz_de_Admitância_Esparsa import quadripolos
+from Método_de_Newton_Desacoplado_Rápido import fatorar_matrizes_b, fluxo_desacoplado_rapido, matrizes_b
+from Método_de_Newton_N_Barras import newton_raphson_n_barras
+
+
+class FatoracaoCorrigida:
+    """Resolve (A + U C Uᵀ) x = b reaproveitando a fatoração LU de A (Sherman–Morrison–Woodbury)
+
+    U tem uma coluna unitária para cada índice afetado (1 ou 2 para a saída de
+    um ramo). A construção custa k substituições com A; cada solve custa uma
+    substituição com A e um sistema k x k.
+    """
+
+    def __init__(self, lu, indices, C):
+        self.lu = lu
+        self.shape = lu.shape
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.C = np.asarray(C, dtype=float)
+
+        k = self.indices.size
+        E = np.zeros((lu.shape[0], k))
+        E[self.indices, np.arange(k)] = 1.0
+        self.W = lu.solve(E) if k else E
+        self.capacitancia = np.eye(k) + self.C @ self.W[self.indices]
+        self.singular = k > 0 and abs(np.linalg.det(self.capacitancia)) < 1e-9
+
+    def solve(self, b):
+        x = self.lu.solve(b)
+        if self.indices.size == 0:
+            return x
+        return x - self.W @ np.linalg.solve(self.capacitancia, self.C @ x[self.indices])
+
+
+class _YbusSemRamo:
+    """Produto Ybus @ V com um ramo retirado, sem copiar a matriz"""
+
+    def __init__(self, Ybus, f, t, Y_ff, Y_ft, Y_tf, Y_tt):
+        self.Ybus = Ybus
+        self.shape = Ybus.shape
+        self.f, self.t = f, t
+        self.Y = (Y_ff, Y_ft, Y_tf, Y_tt)
+
+    def __matmul__(self, V):
+        Y_ff, Y_ft, Y_tf, Y_tt = self.Y
+        I = self.Ybus @ V
+        I[self.f] -= Y_ff * V[self.f] + Y_ft * V[self.t]
+        I[self.t] -= Y_tf * V[self.f] + Y_tt * V[self.t]
+        return I
+
+    def matriz(self):
+        """Ybus do caso de contingência montada explicitamente (para a solução completa)"""
+        Y_ff, Y_ft, Y_tf, Y_tt = self.Y
+        delta = sp.coo_matrix(([-Y_ff, -Y_ft, -Y_tf, -Y_tt], ([self.f, self.f, self.t, self.t],
+                                                              [self.f, self.t, self.f, self.t])), shape=self.shape)
+        return (self.Ybus + delta).tocsr()
+
+
+def fluxos_ramos(V, de, para, z_serie, y_shunt=None, tap=None):
+    """Potências (S_de, S_para) que entram em cada ramo pelas suas extremidades"""
+    Y_ff, Y_ft, Y_tf, Y_tt = quadripolos(z_serie, y_shunt, tap)
+    S_de = V[de] * np.conj(Y_ff * V[de] + Y_ft * V[para])
+    S_para = V[para] * np.conj(Y_tf * V[de] + Y_tt * V[para])
+    return S_de, S_para
+
+
+def _blocos_b(z_serie, y_shunt, tap, versao):
+    """Blocos 2x2 de cada ramo em B' e B'' (mesmas aproximações de matrizes_b)"""
+    sem_resistencia = 1j * z_serie.imag
+    z_b_linha = sem_resistencia if versao == "XB" else z_serie
+    z_b_duas_linhas = sem_resistencia if versao == "BX" else z_serie
+    linha = np.stack([-Y.imag for Y in quadripolos(z_b_linha)], axis=1).reshape(-1, 2, 2)
+    duas_linhas = np.stack([-Y.imag for Y in quadripolos(z_b_duas_linhas, y_shunt, np.abs(tap))],
+                           axis=1).reshape(-1, 2, 2)
+    return linha, duas_linhas
+
+
+def _correcao(lu, posicao, extremos, bloco):
+    """Fatoração corrigida pela retirada do bloco 2x2 de um ramo"""
+    indices = posicao[extremos]
+    dentro = indices >= 0
+    return FatoracaoCorrigida(lu, indices[dentro], -bloco[np.ix_(dentro, dentro)])
+
+
+# Processos de trabalho
+_rede = {}
+
+
+def _preparar_rede(arrays, opcoes):
+    """Fatora B' e B'' do caso base uma única vez por processo"""
+    n_barras = arrays["V_base"].size
+    Ybus = sp.csr_matrix((arrays["dados"], arrays["indices"], arrays["indptr"]),
+                         shape=(n_barras, n_barras), copy=False)
+    de, para = arrays["de"], arrays["para"]
+    z_serie, y_shunt, tap = arrays["z_serie"], arrays["y_shunt"], arrays["tap"]
+    pv, pq = arrays["pv"], arrays["pq"]
+    pvpq = np.concatenate((pv, pq))
+
+    B_linha, B_duas_linhas = matrizes_b(n_barras, de, para, z_serie, y_shunt, tap, arrays["y_barra"],
+                                        opcoes["versao"])
+    posicao_pvpq = np.full(n_barras, -1, dtype=np.intp)
+    posicao_pvpq[pvpq] = np.arange(pvpq.size)
+    posicao_pq = np.full(n_barras, -1, dtype=np.intp)
+    posicao_pq[pq] = np.arange(pq.size)
+
+    _rede.update(arrays=arrays, opcoes=opcoes, Ybus=Ybus, fatores=fatorar_matrizes_b(B_linha, B_duas_linhas, pv, pq),
+                 blocos_b=_blocos_b(z_serie, y_shunt, tap, opcoes["versao"]),
+                 quadripolos=quadripolos(z_serie, y_shunt, tap),
+                 posicao_pvpq=posicao_pvpq, posicao_pq=posicao_pq)
+
+
+def _iniciar_trabalhador(descritor, opcoes):
+    blocos, arrays = anexar_arrays(descritor)
+    _rede["blocos"] = blocos
+    _preparar_rede(arrays, opcoes)
+
+
+def _avaliar(V, ramo, arrays, opcoes):
+    """Violações de carregamento e tensão de um estado da rede"""
+    S_de, S_para = fluxos_ramos(V, arrays["de"], arrays["para"], arrays["z_serie"], arrays["y_shunt"], arrays["tap"])
+    limite = arrays["capacidade"]
+    com_limite = limite > 0
+    carregamento = np.zeros(limite.size)
+    carregamento[com_limite] = np.maximum(np.abs(S_de), np.abs(S_para))[com_limite] / limite[com_limite]
+    carregamento[ramo] = 0.0
+
+    Vm = np.abs(V)
+    sobrecarga = np.flatnonzero(carregamento > 1.0)
+    subtensao = np.flatnonzero(Vm < opcoes["v_min"])
+    sobretensao = np.flatnonzero(Vm > opcoes["v_max"])
+    severidade = (np.sum(carregamento[sobrecarga] - 1.0) + np.sum(opcoes["v_min"] - Vm[subtensao])
+                  + np.sum(Vm[sobretensao] - opcoes["v_max"]))
+    return {
+        "severidade": float(severidade),
+        "sobrecargas": [(int(k), float(carregamento[k])) for k in sobrecarga],
+        "subtensoes": [(int(b), float(Vm[b])) for b in subtensao],
+        "sobretensoes": [(int(b), float(Vm[b])) for b in sobretensao],
+    }
+
+
+def _analisar_ramos(ramos):
+    """Triagem pelo desacoplado rápido com fatoração corrigida e, se preciso, Newton completo"""
+    arrays, opcoes = _rede["arrays"], _rede["opcoes"]
+    lu_linha, lu_duas_linhas = _rede["fatores"]
+    bloco_linha, bloco_duas_linhas = _rede["blocos_b"]
+    Y_ff, Y_ft, Y_tf, Y_tt = _rede["quadripolos"]
+    resultados = []
+
+    for k in ramos:
+        extremos = np.array([arrays["de"][k], arrays["para"][k]])
+        resultado = {"ramo": int(k), "ilhamento": False, "convergiu": False, "metodo": "triagem",
+                     "iteracoes": 0, "severidade": np.inf, "sobrecargas": [], "subtensoes": [], "sobretensoes": []}
+
+        # B' singular após a retirada indica barras separadas da referência (ilhamento)
+        fator_linha = _correcao(lu_linha, _rede["posicao_pvpq"], extremos, bloco_linha[k])
+        fator_duas_linhas = None if fator_linha.singular else \
+            _correcao(lu_duas_linhas, _rede["posicao_pq"], extremos, bloco_duas_linhas[k])
+        if fator_linha.singular or fator_duas_linhas.singular:
+            resultado["ilhamento"] = True
+            resultados.append(resultado)
+            continue
+
+        Ybus_k = _YbusSemRamo(_rede["Ybus"], extremos[0], extremos[1], Y_ff[k], Y_ft[k], Y_tf[k], Y_tt[k])
+        V, convergiu, iteracoes = fluxo_desacoplado_rapido(
+            Ybus_k, arrays["S_esp"], arrays["V_base"], arrays["pv"], arrays["pq"],
+            (fator_linha, fator_duas_linhas), opcoes["tol"], opcoes["max_iter"])
+        avaliacao = _avaliar(V, k, arrays, opcoes)
+
+        # Casos severos ou não convergidos são confirmados pelo Newton completo
+        if not convergiu or avaliacao["severidade"] > opcoes["limiar_newton"]:
+            V, convergiu, iteracoes = newton_raphson_n_barras(
+                Ybus_k.matriz(), arrays["S_esp"], V if convergiu else arrays["V_base"],
+                arrays["ref"], arrays["pv"], arrays["pq"], opcoes["tol"])
+            resultado["metodo"] = "newton"
+            if convergiu:
+                avaliacao = _avaliar(V, k, arrays, opcoes)
+
+        resultado.update(convergiu=bool(convergiu), iteracoes=int(iteracoes))
+        if convergiu:
+            resultado.update(avaliacao)
+        resultados.append(resultado)
+    return resultados
+
+
+def analisar_contingencias(sistema, ramos=None, V_base=None, v_min=0.93, v_max=1.05, versao="XB",
+                           tol=1e-6, max_iter=30, limiar_newton=0.0, n_processos=None, tamanho_lote=64):
+    """Análise N-1 de saídas de ramos de um SistemaEletrico
+
+    B' e B'' do caso base são fatoradas uma vez por processo; cada saída é
+    resolvida pelo desacoplado rápido com correção de posto 1 ou 2 das
+    fatorações. Somente casos com severidade acima de limiar_newton (ou sem
+    convergência) são refeitos pelo Newton completo.
+
+    ramos -> índices dos ramos em serviço (ordem de dados_ramos); padrão: todos
+    Retorna a lista de resultados ordenada da maior para a menor severidade
+    (ilhamentos e casos sem convergência primeiro).
+    """
+    de, para, z_serie, y_shunt, tap = sistema.dados_ramos()
+    S_esp, V0, ref, pv, pq = sistema.dados_fluxo()
+    if V_base is None:
+        V_base, convergiu, _ = newton_raphson_n_barras(sistema.matriz_admitancia(), S_esp, V0, ref, pv, pq, tol)
+        if not convergiu:
+            raise ValueError("O caso base não convergiu")
+
+    ativos = sistema.ramos[:, 7] != 0
+    Ybus = sistema.matriz_admitancia()
+    arrays = {
+        "dados": Ybus.data, "indices": Ybus.indices, "indptr": Ybus.indptr,
+        "de": de, "para": para, "z_serie": z_serie, "y_shunt": y_shunt, "tap": tap,
+        "y_barra": sistema.shunts_de_barra(), "capacidade": sistema.capacidade_ramos[ativos] / sistema.base_mva,
+        "S_esp": S_esp, "V_base": np.asarray(V_base, dtype=complex),
+        "ref": ref, "pv": pv, "pq": pq,
+    }
+    opcoes = {"v_min": v_min, "v_max": v_max, "versao": versao, "tol": tol, "max_iter": max_iter,
+              "limiar_newton": limiar_newton}
+
+    ramos = np.arange(de.size) if ramos is None else np.asarray(ramos, dtype=np.intp)
+    lotes = [ramos[i:i + tamanho_lote] for i in range(0, ramos.size, tamanho_lote)]
+
+    resultados = []
+    if n_processos == 1:
+        _preparar_rede(arrays, opcoes)
+        for lote in lotes:
+            resultados.extend(_analisar_ramos(lote))
+    else:
+        blocos, descritor = publicar_arrays(arrays)
+        try:
+            with ProcessPoolExecutor(max_workers=n_processos or os.cpu_count(),
+                                     initializer=_iniciar_trabalhador, initargs=(descritor, opcoes)) as executor:
+                for parcial in executor.map(_analisar_ramos, lotes):
+                    resultados.extend(parcial)
+        finally:
+            liberar_blocos(blocos)
+
+    # Numeração externa das barras nos resultados
+    for resultado in resultados:
+        k = resultado["ramo"]
+        resultado["de"] = int(sistema.numeros[de[k]])
+        resultado["para"] = int(sistema.numeros[para[k]])
+        resultado["subtensoes"] = [(int(sistema.numeros[b]), v) for b, v in resultado["subtensoes"]]
+        resultado["sobretensoes"] = [(int(sistema.numeros[b]), v) for b, v in resultado["sobretensoes"]]
+
+    resultados.sort(key=lambda r: -r["severidade"])
+    return resultados
+
+
+if __name__ == "__main__":
+    from Casos_de_Teste import caso_padrao, casos_disponiveis
+
+    print("=== Análise de Contingências N-1 ===")
+    print(f"Casos disponíveis: {', '.join(casos_disponiveis())}")
+
+    nome = input("\nCaso (ex: ieee14): ").strip() or "ieee14"
+    v_min = float(input("Tensão mínima (pu, ex: 0.95): ") or "0.95")
+    v_max = float(input("Tensão máxima (pu, ex: 1.05): ") or "1.05")
+    sistema = caso_padrao(nome)
+
+    inicio = time.perf_counter()
+    resultados = analisar_contingencias(sistema, v_min=v_min, v_max=v_max)
+    tempo = time.perf_counter() - inicio
+
+    print("\n=== Resultados Finais ===")
+    print(f"Contingências analisadas: {len(resultados)} em {tempo:.3f} s")
+    print(f"Resolvidas apenas na triagem: {sum(r['metodo'] == 'triagem' for r in resultados)}")
+
+    print("\nRamo      De -> Para   Severidade  Situação")
+    for r in resultados:
+        if r["ilhamento"]:
+            situacao = "ilhamento"
+        elif not r["convergiu"]:
+            situacao = "não convergiu"
+        elif r["severidade"] > 0:
+            situacao = (f"{len(r['sobrecargas'])} sobrecarga(s), "
+                        f"{len(r['subtensoes']) + len(r['sobretensoes'])} violação(ões) de tensão")
+        else:
+            continue
+        print(f"{r['ramo']:4d}  {r['de']:6d} -> {r['para']:<6d} {r['severidade']:10.4f}  {situacao}")
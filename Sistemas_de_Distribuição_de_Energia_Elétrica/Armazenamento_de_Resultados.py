@@ -0,0 +1,149 @@
+import json
+import os
+import numpy as np
+
+
+ARQUIVO_INDICE = "indice.json"
+
+
+class GravadorColunar:
+    """Grava resultados em blocos .npy de tipo fixo com um índice JSON
+
+    As linhas (por exemplo, passos de tempo ou amostras) são acumuladas em um
+    buffer pré-alocado e gravadas em blocos de linhas_por_bloco linhas. Cada
+    bloco é salvo em ordem de coluna (Fortran), de modo que ler algumas
+    barras ao longo do tempo percorre trechos contíguos do arquivo.
+    """
+
+    def __init__(self, diretorio, n_colunas, dtype=np.complex128, linhas_por_bloco=8760, colunas=None):
+        os.makedirs(diretorio, exist_ok=True)
+        self.diretorio = diretorio
+        self.n_colunas = n_colunas
+        self.dtype = np.dtype(dtype)
+        self.linhas_por_bloco = linhas_por_bloco
+        self.colunas = colunas
+        self.blocos = []
+        self.n_linhas = 0
+        self.buffer = np.empty((linhas_por_bloco, n_colunas), dtype=self.dtype, order="F")
+        self.ocupadas = 0
+
+    def adicionar_linha(self, linha):
+        """Acrescenta uma linha (n_colunas valores)"""
+        self.buffer[self.ocupadas] = linha
+        self.ocupadas += 1
+        if self.ocupadas == self.linhas_por_bloco:
+            self._descarregar()
+
+    def adicionar(self, bloco):
+        """Acrescenta várias linhas de uma vez (n_linhas, n_colunas)"""
+        bloco = np.asarray(bloco, dtype=self.dtype)
+        inicio = 0
+        while inicio < bloco.shape[0]:
+            n = min(self.linhas_por_bloco - self.ocupadas, bloco.shape[0] - inicio)
+            self.buffer[self.ocupadas:self.ocupadas + n] = bloco[inicio:inicio + n]
+            self.ocupadas += n
+            inicio += n
+            if self.ocupadas == self.linhas_por_bloco:
+                self._descarregar()
+
+    def _descarregar(self):
+        if self.ocupadas == 0:
+            return
+        nome = f"bloco_{len(self.blocos):06d}.npy"
+        np.save(os.path.join(self.diretorio, nome), np.asfortranarray(self.buffer[:self.ocupadas]))
+        self.blocos.append({"arquivo": nome, "linha_inicial": self.n_linhas, "n_linhas": self.ocupadas})
+        self.n_linhas += self.ocupadas
+        self.ocupadas = 0
+        self._gravar_indice()
+
+    def _gravar_indice(self):
+        indice = {"dtype": self.dtype.str, "n_colunas": self.n_colunas, "n_linhas": self.n_linhas,
+                  "colunas": self.colunas, "blocos": self.blocos}
+        temporario = os.path.join(self.diretorio, ARQUIVO_INDICE + ".tmp")
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump(indice, arquivo, ensure_ascii=False)
+        os.replace(temporario, os.path.join(self.diretorio, ARQUIVO_INDICE))
+
+    def fechar(self):
+        """Grava o bloco parcial e o índice final"""
+        self._descarregar()
+        self._gravar_indice()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+
+class LeitorColunar:
+    """Lê resultados gravados por GravadorColunar mapeando os blocos em memória
+
+    Apenas os blocos que contêm as linhas pedidas são abertos, e com
+    mmap_mode="r" somente as páginas das colunas selecionadas são lidas.
+    """
+
+    def __init__(self, diretorio):
+        with open(os.path.join(diretorio, ARQUIVO_INDICE), encoding="utf-8") as arquivo:
+            indice = json.load(arquivo)
+        self.diretorio = diretorio
+        self.dtype = np.dtype(indice["dtype"])
+        self.n_colunas = indice["n_colunas"]
+        self.n_linhas = indice["n_linhas"]
+        self.colunas = indice["colunas"]
+        self.blocos = indice["blocos"]
+        self.inicios = np.array([b["linha_inicial"] for b in self.blocos] + [self.n_linhas], dtype=np.int64)
+        self._mapas = {}
+
+    @property
+    def shape(self):
+        return self.n_linhas, self.n_colunas
+
+    def bloco(self, i):
+        """Bloco i mapeado em memória (somente leitura)"""
+        if i not in self._mapas:
+            caminho = os.path.join(self.diretorio, self.blocos[i]["arquivo"])
+            self._mapas[i] = np.load(caminho, mmap_mode="r")
+        return self._mapas[i]
+
+    def ler(self, linhas=slice(None), colunas=slice(None)):
+        """Lê um intervalo de linhas (slice contíguo) e uma seleção de colunas"""
+        inicio, fim, passo = linhas.indices(self.n_linhas)
+        if passo != 1:
+            raise ValueError("Use um intervalo contíguo de linhas (passo 1)")
+
+        n_sel = len(range(self.n_colunas)[colunas]) if isinstance(colunas, slice) else len(colunas)
+        saida = np.empty((max(fim - inicio, 0), n_sel), dtype=self.dtype)
+
+        primeiro = max(int(np.searchsorted(self.inicios, inicio, side="right")) - 1, 0)
+        for i in range(primeiro, len(self.blocos)):
+            base = self.inicios[i]
+            if base >= fim:
+                break
+            de = max(inicio - base, 0)
+            ate = min(fim - base, self.blocos[i]["n_linhas"])
+            saida[base + de - inicio:base + ate - inicio] = self.bloco(i)[de:ate][:, colunas]
+        return saida
+
+    def exportar_texto(self, caminho, cabecalho=None, linhas_por_vez=10000):
+        """Exporta para texto separado por tabulações (caminho mais lento, opcional)"""
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            if cabecalho is None and self.colunas:
+                cabecalho = "\t".join(self.colunas)
+            if cabecalho:
+                arquivo.write(cabecalho + "\n")
+            for inicio in range(0, self.n_linhas, linhas_por_vez):
+                trecho = self.ler(slice(inicio, inicio + linhas_por_vez))
+                arquivo.writelines("\t".join(map(str, linha)) + "\n" for linha in trecho.tolist())
+
+
+if __name__ == "__main__":
+    print("=== Armazenamento Colunar de Resultados ===")
+
+    diretorio = input("\nDiretório de resultados a ler: ").strip()
+    leitor = LeitorColunar(diretorio)
+    print(f"Linhas: {leitor.n_linhas}, colunas: {leitor.n_colunas}, tipo: {leitor.dtype}")
+    print(f"Blocos: {len(leitor.blocos)}")
+    if leitor.n_linhas:
+        print("Primeira linha (até 5 colunas):")
+        print(leitor.ler(slice(0, 1), slice(0, 5)))
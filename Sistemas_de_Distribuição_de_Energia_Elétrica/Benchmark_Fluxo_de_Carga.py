@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import platform
+import time
+import numpy as np
+import scipy
+from scipy.sparse.linalg import splu
+
+from Casos_de_Teste import (alimentador_radial_sintetico, caso_padrao, casos_disponiveis,
+                            rede_malhada_sintetica)
+from Fluxo_de_Carga_em_Lote import newton_lote
+from Importação_de_Casos import carregar_caso
+from Matriz_de_Admitância_Esparsa import ybus_duas_barras
+from Método_de_Newton import metodo_newton
+from Método_de_Newton_Barra_PQ import PowerFlowNewton
+from Método_de_Newton_Desacoplado_Rápido import (fatorar_matrizes_b, fluxo_desacoplado_rapido, matrizes_b,
+                                                 newton_method, power_equation)
+from Método_de_Newton_N_Barras import calcular_jacobiano, calcular_potencias, newton_raphson_n_barras
+from Núcleos_Acelerados import NucleoNewton
+from Rastreamento import NIVEL_DESLIGADO, NIVEL_RESUMO, Rastreador
+from Resolução_de_Barras_Por_Tentativa_e_Erro import tentativa_e_erro
+from Varredura_Direta_Inversa import AlimentadorRadial
+
+
+def cronometrar(funcao, repeticoes):
+    """Executa a função várias vezes; retorna (melhor tempo, mediana, último resultado)"""
+    tempos = []
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), float(np.median(tempos)), resultado
+
+
+def registrar(medidas, nome, tempos):
+    medidas[nome] = {"melhor_s": tempos[0], "mediana_s": tempos[1]}
+    return tempos[2]
+
+
+def medir_sistema(sistema, repeticoes):
+    """Tempos de cada etapa dos métodos de N barras para um caso"""
+    medidas = {}
+    resultado = {"caso": sistema.nome, "barras": sistema.n_barras,
+                 "ramos": int((sistema.ramos[:, 7] != 0).sum()), "medidas": medidas}
+
+    Ybus = registrar(medidas, "ybus", cronometrar(sistema.matriz_admitancia, repeticoes))
+    S_esp, V0, ref, pv, pq = sistema.dados_fluxo()
+    V0 = np.abs(V0).astype(complex)
+    pvpq = np.concatenate((pv, pq))
+
+    # Newton-Raphson polar: etapas isoladas e solução completa
+    registrar(medidas, "newton_residuos", cronometrar(lambda: calcular_potencias(Ybus, V0), repeticoes))
+    J = registrar(medidas, "newton_jacobiano", cronometrar(lambda: calcular_jacobiano(Ybus, V0, pvpq, pq), repeticoes))
+    residuo = np.ones(J.shape[0])
+    registrar(medidas, "newton_solucao_linear", cronometrar(lambda: splu(J).solve(residuo), repeticoes))
+    _, convergiu, iteracoes = registrar(medidas, "newton_total", cronometrar(
+        lambda: newton_raphson_n_barras(Ybus, S_esp, V0, ref, pv, pq), repeticoes))
+    resultado["newton"] = {"convergiu": bool(convergiu), "iteracoes": int(iteracoes)}
+    contador = Rastreador(NIVEL_RESUMO)
+    _, convergiu, iteracoes = registrar(medidas, "newton_desonesto_total", cronometrar(
+        lambda: newton_raphson_n_barras(Ybus, S_esp, V0, ref, pv, pq, rastreador=contador, desonesto=True),
+        repeticoes))
+    resultado["newton_desonesto"] = {"convergiu": bool(convergiu), "iteracoes": int(iteracoes),
+                                     "fatoracoes": contador.total_fatoracoes // repeticoes}
+
+    # Núcleos com padrão do Jacobiano pré-calculado (Numba quando instalado)
+    nucleo = registrar(medidas, "nucleo_padrao", cronometrar(lambda: NucleoNewton(Ybus, pv, pq), repeticoes))
+    registrar(medidas, "nucleo_jacobiano", cronometrar(lambda: nucleo.jacobiano(V0), repeticoes))
+    registrar(medidas, "newton_nucleo_total", cronometrar(
+        lambda: newton_raphson_n_barras(Ybus, S_esp, V0, ref, pv, pq, nucleo=nucleo), repeticoes))
+
+    # Desacoplado rápido: montagem/fatoração de B' e B'' e solução completa
+    de, para, z_serie, y_shunt, tap = sistema.dados_ramos()
+    fatores = registrar(medidas, "desacoplado_fatoracao", cronometrar(
+        lambda: fatorar_matrizes_b(*matrizes_b(sistema.n_barras, de, para, z_serie, y_shunt, tap,
+                                               sistema.shunts_de_barra()), pv, pq), repeticoes))
+    _, convergiu, iteracoes = registrar(medidas, "desacoplado_total", cronometrar(
+        lambda: fluxo_desacoplado_rapido(Ybus, S_esp, V0, pv, pq, fatores), repeticoes))
+    resultado["desacoplado"] = {"convergiu": bool(convergiu), "iteracoes": int(iteracoes)}
+
+    # Varredura direta/inversa (somente alimentadores radiais sem geração PV)
+    if sistema.e_radial() and pv.size == 0 and ref.size == 1:
+        alimentador = registrar(medidas, "varredura_preparo", cronometrar(
+            lambda: AlimentadorRadial(sistema.n_barras, de, para, z_serie, ref[0], sistema.shunts_de_barra()),
+            repeticoes))
+        _, _, convergiu, iteracoes = registrar(medidas, "varredura_total", cronometrar(
+            lambda: alimentador.varredura(-S_esp, np.abs(V0[ref[0]])), repeticoes))
+        resultado["varredura"] = {"convergiu": bool(convergiu), "iteracoes": int(iteracoes)}
+
+    return resultado
+
+
+def medir_duas_barras(repeticoes, n_cenarios=10000):
+    """Tempos dos scripts originais de 2 barras (sem impressão)"""
+    medidas = {}
+    silencioso = Rastreador(NIVEL_DESLIGADO)
+    z_linha, z_shunt = 0.05 + 0.25j, 1000j
+    Y = ybus_duas_barras(z_linha, z_shunt).toarray()
+
+    registrar(medidas, "ybus", cronometrar(lambda: ybus_duas_barras(z_linha, z_shunt), repeticoes))
+    registrar(medidas, "metodo_newton", cronometrar(
+        lambda: metodo_newton(Y, 1.0, 1.0, 0.0, -0.2, rastreador=silencioso), repeticoes))
+
+    def newton_pq():
+        fluxo = PowerFlowNewton()
+        fluxo.Y_matrix = Y
+        return fluxo.newton_raphson(rastreador=silencioso)
+
+    registrar(medidas, "newton_barra_pq", cronometrar(newton_pq, repeticoes))
+    registrar(medidas, "desacoplado_rapido", cronometrar(
+        lambda: newton_method(-0.2, power_equation(0.0, Y, 1.0, 1.0), 1e-6, Y, 1.0, 1.0, 0.0,
+                              rastreador=silencioso), repeticoes))
+    registrar(medidas, "tentativa_e_erro", cronometrar(
+        lambda: tentativa_e_erro(1.0 + 0j, -0.2 - 0.1j, z_linha, rastreador=silencioso), repeticoes))
+
+    P_esp = np.linspace(-0.8, -0.1, n_cenarios)
+    registrar(medidas, f"newton_lote_{n_cenarios}_cenarios", cronometrar(
+        lambda: newton_lote(P_esp, 0.05 * P_esp, z_linha, z_shunt), repeticoes))
+
+    return {"caso": "Sistema de 2 barras", "barras": 2, "ramos": 1, "medidas": medidas}
+
+
+def comparar(atual, anterior, tolerancia):
+    """Lista as medidas que ficaram mais lentas que a tolerância em relação à execução anterior"""
+    referencias = {(r["caso"], nome): m["melhor_s"] for r in anterior["resultados"]
+                   for nome, m in r["medidas"].items()}
+    regressoes = []
+    for r in atual["resultados"]:
+        for nome, m in r["medidas"].items():
+            antes = referencias.get((r["caso"], nome))
+            if antes and m["melhor_s"] > tolerancia * antes:
+                regressoes.append({"caso": r["caso"], "medida": nome, "anterior_s": antes,
+                                   "atual_s": m["melhor_s"], "razao": m["melhor_s"] / antes})
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos métodos de fluxo de carga")
+    parser.add_argument("--casos", nargs="*", default=casos_disponiveis(),
+                        help="casos distribuídos em casos/ ou arquivos .m/.json (padrão: todos)")
+    parser.add_argument("--tamanhos", nargs="*", type=int, default=[10000, 100000],
+                        help="número de barras dos casos sintéticos")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--saida", default="benchmark.json")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=1.25,
+                        help="razão de tempo a partir da qual uma medida é considerada regressão")
+    args = parser.parse_args()
+
+    sistemas = [carregar_caso(nome) if os.path.isfile(nome) else caso_padrao(nome) for nome in args.casos]
+    for n in args.tamanhos:
+        sistemas.append(alimentador_radial_sintetico(n))
+        sistemas.append(rede_malhada_sintetica(n))
+
+    resultados = [medir_duas_barras(args.repeticoes)]
+    for sistema in sistemas:
+        print(f"Medindo {sistema.nome}...")
+        resultados.append(medir_sistema(sistema, args.repeticoes))
+
+    relatorio = {
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "plataforma": platform.platform(),
+        "repeticoes": args.repeticoes,
+        "resultados": resultados,
+    }
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            relatorio["regressoes"] = comparar(relatorio, json.load(arquivo), args.tolerancia)
+        for r in relatorio["regressoes"]:
+            print(f"Regressão: {r['caso']} / {r['medida']}: {r['anterior_s'] * 1e3:.3f} ms -> "
+                  f"{r['atual_s'] * 1e3:.3f} ms ({r['razao']:.2f}x)")
+
+    with open(args.saida, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+    print(f"Resultados salvos em '{args.saida}'.")
+
+
+if __name__ == "__main__":
+    main()
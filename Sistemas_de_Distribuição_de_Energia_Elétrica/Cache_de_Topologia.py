@@ -0,0 +1,199 @@
+import hashlib
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+
+from Fatoração_Esparsa import FatoracaoOrdenada, FatoracaoReutilizavel, memoria_lu
+from Matriz_de_Admitância_Esparsa import montar_ybus
+from Método_de_Newton_Desacoplado_Rápido import fatorar_matrizes_b, fluxo_desacoplado_rapido, matrizes_b
+from Método_de_Newton_N_Barras import newton_raphson_n_barras, tipos_de_barra
+from Núcleos_Acelerados import NucleoNewton
+from Reordenação_de_Barras import ordem_jacobiano, ordenar_barras
+
+
+def chave_topologia(n_barras, de, para, z_serie, y_shunt=None, tap=None, y_barra=None, ref=(0,), pv=(),
+                    versao="XB", ordenacao=None):
+    """SHA-256 da topologia, dos parâmetros dos ramos, dos tipos de barra e da ordenação"""
+    h = hashlib.sha256(f"{n_barras}|{versao}|{ordenacao}".encode())
+    for array, dtype in ((de, np.int64), (para, np.int64), (z_serie, complex), (y_shunt, complex),
+                         (tap, complex), (y_barra, complex), (ref, np.int64), (pv, np.int64)):
+        h.update(b"|")
+        if array is not None:
+            h.update(np.ascontiguousarray(array, dtype=dtype).tobytes())
+    return h.hexdigest()
+
+
+class RedePreparada:
+    """Tudo o que depende apenas da rede: Ybus, ordenação das barras, B'/B'' e análise simbólica
+
+    As fatorações de B' e B'' são feitas na primeira solução desacoplada; o
+    padrão e a ordenação de colunas do Jacobiano, na primeira solução por
+    Newton. Uma nova solução com outras injeções não repete nenhuma dessas
+    etapas.
+
+    ordenacao -> método de Reordenação_de_Barras ("amd", "tinney2", ...)
+                 calculado uma vez e aplicado ao Jacobiano, a B' e a B'';
+                 None mantém o COLAMD do SuperLU. Os resultados seguem
+                 sempre a numeração original das barras.
+
+    O núcleo e as fatorações guardam estado entre soluções; quem resolve a
+    mesma rede em várias threads deve segurar trava durante cada solução.
+    """
+
+    def __init__(self, n_barras, de, para, z_serie, y_shunt=None, tap=None, y_barra=None, ref=(0,), pv=(),
+                 versao="XB", ordenacao=None):
+        self.n_barras = n_barras
+        self.ramos = (np.asarray(de, dtype=np.intp), np.asarray(para, dtype=np.intp),
+                      np.asarray(z_serie, dtype=complex), y_shunt, tap, y_barra)
+        self.versao = versao
+        self.Ybus = montar_ybus(n_barras, de, para, z_serie, y_shunt, tap, y_barra)
+        self.ref = np.asarray(ref, dtype=np.intp)
+        self.pv = np.asarray(pv, dtype=np.intp)
+        self.pq = tipos_de_barra(n_barras, self.ref, self.pv)
+        self.pvpq = np.concatenate((self.pv, self.pq))
+        self.ordenacao = ordenacao
+        if ordenacao is None:
+            self.ordem_barras = None
+            self.fatoracao_jacobiano = FatoracaoReutilizavel()
+        else:
+            self.ordem_barras = ordenar_barras(self.Ybus, ordenacao)
+            self.fatoracao_jacobiano = FatoracaoOrdenada(ordem_jacobiano(self.ordem_barras, self.pv, self.pq))
+        self._fatores_b = None
+        self._memoria_fatores_b = 0
+        self._nucleo = None
+        self.trava = threading.Lock()
+
+    @property
+    def fatores_b(self):
+        if self._fatores_b is None:
+            B_linha, B_duas_linhas = matrizes_b(self.n_barras, *self.ramos, versao=self.versao)
+            self._fatores_b = fatorar_matrizes_b(B_linha, B_duas_linhas, self.pv, self.pq, self.ordem_barras)
+            self._memoria_fatores_b = sum(memoria_lu(lu) for lu in self._fatores_b)
+        return self._fatores_b
+
+    @property
+    def nucleo(self):
+        if self._nucleo is None:
+            self._nucleo = NucleoNewton(self.Ybus, self.pv, self.pq)
+        return self._nucleo
+
+    def newton(self, S_esp, V0, **opcoes):
+        """Newton-Raphson reaproveitando a Ybus, o padrão e a ordenação do Jacobiano"""
+        return newton_raphson_n_barras(self.Ybus, S_esp, V0, self.ref, self.pv, self.pq,
+                                       fatorar=self.fatoracao_jacobiano.fatorar, nucleo=self.nucleo, **opcoes)
+
+    def desacoplado(self, S_esp, V0, **opcoes):
+        """Desacoplado rápido com B' e B'' já fatoradas"""
+        return fluxo_desacoplado_rapido(self.Ybus, S_esp, V0, self.pv, self.pq, self.fatores_b, **opcoes)
+
+    def memoria(self):
+        """Estimativa dos bytes ocupados pela rede preparada"""
+        Y = self.Ybus
+        total = Y.data.nbytes + Y.indices.nbytes + Y.indptr.nbytes
+        total += sum(np.asarray(a).nbytes for a in self.ramos if a is not None)
+        total += self.ref.nbytes + self.pv.nbytes + self.pq.nbytes + self.pvpq.nbytes
+        total += self.fatoracao_jacobiano.memoria()
+        if self.ordem_barras is not None:
+            total += self.ordem_barras.nbytes
+        if self._nucleo is not None:
+            total += self._nucleo.memoria()
+        total += self._memoria_fatores_b
+        return total
+
+
+class CacheTopologia:
+    """Cache LRU de redes preparadas, indexado pelo hash da topologia e dos parâmetros
+
+    Ao exceder orcamento_bytes, as redes usadas há mais tempo são removidas.
+    Os contadores acertos, falhas e remocoes permitem avaliar o cache.
+    """
+
+    def __init__(self, orcamento_bytes=256 * 2 ** 20):
+        self.orcamento_bytes = orcamento_bytes
+        self.entradas = OrderedDict()
+        self.tamanhos = {}
+        self.memoria = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+    def obter(self, n_barras, de, para, z_serie, y_shunt=None, tap=None, y_barra=None, ref=(0,), pv=(),
+              versao="XB", ordenacao=None):
+        """Retorna a RedePreparada da topologia, construindo-a apenas na primeira vez"""
+        chave = chave_topologia(n_barras, de, para, z_serie, y_shunt, tap, y_barra, ref, pv, versao, ordenacao)
+        rede = self.entradas.get(chave)
+        if rede is not None:
+            self.acertos += 1
+            self.entradas.move_to_end(chave)
+        else:
+            self.falhas += 1
+            rede = RedePreparada(n_barras, de, para, z_serie, y_shunt, tap, y_barra, ref, pv, versao, ordenacao)
+            self.entradas[chave] = rede
+            self.tamanhos[chave] = 0
+        self.atualizar(chave)
+        return rede
+
+    def obter_sistema(self, sistema, versao="XB", ordenacao=None):
+        """RedePreparada de um SistemaEletrico (ramos em serviço, shunts de barra e tipos)"""
+        de, para, z_serie, y_shunt, tap = sistema.dados_ramos()
+        tipo = sistema.barras[:, 1].astype(np.int64)
+        return self.obter(sistema.n_barras, de, para, z_serie, y_shunt, tap, sistema.shunts_de_barra(),
+                          np.flatnonzero(tipo == 3), np.flatnonzero(tipo == 2), versao, ordenacao)
+
+    def atualizar(self, chave):
+        """Recalcula o tamanho de uma entrada (as fatorações crescem com o uso) e aplica o orçamento"""
+        tamanho = self.entradas[chave].memoria()
+        self.memoria += tamanho - self.tamanhos[chave]
+        self.tamanhos[chave] = tamanho
+
+        # Remove as menos recentes, preservando a entrada em uso
+        for antiga in list(self.entradas):
+            if self.memoria <= self.orcamento_bytes:
+                break
+            if antiga != chave:
+                del self.entradas[antiga]
+                self.memoria -= self.tamanhos.pop(antiga)
+                self.remocoes += 1
+
+    def limpar(self):
+        self.entradas.clear()
+        self.tamanhos.clear()
+        self.memoria = 0
+
+    def estatisticas(self):
+        consultas = self.acertos + self.falhas
+        return {"entradas": len(self.entradas), "memoria_bytes": self.memoria,
+                "orcamento_bytes": self.orcamento_bytes, "acertos": self.acertos, "falhas": self.falhas,
+                "remocoes": self.remocoes, "taxa_acertos": self.acertos / consultas if consultas else 0.0}
+
+
+if __name__ == "__main__":
+    from Casos_de_Teste import rede_malhada_sintetica
+
+    print("=== Cache de Topologia ===")
+
+    n_barras = int(input("\nNúmero de barras da rede sintética (ex: 20000): ") or "20000")
+    n_cenarios = int(input("Número de cenários de carga (ex: 20): ") or "20")
+
+    sistema = rede_malhada_sintetica(n_barras)
+    S_base, V0, _, _, _ = sistema.dados_fluxo()
+    cache = CacheTopologia()
+    rng = np.random.default_rng(0)
+
+    tempos = []
+    for cenario in range(n_cenarios):
+        inicio = time.perf_counter()
+        rede = cache.obter_sistema(sistema)
+        S_esp = S_base * (0.8 + 0.4 * rng.random())
+        V, convergiu, iteracoes = rede.newton(S_esp, V0)
+        tempos.append(time.perf_counter() - inicio)
+
+    estatisticas = cache.estatisticas()
+    print("\n=== Resultados Finais ===")
+    print(f"Primeiro cenário (rede preparada do zero): {tempos[0] * 1e3:.2f} ms")
+    print(f"Demais cenários (média): {np.mean(tempos[1:]) * 1e3:.2f} ms")
+    print(f"Acertos: {estatisticas['acertos']}, falhas: {estatisticas['falhas']}, "
+          f"memória: {estatisticas['memoria_bytes'] / 2 ** 20:.2f} MiB")
+    print(f"Ordenações do Jacobiano reaproveitadas: {rede.fatoracao_jacobiano.reutilizacoes} "
+          f"de {rede.fatoracao_jacobiano.fatoracoes} fatorações")
@@ -0,0 +1,146 @@
+import json
+import os
+import numpy as np
+
+from Matriz_de_Admitância_Esparsa import montar_ybus
+
+
+DIRETORIO_CASOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "casos")
+
+
+class SistemaEletrico:
+    """Dados de barras, geradores e ramos de um caso (colunas no padrão MATPOWER)
+
+    barras     -> (barra, tipo, Pd, Qd, Gs, Bs, Vm, Va), tipo 1 = PQ, 2 = PV, 3 = referência
+    geradores  -> (barra, Pg, Qg, Vg)
+    ramos      -> (de, para, r, x, b, tap, defasagem, estado)
+    capacidade_ramos -> limite de cada ramo em MVA (0 = sem limite)
+    Potências em MW/Mvar, impedâncias em pu e ângulos em graus, como nos arquivos originais.
+    """
+
+    def __init__(self, nome, base_mva, barras, geradores, ramos, capacidade_ramos=None):
+        self.nome = nome
+        self.base_mva = float(base_mva)
+        self.barras = np.asarray(barras, dtype=float).reshape(-1, 8)
+        self.geradores = np.asarray(geradores, dtype=float).reshape(-1, 4)
+        self.ramos = np.asarray(ramos, dtype=float).reshape(-1, 8)
+        if capacidade_ramos is None:
+            capacidade_ramos = np.zeros(self.ramos.shape[0])
+        self.capacidade_ramos = np.asarray(capacidade_ramos, dtype=float).reshape(-1)
+
+        # Numeração externa -> índice interno (base 0)
+        self.numeros = self.barras[:, 0].astype(np.int64)
+        self.indice = np.full(self.numeros.max() + 1, -1, dtype=np.intp)
+        self.indice[self.numeros] = np.arange(self.numeros.size)
+
+    @property
+    def n_barras(self):
+        return self.barras.shape[0]
+
+    def dados_ramos(self):
+        """Retorna (de, para, z_serie, y_shunt, tap) dos ramos em serviço, em base 0"""
+        ativos = self.ramos[self.ramos[:, 7] != 0]
+        de = self.indice[ativos[:, 0].astype(np.int64)]
+        para = self.indice[ativos[:, 1].astype(np.int64)]
+        z_serie = ativos[:, 2] + 1j * ativos[:, 3]
+        y_shunt = 1j * ativos[:, 4] / 2
+        relacao = np.where(ativos[:, 5] == 0, 1.0, ativos[:, 5])
+        tap = relacao * np.exp(1j * np.radians(ativos[:, 6]))
+        return de, para, z_serie, y_shunt, tap
+
+    def shunts_de_barra(self):
+        return (self.barras[:, 4] + 1j * self.barras[:, 5]) / self.base_mva
+
+    def matriz_admitancia(self):
+        de, para, z_serie, y_shunt, tap = self.dados_ramos()
+        return montar_ybus(self.n_barras, de, para, z_serie, y_shunt, tap, self.shunts_de_barra())
+
+    def dados_fluxo(self):
+        """Retorna (S_esp, V0, ref, pv, pq) para os métodos de N barras"""
+        tipo = self.barras[:, 1].astype(np.int64)
+        ref = np.flatnonzero(tipo == 3)
+        pv = np.flatnonzero(tipo == 2)
+        pq = np.flatnonzero(tipo == 1)
+
+        barra_gerador = self.indice[self.geradores[:, 0].astype(np.int64)]
+        S_geracao = np.zeros(self.n_barras, dtype=complex)
+        np.add.at(S_geracao, barra_gerador, self.geradores[:, 1] + 1j * self.geradores[:, 2])
+        S_carga = self.barras[:, 2] + 1j * self.barras[:, 3]
+        S_esp = (S_geracao - S_carga) / self.base_mva
+
+        Vm = self.barras[:, 6].copy()
+        Vm[barra_gerador] = self.geradores[:, 3]
+        V0 = Vm * np.exp(1j * np.radians(self.barras[:, 7]))
+        return S_esp, V0, ref, pv, pq
+
+    def e_radial(self):
+        return int((self.ramos[:, 7] != 0).sum()) == self.n_barras - 1
+
+
+def carregar_caso_json(caminho):
+    """Lê um caso no formato JSON dos arquivos em casos/"""
+    with open(caminho, encoding="utf-8") as arquivo:
+        dados = json.load(arquivo)
+    return SistemaEletrico(dados["nome"], dados["base_mva"], dados["barras"],
+                           dados["geradores"], dados["ramos"], dados.get("capacidade_ramos"))
+
+
+def casos_disponiveis():
+    """Nomes dos casos distribuídos com o repositório"""
+    return sorted(os.path.splitext(nome)[0] for nome in os.listdir(DIRETORIO_CASOS) if nome.endswith(".json"))
+
+
+def caso_padrao(nome):
+    return carregar_caso_json(os.path.join(DIRETORIO_CASOS, nome + ".json"))
+
+
+def alimentador_radial_sintetico(n_barras, semente=0, base_mva=1.0):
+    """Alimentador radial sintético com n_barras (barra 1 é a subestação)"""
+    from Varredura_Direta_Inversa import alimentador_sintetico
+
+    de, para, z_serie, S_carga = alimentador_sintetico(n_barras, semente)
+    numeros = np.arange(1, n_barras + 1)
+    barras = np.zeros((n_barras, 8))
+    barras[:, 0] = numeros
+    barras[:, 1] = 1
+    barras[0, 1] = 3
+    barras[:, 2] = S_carga.real * base_mva
+    barras[:, 3] = S_carga.imag * base_mva
+    barras[:, 6] = 1.0
+
+    ramos = np.zeros((n_barras - 1, 8))
+    ramos[:, 0] = de + 1
+    ramos[:, 1] = para + 1
+    ramos[:, 2] = z_serie.real
+    ramos[:, 3] = z_serie.imag
+    ramos[:, 7] = 1
+
+    geradores = np.array([[1, 0.0, 0.0, 1.0]])
+    return SistemaEletrico(f"Alimentador sintético {n_barras} barras", base_mva, barras, geradores, ramos)
+
+
+def rede_malhada_sintetica(n_barras, semente=0, fracao_lacos=0.1):
+    """Rede malhada sintética: alimentador radial com ramos extras fechando laços"""
+    sistema = alimentador_radial_sintetico(n_barras, semente)
+    rng = np.random.default_rng(semente + 1)
+
+    # Cada laço liga uma barra a um ancestral de 2 a 6 níveis acima, como as
+    # chaves de interligação entre trechos vizinhos (laços locais)
+    pai = np.zeros(n_barras + 1, dtype=np.int64)
+    pai[sistema.ramos[:, 1].astype(np.int64)] = sistema.ramos[:, 0].astype(np.int64)
+    origem = rng.integers(2, n_barras + 1, size=int(fracao_lacos * n_barras))
+    destino = origem.copy()
+    niveis = rng.integers(2, 7, size=origem.size)
+    for nivel in range(6):
+        subir = (niveis > nivel) & (pai[destino] > 0)
+        destino[subir] = pai[destino[subir]]
+    extremos = np.column_stack((origem, destino))
+    extremos = extremos[extremos[:, 0] != extremos[:, 1]]
+    extras = np.zeros((extremos.shape[0], 8))
+    extras[:, :2] = extremos
+    extras[:, 2] = 0.002 * (1 + rng.random(extremos.shape[0]))
+    extras[:, 3] = 0.004 * (1 + rng.random(extremos.shape[0]))
+    extras[:, 7] = 1
+
+    return SistemaEletrico(f"Rede malhada sintética {n_barras} barras", sistema.base_mva, sistema.barras,
+                           sistema.geradores, np.vstack((sistema.ramos, extras)))
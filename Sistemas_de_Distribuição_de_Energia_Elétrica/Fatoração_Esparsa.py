@@ -0,0 +1,123 @@
+import numpy as np
+from scipy.sparse.linalg import splu
+
+
+class LUPermutada:
+    """Fatoração de A[:, q] vista como fatoração de A (x = z[perm_c])"""
+
+    def __init__(self, lu, perm_c):
+        self.lu = lu
+        self.perm_c = perm_c
+        self.shape = lu.shape
+        self.nnz = lu.nnz
+
+    def solve(self, b, trans="N"):
+        if trans == "N":
+            z = self.lu.solve(b)
+            return z[self.perm_c]
+        # Aᵀ x = b equivale a (A[:, q])ᵀ x = b[q]
+        y = np.empty_like(b)
+        y[self.perm_c] = b
+        return self.lu.solve(y, trans=trans)
+
+
+class FatoracaoReutilizavel:
+    """Fatoração LU esparsa que reaproveita a análise simbólica entre matrizes de mesmo padrão
+
+    A primeira fatoração calcula a ordenação de colunas (COLAMD por padrão).
+    As seguintes, enquanto o padrão de esparsidade não mudar, aplicam essa
+    mesma ordenação e chamam o SuperLU com permc_spec="NATURAL", pulando a
+    etapa de ordenação. É o caso dos Jacobianos de uma mesma rede ao longo
+    das iterações e entre cenários com injeções diferentes.
+    """
+
+    def __init__(self, permc_spec="COLAMD"):
+        self.permc_spec = permc_spec
+        self.perm_c = None
+        self.inversa = None
+        self.indptr = None
+        self.indices = None
+        self.fatoracoes = 0
+        self.reutilizacoes = 0
+
+    def mesmo_padrao(self, A):
+        return (self.indptr is not None and A.shape[1] + 1 == self.indptr.size and A.nnz == self.indices.size
+                and np.array_equal(A.indptr, self.indptr) and np.array_equal(A.indices, self.indices))
+
+    def fatorar(self, A):
+        A = A.tocsc()
+        A.sort_indices()
+        self.fatoracoes += 1
+        if self.mesmo_padrao(A):
+            self.reutilizacoes += 1
+            return LUPermutada(splu(A[:, self.inversa], permc_spec="NATURAL"), self.perm_c)
+
+        lu = splu(A, permc_spec=self.permc_spec)
+        self.perm_c = lu.perm_c.copy()
+        self.inversa = np.argsort(self.perm_c)
+        self.indptr = A.indptr.copy()
+        self.indices = A.indices.copy()
+        return lu
+
+    def memoria(self):
+        """Bytes ocupados pela ordenação e pelo padrão guardados"""
+        return sum(a.nbytes for a in (self.perm_c, self.inversa, self.indptr, self.indices) if a is not None)
+
+
+class LUOrdenada:
+    """Fatoração de A[ordem][:, ordem] vista como fatoração de A"""
+
+    def __init__(self, lu, ordem):
+        self.lu = lu
+        self.ordem = ordem
+        self.shape = lu.shape
+        self.nnz = lu.nnz
+
+    def solve(self, b, trans="N"):
+        # A permutação é simétrica: vale igualmente para Aᵀ
+        y = self.lu.solve(b[self.ordem], trans=trans)
+        x = np.empty_like(y)
+        x[self.ordem] = y
+        return x
+
+
+class FatoracaoOrdenada:
+    """Fatoração LU esparsa com uma ordenação simétrica fixa de linhas e colunas
+
+    A ordenação (por exemplo, de uma reordenação das barras) é calculada
+    fora e aplicada a toda matriz fatorada; o SuperLU é chamado com
+    permc_spec="NATURAL" e preferência pelo pivô da diagonal, de modo que
+    a ordem de eliminação seja a escolhida. As soluções são devolvidas na
+    numeração original.
+    """
+
+    def __init__(self, ordem, limiar_pivo=0.1):
+        self.ordem = np.asarray(ordem, dtype=np.intp)
+        self.limiar_pivo = limiar_pivo
+        self.fatoracoes = 0
+        self.reutilizacoes = 0
+
+    def fatorar(self, A):
+        A = A.tocsr()[self.ordem][:, self.ordem].tocsc()
+        self.fatoracoes += 1
+        # A ordenação é calculada fora; a partir da segunda fatoração ela é reaproveitada
+        if self.fatoracoes > 1:
+            self.reutilizacoes += 1
+        lu = splu(A, permc_spec="NATURAL", diag_pivot_thresh=self.limiar_pivo, options={"SymmetricMode": True})
+        return LUOrdenada(lu, self.ordem)
+
+    def memoria(self):
+        """Bytes ocupados pela ordenação guardada"""
+        return self.ordem.nbytes
+
+
+def memoria_lu(lu):
+    """Estimativa dos bytes dos fatores L e U (valor + índice por elemento não nulo)
+
+    O tamanho do valor vem do tipo dos fatores (16 bytes se complexos). Lê
+    o fator L, que é copiado: quem consulta com frequência deve guardar o
+    resultado.
+    """
+    lu = getattr(lu, "lu", lu)
+    L = lu.L
+    return lu.nnz * (L.data.itemsize + L.indices.itemsize)
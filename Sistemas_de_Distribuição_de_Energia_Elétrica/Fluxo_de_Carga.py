@@ -0,0 +1,280 @@
+import argparse
+import math
+import sys
+import time
+
+# Apenas módulos leves no topo: numpy, scipy, matplotlib e tkinter são
+# importados dentro de cada subcomando, somente quando ele precisa deles.
+
+
+def _complexo(texto):
+    from Números_Complexos import converter_complexo
+    try:
+        return converter_complexo(texto)
+    except ValueError as erro:
+        raise argparse.ArgumentTypeError(str(erro))
+
+
+def _rastreador(args):
+    from Rastreamento import NIVEL_ITERACAO, NIVEL_RESUMO, Rastreador
+    return Rastreador(NIVEL_ITERACAO if args.iteracoes else NIVEL_RESUMO, eco=args.iteracoes)
+
+
+def _carregar_sistema(caso):
+    """Caso de casos/ pelo nome ou arquivo(s): .m, .json ou CSVs de barras, ramos [e geradores]"""
+    import os
+    from Casos_de_Teste import caso_padrao
+    if len(caso) > 1 or os.path.isfile(caso[0]):
+        from Importação_de_Casos import carregar_caso
+        return carregar_caso(*caso)
+    return caso_padrao(caso[0])
+
+
+def _validar_caso(parser, caso):
+    """Rejeita com mensagem de uso as combinações de arquivos que carregar_caso não aceita"""
+    import os
+    if not caso:
+        return
+    extensao = os.path.splitext(caso[0])[1].lower()
+    if extensao == ".csv" and not 2 <= len(caso) <= 3:
+        parser.error("--caso com CSV exige os arquivos de barras e ramos (e, opcionalmente, geradores)")
+    if extensao != ".csv" and len(caso) > 1:
+        parser.error("--caso aceita vários arquivos apenas para CSV (barras, ramos [, geradores])")
+
+
+def _imprimir_barras(sistema, V, limite):
+    import numpy as np
+    Vm = np.abs(V)
+    print("\n Barra     V (pu)    θ (graus)")
+    for i in range(min(sistema.n_barras, limite)):
+        print(f"{int(sistema.numeros[i]):6d}  {Vm[i]:9.6f}  {math.degrees(np.angle(V[i])):11.6f}")
+    if sistema.n_barras > limite:
+        print(f"  ... ({sistema.n_barras - limite} barras omitidas)")
+    print(f"Tensão mínima: {Vm.min():.6f} pu (barra {int(sistema.numeros[np.argmin(Vm)])})")
+
+
+def _fluxo_n_barras(args, metodo):
+    sistema = _carregar_sistema(args.caso)
+    S_esp, V0, ref, pv, pq = sistema.dados_fluxo()
+    Ybus = sistema.matriz_admitancia()
+    rastreador = _rastreador(args)
+
+    inicio = time.perf_counter()
+    if metodo == "newton":
+        from Método_de_Newton_N_Barras import newton_raphson_n_barras
+        V, convergiu, iteracoes = newton_raphson_n_barras(Ybus, S_esp, V0, ref, pv, pq, args.tol, args.max_iter,
+                                                          rastreador, desonesto=args.desonesto)
+    else:
+        from Método_de_Newton_Desacoplado_Rápido import fatorar_matrizes_b, fluxo_desacoplado_rapido, matrizes_b
+        B_linha, B_duas_linhas = matrizes_b(sistema.n_barras, *sistema.dados_ramos(), sistema.shunts_de_barra(),
+                                            versao=args.versao)
+        fatores = fatorar_matrizes_b(B_linha, B_duas_linhas, pv, pq)
+        V, convergiu, iteracoes = fluxo_desacoplado_rapido(Ybus, S_esp, V0, pv, pq, fatores, args.tol,
+                                                           args.max_iter, rastreador)
+    tempo = time.perf_counter() - inicio
+
+    print(f"=== {sistema.nome}: {sistema.n_barras} barras ===")
+    print(f"Convergiu: {convergiu} em {iteracoes} iterações ({tempo * 1e3:.2f} ms)")
+    _imprimir_barras(sistema, V, args.limite)
+    return 0 if convergiu else 1
+
+
+def comando_newton(args):
+    if args.caso:
+        return _fluxo_n_barras(args, "newton")
+
+    from Método_de_Newton import calcular_matriz_admitancia, metodo_newton
+    Y = calcular_matriz_admitancia(args.z_linha, args.z_shunt)
+    rastreador = _rastreador(args)
+    V2, theta2 = metodo_newton(Y, args.v1, args.v2, math.radians(args.theta2), args.p, args.tol, args.max_iter,
+                               rastreador)
+
+    print("=== Newton em 2 Barras ===")
+    print(f"Convergiu: {bool(rastreador.n_convergidas)} em {rastreador.total_iteracoes} iterações")
+    print(f"Tensão na barra 2: {V2:.6f} pu")
+    print(f"Ângulo na barra 2: {math.degrees(theta2):.6f}°")
+    return 0 if rastreador.n_convergidas else 1
+
+
+def comando_pq(args):
+    from Método_de_Newton_Barra_PQ import PowerFlowNewton
+    fluxo = PowerFlowNewton()
+    fluxo.matrix_calc(args.z_linha, args.z_shunt)
+    fluxo.v1 = args.v1
+    fluxo.v2 = args.v2
+    fluxo.theta2 = math.radians(args.theta2)
+    fluxo.P_esp = args.p
+    fluxo.Q_esp = args.q
+    convergiu = fluxo.newton_raphson(args.tol, args.max_iter, _rastreador(args), desonesto=args.desonesto)
+
+    P_final, Q_final = fluxo.calculate_power()
+    print("\n=== Barra PQ em 2 Barras ===")
+    print(f"Convergiu: {convergiu}")
+    print(f"Tensão na barra 2: {fluxo.v2:.6f} pu")
+    print(f"Ângulo na barra 2: {math.degrees(fluxo.theta2):.6f}°")
+    print(f"Potências calculadas: P = {P_final:.6f} pu, Q = {Q_final:.6f} pu")
+    return 0 if convergiu else 1
+
+
+def comando_desacoplado(args):
+    if args.caso:
+        return _fluxo_n_barras(args, "desacoplado")
+
+    from Método_de_Newton_Desacoplado_Rápido import matrix_calc, newton_method, power_equation
+    Y = matrix_calc(args.z_linha, args.z_shunt)
+    theta = math.radians(args.theta2)
+    rastreador = _rastreador(args)
+    theta = newton_method(args.p, power_equation(theta, Y, args.v1, args.v2), args.tol, Y, args.v1, args.v2,
+                          theta, args.versao, rastreador)
+
+    print("\n=== Desacoplado Rápido em 2 Barras ===")
+    print(f"Convergiu: {bool(rastreador.n_convergidas)} em {rastreador.total_iteracoes} iterações")
+    print(f"Ângulo na barra 2: {math.degrees(theta):.6f}°")
+    print(f"Potência calculada: {power_equation(theta, Y, args.v1, args.v2):.6f} pu")
+    return 0 if rastreador.n_convergidas else 1
+
+
+def comando_varredura(args):
+    import numpy as np
+    from Varredura_Direta_Inversa import AlimentadorRadial, alimentador_sintetico
+
+    if args.caso:
+        sistema = _carregar_sistema(args.caso)
+        if not sistema.e_radial():
+            print(f"O caso {sistema.nome} não é radial; use newton ou fast-decoupled", file=sys.stderr)
+            return 2
+        S_esp, V0, ref, _, _ = sistema.dados_fluxo()
+        de, para, z_serie, _, _ = sistema.dados_ramos()
+        n_barras, raiz, V_raiz, S_carga = sistema.n_barras, ref[0], abs(V0[ref[0]]), -S_esp
+        y_barra = sistema.shunts_de_barra()
+    else:
+        n_barras, raiz, V_raiz, y_barra = args.barras, 0, 1.0, None
+        de, para, z_serie, S_carga = alimentador_sintetico(n_barras, args.semente)
+
+    inicio = time.perf_counter()
+    alimentador = AlimentadorRadial(n_barras, de, para, z_serie, raiz, y_barra)
+    t_preparo = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    V, I_ramo, convergiu, iteracoes = alimentador.varredura(S_carga, V_raiz, tol=args.tol, max_iter=args.max_iter)
+    t_solucao = time.perf_counter() - inicio
+
+    print(f"=== Varredura Direta/Inversa: {n_barras} barras ===")
+    print(f"Convergiu: {convergiu} em {iteracoes} iterações")
+    print(f"Tempo de preparação: {t_preparo * 1e3:.2f} ms, tempo de solução: {t_solucao * 1e3:.2f} ms")
+    print(f"Tensão mínima: {np.abs(V).min():.6f} pu (barra {np.argmin(np.abs(V))})")
+    print(f"Corrente máxima de ramo: {np.abs(I_ramo).max():.6f} pu")
+    return 0 if convergiu else 1
+
+
+def comando_gui(args):
+    try:
+        from tkinter import Tk
+    except ImportError:
+        print("tkinter não está disponível nesta instalação do Python", file=sys.stderr)
+        return 2
+    from Método_de_Newton_Barra_PQ_Interface_Gráfica import PowerFlowGUI
+
+    root = Tk()
+    PowerFlowGUI(root)
+    root.mainloop()
+    return 0
+
+
+def comando_grafico(args):
+    from Rastreamento import Rastreador
+    from Resolução_de_Barras_Por_Tentativa_e_Erro import plotar_fasores, tentativa_e_erro
+
+    correntes, tensoes, convergiu = tentativa_e_erro(args.v2, args.s2, args.z12, args.tol, args.max_iter,
+                                                     Rastreador())
+    I, V = correntes[-1], tensoes[-1]
+    print(f"Convergiu: {convergiu} em {correntes.size} iterações")
+    print(f"Corrente I: {abs(I):.4f} < {math.degrees(math.atan2(I.imag, I.real)):.4f}°")
+    print(f"Tensão V1: {abs(V):.4f} < {math.degrees(math.atan2(V.imag, V.real)):.4f}°")
+    try:
+        plotar_fasores(I, V, args.saida)
+    except ImportError:
+        print("matplotlib não está instalado; o gráfico não foi gerado", file=sys.stderr)
+        return 2
+    if args.saida:
+        print(f"Figura salva em '{args.saida}'")
+    return 0 if convergiu else 1
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(prog="Fluxo_de_Carga.py",
+                                     description="Fluxo de carga pela linha de comando (sem perguntas interativas)")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    def comuns(sub, max_iter):
+        sub.add_argument("--tol", type=float, default=1e-6, help="tolerância de convergência")
+        sub.add_argument("--max-iter", type=int, default=max_iter, help="número máximo de iterações")
+        sub.add_argument("--iteracoes", action="store_true", help="imprime cada iteração")
+
+    def duas_barras(sub):
+        sub.add_argument("--z-linha", type=_complexo, default="0.05+0.25j", help="impedância série (a+bj ou m<θ)")
+        sub.add_argument("--z-shunt", type=_complexo, default="1000j", help="impedância shunt da linha")
+        sub.add_argument("--v1", type=float, default=1.0, help="tensão na barra 1 (pu)")
+        sub.add_argument("--v2", type=float, default=1.0, help="tensão inicial na barra 2 (pu)")
+        sub.add_argument("--theta2", type=float, default=0.0, help="ângulo inicial na barra 2 (graus)")
+
+    def n_barras(sub):
+        sub.add_argument("--caso", nargs="+", metavar="CASO",
+                         help="caso de N barras: nome em casos/, arquivo .m/.json ou CSVs de barras, ramos "
+                              "[e geradores]")
+        sub.add_argument("--limite", type=int, default=30, help="máximo de barras listadas")
+
+    sub = subcomandos.add_parser("newton", help="Newton-Raphson (2 barras ou caso de N barras)")
+    duas_barras(sub)
+    n_barras(sub)
+    sub.add_argument("--p", type=float, default=0.5, help="potência ativa especificada na barra 2 (pu)")
+    sub.add_argument("--desonesto", action="store_true", help="reaproveita a fatoração do Jacobiano (N barras)")
+    comuns(sub, 20)
+    sub.set_defaults(funcao=comando_newton)
+
+    sub = subcomandos.add_parser("pq", help="Newton-Raphson com barra PQ (2 barras)")
+    duas_barras(sub)
+    sub.add_argument("--p", type=float, default=-0.2, help="potência ativa especificada (pu)")
+    sub.add_argument("--q", type=float, default=-0.01, help="potência reativa especificada (pu)")
+    sub.add_argument("--desonesto", action="store_true", help="reaproveita a fatoração do Jacobiano")
+    comuns(sub, 20)
+    sub.set_defaults(funcao=comando_pq)
+
+    sub = subcomandos.add_parser("fast-decoupled", help="desacoplado rápido (2 barras ou caso de N barras)")
+    duas_barras(sub)
+    n_barras(sub)
+    sub.add_argument("--p", type=float, default=0.5, help="potência ativa especificada na barra 2 (pu)")
+    sub.add_argument("--versao", choices=("XB", "BX"), default="XB", help="versão das matrizes B' e B''")
+    comuns(sub, 50)
+    sub.set_defaults(funcao=comando_desacoplado)
+
+    sub = subcomandos.add_parser("sweep", help="varredura direta/inversa em alimentador radial")
+    sub.add_argument("--caso", nargs="+", metavar="CASO",
+                     help="caso radial: nome em casos/, arquivo .m/.json ou CSVs de barras, ramos [e geradores]")
+    sub.add_argument("--barras", type=int, default=10000, help="barras do alimentador sintético")
+    sub.add_argument("--semente", type=int, default=0, help="semente do alimentador sintético")
+    comuns(sub, 100)
+    sub.set_defaults(funcao=comando_varredura)
+
+    sub = subcomandos.add_parser("gui", help="interface gráfica (tkinter)")
+    sub.set_defaults(funcao=comando_gui)
+
+    sub = subcomandos.add_parser("plot", help="tentativa e erro em 2 barras com o gráfico dos fasores")
+    sub.add_argument("--v2", type=_complexo, default="1.0", help="tensão inicial na barra 2")
+    sub.add_argument("--s2", type=_complexo, default="0.5+0.2j", help="potência na barra 2")
+    sub.add_argument("--z12", type=_complexo, default="0.05+0.25j", help="impedância da linha")
+    sub.add_argument("--saida", help="arquivo da figura (.png, .pdf, .svg); sem ele abre uma janela")
+    comuns(sub, 100)
+    sub.set_defaults(funcao=comando_grafico)
+
+    return parser
+
+
+def main(argv=None):
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+    _validar_caso(parser, getattr(args, "caso", None))
+    return args.funcao(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+import time
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+
+from Matriz_de_Admitância_Esparsa import ybus_duas_barras
+from Método_de_Newton_N_Barras import calcular_jacobiano, calcular_potencias, newton_raphson_n_barras
+
+
+def _jacobiano_aumentado(Ybus, V, pvpq, pq, direcao, parametro):
+    """[[J, -d], [e_p]]: Jacobiano polar com a coluna de λ e a equação de parametrização"""
+    J = calcular_jacobiano(Ybus, V, pvpq, pq)
+    n = J.shape[0]
+    coluna = sp.csc_matrix(-direcao.reshape(-1, 1))
+    linha = sp.csr_matrix(([1.0], ([0], [parametro])), shape=(1, n + 1))
+    return sp.vstack((sp.hstack((J, coluna)), linha), format="csc")
+
+
+def _refinar_maximo(lambdas, tensoes):
+    """Máximo de λ por uma parábola λ(V) nos três pontos em torno do nariz
+
+    V é o módulo de tensão da barra que mais varia nesses pontos; perto do
+    nariz a curva PV é aproximadamente uma parábola nessa variável.
+    """
+    i = int(np.argmax(lambdas))
+    if i == 0 or i == lambdas.size - 1:
+        return float(lambdas[i])
+    Vm = np.abs(tensoes[i - 1:i + 2])
+    barra = np.argmax(np.ptp(Vm, axis=0))
+    a, b, c = np.polyfit(Vm[:, barra], lambdas[i - 1:i + 2], 2)
+    if a >= 0:
+        return float(lambdas[i])
+    return float(max(c - b ** 2 / (4 * a), lambdas[i]))
+
+
+def fluxo_continuado(Ybus, S_base, S_direcao, V0, ref, pv, pq, passo=0.1, passo_min=1e-4, passo_max=1.0,
+                     erro_alvo=0.01, fracao_final=0.5, tol=1e-6, max_iter=10, max_passos=300, ate_o_nariz=False):
+    """Fluxo de carga continuado (curva PV) com previsor tangente e parametrização local
+
+    As injeções seguem S(λ) = S_base + λ * S_direcao. A cada passo:
+      1. o vetor tangente é obtido do Jacobiano aumentado no ponto atual;
+      2. o previsor avança passo * tangente (tangente normalizada);
+      3. o corretor de Newton mantém fixa a componente de maior variação da
+         tangente (λ longe do nariz, um módulo de tensão perto dele);
+      4. o passo é ajustado pela distância entre previsão e correção, que
+         cresce com a curvatura da curva.
+
+    Após o nariz a curva segue até λ = fracao_final * λ_max (ou para no nariz
+    com ate_o_nariz=True). Retorna (lambdas, tensoes, lambda_max,
+    solucoes_lineares), com tensoes de forma (n_pontos, n_barras).
+    """
+    S_base = np.asarray(S_base, dtype=complex)
+    S_direcao = np.asarray(S_direcao, dtype=complex)
+    pv = np.asarray(pv, dtype=np.intp)
+    pq = np.asarray(pq, dtype=np.intp)
+    pvpq = np.concatenate((pv, pq))
+    n_pvpq = pvpq.size
+    direcao = np.concatenate((S_direcao[pvpq].real, S_direcao[pq].imag))
+
+    # Ponto inicial: caso base (λ = 0) resolvido pelo Newton convencional
+    V, convergiu, _ = newton_raphson_n_barras(Ybus, S_base, V0, ref, pv, pq, tol)
+    if not convergiu:
+        raise ValueError("O caso base (λ = 0) não convergiu")
+    Va = np.angle(V)
+    Vm = np.abs(V)
+
+    def montar(y):
+        Va[pvpq] = y[:n_pvpq]
+        Vm[pq] = y[n_pvpq:-1]
+        return Vm * np.exp(1j * Va)
+
+    def corrigir(y, parametro):
+        """Newton no sistema aumentado; retorna (y corrigido, convergiu, soluções lineares)"""
+        y = y.copy()
+        V = montar(y)
+        for iteracao in range(max_iter):
+            DeltaS = S_base + y[-1] * S_direcao - calcular_potencias(Ybus, V)
+            residuo = np.concatenate((DeltaS[pvpq].real, DeltaS[pq].imag))
+            if np.max(np.abs(residuo), initial=0.0) < tol:
+                return y, V, True, iteracao
+            try:
+                lu = splu(_jacobiano_aumentado(Ybus, V, pvpq, pq, direcao, parametro))
+            except RuntimeError:
+                return y, V, False, iteracao
+            y += lu.solve(np.concatenate((residuo, [0.0])))
+            V = montar(y)
+        return y, V, False, max_iter
+
+    y = np.concatenate((Va[pvpq], Vm[pq], [0.0]))
+    indice_lambda = y.size - 1
+    parametro = indice_lambda
+    tangente_anterior = None
+    lambdas = [0.0]
+    tensoes = [V.copy()]
+    solucoes = 0
+    passou_nariz = False
+    unitario = np.zeros(y.size)
+    unitario[-1] = 1.0
+
+    for _ in range(max_passos):
+        # Previsor: tangente do Jacobiano aumentado no ponto atual
+        tangente = splu(_jacobiano_aumentado(Ybus, V, pvpq, pq, direcao, parametro)).solve(unitario)
+        solucoes += 1
+        tangente /= np.linalg.norm(tangente)
+        if tangente_anterior is None:
+            tangente *= np.sign(tangente[-1]) or 1.0
+        elif tangente @ tangente_anterior < 0:
+            tangente = -tangente
+        if tangente_anterior is not None and tangente[-1] < 0 <= tangente_anterior[-1]:
+            passou_nariz = True
+            if ate_o_nariz:
+                break
+        parametro = int(np.argmax(np.abs(tangente)))
+
+        while True:
+            previsao = y + passo * tangente
+
+            # Último ponto: corrigido exatamente em λ = fracao_final * λ_max
+            ultimo = passou_nariz and previsao[-1] <= fracao_final * max(lambdas)
+            if ultimo:
+                parametro = indice_lambda
+                previsao[-1] = fracao_final * max(lambdas)
+
+            y_c, V_c, convergiu, iteracoes = corrigir(previsao, parametro)
+            solucoes += iteracoes
+            if convergiu or passo <= passo_min:
+                break
+            # Com λ fixo além do nariz não há solução: passa a fixar a tensão de maior variação
+            if parametro == indice_lambda and not ultimo:
+                parametro = int(np.argmax(np.abs(tangente[:-1])))
+            else:
+                passo = max(passo / 2, passo_min)
+
+        if not convergiu:
+            break
+
+        # Passo adaptado à curvatura (erro do previsor ~ curvatura * passo²)
+        erro = np.max(np.abs(y_c - previsao))
+        fator = np.clip(np.sqrt(erro_alvo / max(erro, 1e-12)), 0.5, 2.0)
+        passo = float(np.clip(passo * fator, passo_min, passo_max))
+
+        y, V = y_c, V_c.copy()
+        tangente_anterior = tangente
+        lambdas.append(y[-1])
+        tensoes.append(V)
+        if ultimo:
+            break
+
+    lambdas = np.array(lambdas)
+    tensoes = np.array(tensoes)
+    return lambdas, tensoes, _refinar_maximo(lambdas, tensoes), solucoes
+
+
+def curva_pv_duas_barras(z_linha, z_shunt, fator_potencia=1.0, V1=1.0, **opcoes):
+    """Curva PV da barra 2 do sistema de 2 barras (carga crescente com fator de potência fixo)
+
+    Retorna (P_carga, V2, P_max, solucoes_corretor) em pu.
+    """
+    Ybus = ybus_duas_barras(z_linha, z_shunt)
+    tan_phi = np.tan(np.arccos(fator_potencia))
+    S_direcao = np.array([0.0, -(1.0 + 1j * tan_phi)])
+    lambdas, tensoes, lambda_max, solucoes = fluxo_continuado(
+        Ybus, np.zeros(2, dtype=complex), S_direcao, np.array([V1, V1], dtype=complex),
+        np.array([0]), np.array([], dtype=np.intp), np.array([1]), **opcoes)
+    return lambdas, np.abs(tensoes[:, 1]), lambda_max, solucoes
+
+
+if __name__ == "__main__":
+    from Números_Complexos import converter_complexo
+
+    print("=== Fluxo de Carga Continuado (Curva PV) em 2 Barras ===")
+
+    z_linha = converter_complexo(input("\nImpedância série da linha (ex: 0.05+0.25j): ") or "0.05+0.25j")
+    z_shunt = converter_complexo(input("Impedância shunt da linha (ex: 1000j): ") or "1000j")
+    fator_potencia = float(input("Fator de potência da carga (ex: 0.95): ") or "0.95")
+
+    inicio = time.perf_counter()
+    P, V2, P_max, solucoes = curva_pv_duas_barras(z_linha, z_shunt, fator_potencia)
+    tempo = time.perf_counter() - inicio
+
+    print("\n   P (pu)      V2 (pu)")
+    for p, v in zip(P, V2):
+        print(f"  {p:8.5f}    {v:8.5f}")
+
+    nariz = np.argmax(P)
+    print("\n=== Resultados Finais ===")
+    print(f"Máximo carregamento: P = {P_max:.6f} pu com V2 = {V2[nariz]:.6f} pu")
+    print(f"Pontos da curva: {P.size}, soluções lineares: {solucoes}, tempo: {tempo * 1e3:.2f} ms")
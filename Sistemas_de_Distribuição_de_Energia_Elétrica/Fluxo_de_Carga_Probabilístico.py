@@ -0,0 +1,265 @@
+import os
+import time
+import numpy as np
+import scipy.sparse as sp
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from Método_de_Newton_N_Barras import newton_raphson_n_barras, tipos_de_barra
+
+
+# Rede em memória compartilhada
+def publicar_arrays(arrays):
+    """Copia arrays para blocos de memória compartilhada
+
+    Retorna (blocos, descritor); o descritor é pequeno e pode ser enviado
+    aos processos, que reconstroem os arrays sem cópia com anexar_arrays.
+    """
+    blocos = []
+    descritor = {}
+    for nome, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        bloco = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=bloco.buf)[...] = array
+        blocos.append(bloco)
+        descritor[nome] = (bloco.name, array.shape, array.dtype.str)
+    return blocos, descritor
+
+
+def anexar_arrays(descritor):
+    """Reconstrói os arrays publicados por publicar_arrays (sem cópia)"""
+    blocos = []
+    arrays = {}
+    for nome, (nome_bloco, formato, dtype) in descritor.items():
+        bloco = shared_memory.SharedMemory(name=nome_bloco)
+        blocos.append(bloco)
+        arrays[nome] = np.ndarray(formato, dtype=np.dtype(dtype), buffer=bloco.buf)
+    return blocos, arrays
+
+
+def liberar_blocos(blocos):
+    """Fecha e remove os blocos de memória compartilhada criados pelo processo principal"""
+    for bloco in blocos:
+        bloco.close()
+        bloco.unlink()
+
+
+def arrays_da_rede(Ybus, S_base, V0, ref, pv, pq):
+    """Arrays que descrevem a rede e o caso base"""
+    Ybus = Ybus.tocsr()
+    return {
+        "dados": Ybus.data, "indices": Ybus.indices, "indptr": Ybus.indptr,
+        "S_base": np.asarray(S_base, dtype=complex), "V0": np.asarray(V0, dtype=complex),
+        "ref": np.asarray(ref, dtype=np.intp), "pv": np.asarray(pv, dtype=np.intp),
+        "pq": np.asarray(pq, dtype=np.intp),
+    }
+
+
+# Distribuições de probabilidade das injeções
+def amostrar_injecoes(rng, distribuicoes, n_amostras, n_barras):
+    """Sorteia variações de potência injetada (n_amostras, n_barras)
+
+    Cada distribuição é uma tupla:
+      ("normal", barras, media, desvio)        -> media + desvio * N(0, 1)
+      ("uniforme", barras, minimo, maximo)     -> valor entre mínimo e máximo
+      ("beta", barras, capacidade, a, b)       -> capacidade * Beta(a, b) (geração FV)
+    Os parâmetros podem ser complexos (P + jQ) e escalares ou arrays por barra.
+    """
+    delta_S = np.zeros((n_amostras, n_barras), dtype=complex)
+    for tipo, barras, *parametros in distribuicoes:
+        barras = np.asarray(barras, dtype=np.intp)
+        formato = (n_amostras, barras.size)
+        if tipo == "normal":
+            media, desvio = parametros
+            valor = media + desvio * rng.standard_normal(formato)
+        elif tipo == "uniforme":
+            minimo, maximo = parametros
+            valor = minimo + (np.asarray(maximo) - minimo) * rng.random(formato)
+        elif tipo == "beta":
+            capacidade, a, b = parametros
+            valor = capacidade * rng.beta(a, b, formato)
+        else:
+            raise ValueError(f"Distribuição desconhecida: {tipo}")
+        delta_S[:, barras] += valor
+    return delta_S
+
+
+# Estatísticas acumuladas em memória constante
+class AcumuladorTensoes:
+    """Estatísticas online dos módulos de tensão por barra
+
+    Média e variância pelo algoritmo de Welford/Chan, contagem de violações
+    e histograma de faixas fixas para os percentis; a memória depende apenas
+    do número de barras e de faixas, nunca do número de amostras.
+    """
+
+    def __init__(self, n_barras, v_min=0.93, v_max=1.05, faixa=(0.8, 1.2), n_faixas=400):
+        self.n = 0
+        self.media = np.zeros(n_barras)
+        self.m2 = np.zeros(n_barras)
+        self.subtensao = np.zeros(n_barras, dtype=np.int64)
+        self.sobretensao = np.zeros(n_barras, dtype=np.int64)
+        self.nao_convergidas = 0
+        self.v_min = v_min
+        self.v_max = v_max
+        self.bordas = np.linspace(faixa[0], faixa[1], n_faixas + 1)
+        self.histograma = np.zeros((n_barras, n_faixas + 2), dtype=np.int64)
+
+    def adicionar(self, Vm):
+        """Acrescenta um bloco de amostras (n_amostras, n_barras)"""
+        n_bloco = Vm.shape[0]
+        if n_bloco == 0:
+            return
+        media_bloco = Vm.mean(axis=0)
+        m2_bloco = ((Vm - media_bloco) ** 2).sum(axis=0)
+        self._combinar_momentos(n_bloco, media_bloco, m2_bloco)
+
+        self.subtensao += (Vm < self.v_min).sum(axis=0)
+        self.sobretensao += (Vm > self.v_max).sum(axis=0)
+
+        # Faixa 0 e última guardam valores fora do intervalo do histograma
+        faixas = np.searchsorted(self.bordas, Vm, side="right")
+        n_colunas = self.histograma.shape[1]
+        deslocamento = np.arange(Vm.shape[1]) * n_colunas
+        self.histograma += np.bincount((faixas + deslocamento).ravel(),
+                                       minlength=self.histograma.size).reshape(self.histograma.shape)
+
+    def combinar(self, outro):
+        """Incorpora as estatísticas de outro acumulador (de outro processo)"""
+        if outro.n > 0:
+            self._combinar_momentos(outro.n, outro.media, outro.m2)
+        self.subtensao += outro.subtensao
+        self.sobretensao += outro.sobretensao
+        self.histograma += outro.histograma
+        self.nao_convergidas += outro.nao_convergidas
+
+    def _combinar_momentos(self, n_b, media_b, m2_b):
+        n_total = self.n + n_b
+        delta = media_b - self.media
+        self.media = self.media + delta * n_b / n_total
+        self.m2 = self.m2 + m2_b + delta ** 2 * self.n * n_b / n_total
+        self.n = n_total
+
+    def desvio_padrao(self):
+        return np.sqrt(self.m2 / max(self.n - 1, 1))
+
+    def percentil(self, p):
+        """Percentil aproximado (resolução de uma faixa do histograma)"""
+        acumulado = np.cumsum(self.histograma, axis=1)
+        alvo = p / 100 * acumulado[:, -1:]
+        faixa = np.argmax(acumulado >= np.maximum(alvo, 1), axis=1)
+        centros = np.concatenate(([self.bordas[0]], (self.bordas[:-1] + self.bordas[1:]) / 2, [self.bordas[-1]]))
+        return centros[faixa]
+
+    def probabilidade_violacao(self):
+        n = max(self.n, 1)
+        return self.subtensao / n, self.sobretensao / n
+
+
+# Processos de trabalho
+_rede = {}
+
+
+def _iniciar_trabalhador(descritor, n_barras, distribuicoes, opcoes):
+    """Anexa a rede compartilhada uma única vez por processo"""
+    blocos, arrays = anexar_arrays(descritor)
+    _rede["blocos"] = blocos
+    _rede["arrays"] = arrays
+    _rede["Ybus"] = sp.csr_matrix((arrays["dados"], arrays["indices"], arrays["indptr"]),
+                                  shape=(n_barras, n_barras), copy=False)
+    _rede["distribuicoes"] = distribuicoes
+    _rede["opcoes"] = opcoes
+
+
+def _resolver_lote(semente, n_amostras):
+    """Resolve um lote de amostras e devolve apenas suas estatísticas"""
+    arrays = _rede["arrays"]
+    opcoes = _rede["opcoes"]
+    Ybus = _rede["Ybus"]
+    n_barras = Ybus.shape[0]
+
+    rng = np.random.default_rng(semente)
+    delta_S = amostrar_injecoes(rng, _rede["distribuicoes"], n_amostras, n_barras)
+
+    acumulador = AcumuladorTensoes(n_barras, opcoes["v_min"], opcoes["v_max"],
+                                   opcoes["faixa"], opcoes["n_faixas"])
+    Vm = np.empty((n_amostras, n_barras))
+    convergidas = np.zeros(n_amostras, dtype=bool)
+
+    V_ini = arrays["V0"]
+    for k in range(n_amostras):
+        V, convergidas[k], _ = newton_raphson_n_barras(
+            Ybus, arrays["S_base"] + delta_S[k], V_ini, arrays["ref"], arrays["pv"], arrays["pq"],
+            opcoes["tol"], opcoes["max_iter"])
+        Vm[k] = np.abs(V)
+
+    acumulador.adicionar(Vm[convergidas])
+    acumulador.nao_convergidas = int(n_amostras - convergidas.sum())
+    return acumulador
+
+
+def fluxo_probabilistico(Ybus, S_base, V0, ref, pv, pq, distribuicoes, n_amostras,
+                         tamanho_lote=500, n_processos=None, semente=0, v_min=0.93, v_max=1.05,
+                         faixa=(0.8, 1.2), n_faixas=400, tol=1e-6, max_iter=20):
+    """Fluxo de carga probabilístico por Monte Carlo em um conjunto de processos
+
+    A rede é publicada uma vez em memória compartilhada; cada tarefa recebe
+    apenas a semente e o tamanho do seu lote. Retorna um AcumuladorTensoes
+    com as estatísticas de todas as amostras convergidas.
+    """
+    n_barras = Ybus.shape[0]
+    opcoes = {"v_min": v_min, "v_max": v_max, "faixa": faixa, "n_faixas": n_faixas,
+              "tol": tol, "max_iter": max_iter}
+
+    tamanhos = [tamanho_lote] * (n_amostras // tamanho_lote)
+    if n_amostras % tamanho_lote:
+        tamanhos.append(n_amostras % tamanho_lote)
+    sementes = np.random.SeedSequence(semente).spawn(len(tamanhos))
+
+    total = AcumuladorTensoes(n_barras, v_min, v_max, faixa, n_faixas)
+    blocos, descritor = publicar_arrays(arrays_da_rede(Ybus, S_base, V0, ref, pv, pq))
+    try:
+        with ProcessPoolExecutor(max_workers=n_processos or os.cpu_count(),
+                                 initializer=_iniciar_trabalhador,
+                                 initargs=(descritor, n_barras, distribuicoes, opcoes)) as executor:
+            for parcial in executor.map(_resolver_lote, sementes, tamanhos):
+                total.combinar(parcial)
+    finally:
+        liberar_blocos(blocos)
+
+    return total
+
+
+if __name__ == "__main__":
+    from Matriz_de_Admitância_Esparsa import montar_ybus
+    from Varredura_Direta_Inversa import alimentador_sintetico
+
+    print("=== Fluxo de Carga Probabilístico (Monte Carlo) ===")
+
+    n_barras = int(input("\nNúmero de barras do alimentador sintético (ex: 200): ") or "200")
+    n_amostras = int(input("Número de amostras (ex: 2000): ") or "2000")
+
+    de, para, z_serie, S_carga = alimentador_sintetico(n_barras)
+    Ybus = montar_ybus(n_barras, de, para, z_serie)
+    ref = np.array([0])
+    pv = np.array([], dtype=np.intp)
+    pq = tipos_de_barra(n_barras, ref, pv)
+
+    # Cargas com 20% de desvio padrão e geração FV em 10% das barras
+    cargas = ("normal", pq, 0, 0.2 * S_carga[pq])
+    fv = ("beta", pq[::10], 2 * S_carga[pq[::10]].real, 2.0, 2.0)
+
+    inicio = time.perf_counter()
+    estatisticas = fluxo_probabilistico(Ybus, -S_carga, np.ones(n_barras, dtype=complex), ref, pv, pq,
+                                        [cargas, fv], n_amostras, v_min=0.95)
+    tempo = time.perf_counter() - inicio
+
+    p_sub, p_sobre = estatisticas.probabilidade_violacao()
+    pior = np.argmax(p_sub)
+    print("\n=== Resultados Finais ===")
+    print(f"Amostras convergidas: {estatisticas.n} ({estatisticas.nao_convergidas} não convergidas)")
+    print(f"Tempo total: {tempo:.2f} s")
+    print(f"Barra com maior probabilidade de subtensão: {pior} ({100 * p_sub[pior]:.2f}%)")
+    print(f"  Média: {estatisticas.media[pior]:.6f} pu, desvio: {estatisticas.desvio_padrao()[pior]:.6f} pu")
+    print(f"  P5: {estatisticas.percentil(5)[pior]:.4f} pu, P95: {estatisticas.percentil(95)[pior]:.4f} pu")
+    print(f"Probabilidade máxima de sobretensão: {100 * p_sobre.max():.2f}%")
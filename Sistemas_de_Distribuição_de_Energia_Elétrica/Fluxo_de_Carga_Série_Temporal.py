@@ -0,0 +1,102 @@
+import time
+import numpy as np
+
+from Fatoração_Esparsa import FatoracaoReutilizavel
+from Método_de_Newton_N_Barras import newton_raphson_n_barras
+from Método_de_Newton_Desacoplado_Rápido import fatorar_matrizes_b, fluxo_desacoplado_rapido
+
+
+def resolvedor_newton(Ybus, ref, pv, pq, tol=1e-6, max_iter=20):
+    """Resolvedor de um passo pelo método de Newton (Ybus e ordenação do Jacobiano reaproveitadas)"""
+    fatoracao = FatoracaoReutilizavel()
+
+    def resolver(S_esp, V_ini):
+        return newton_raphson_n_barras(Ybus, S_esp, V_ini, ref, pv, pq, tol, max_iter, fatorar=fatoracao.fatorar)
+    return resolver
+
+
+def resolvedor_desacoplado(Ybus, B_linha, B_duas_linhas, pv, pq, tol=1e-6, max_iter=50):
+    """Resolvedor de um passo pelo método desacoplado rápido (B' e B'' fatoradas uma vez)"""
+    fatores = fatorar_matrizes_b(B_linha, B_duas_linhas, pv, pq)
+
+    def resolver(S_esp, V_ini):
+        return fluxo_desacoplado_rapido(Ybus, S_esp, V_ini, pv, pq, fatores, tol, max_iter)
+    return resolver
+
+
+def resolvedor_varredura(alimentador, V_raiz=1.0, tol=1e-6, max_iter=100):
+    """Resolvedor de um passo pela varredura direta/inversa (árvore preparada uma vez)"""
+    def resolver(S_esp, V_ini):
+        V, _, convergiu, iteracoes = alimentador.varredura(-S_esp, V_raiz, V_ini, tol, max_iter)
+        return V, convergiu, iteracoes
+    return resolver
+
+
+def fluxo_serie_temporal(resolver, carga, V0, geracao=None, saida=None, gravador=None):
+    """Resolve o fluxo de carga para cada instante de um perfil (passos, barras)
+
+    Cada passo parte das tensões convergidas do passo anterior (partida
+    a quente). Os resultados são gravados em arrays pré-alocados; 'saida'
+    permite fornecer arrays próprios (por exemplo, mapeados em disco).
+    Com um GravadorColunar as tensões de cada passo vão direto para o
+    disco e o array de tensões não é alocado (V retorna None).
+
+    Retorna (V, iteracoes, convergiu).
+    """
+    carga = np.asarray(carga)
+    n_passos, n_barras = carga.shape
+
+    if saida is None:
+        V = None if gravador is not None else np.empty((n_passos, n_barras), dtype=complex)
+        iteracoes = np.empty(n_passos, dtype=np.int64)
+        convergiu = np.empty(n_passos, dtype=bool)
+    else:
+        V, iteracoes, convergiu = saida
+
+    V_ini = np.array(V0, dtype=complex)
+    for passo in range(n_passos):
+        S_esp = -carga[passo] if geracao is None else geracao[passo] - carga[passo]
+        V_passo, convergiu[passo], iteracoes[passo] = resolver(S_esp, V_ini)
+        if gravador is not None:
+            gravador.adicionar_linha(V_passo)
+        if V is not None:
+            V[passo] = V_passo
+
+        # Partida a quente apenas a partir de soluções convergidas
+        if convergiu[passo]:
+            V_ini = V_passo
+
+    return V, iteracoes, convergiu
+
+
+def perfil_diario(n_passos, n_barras, carga_base, semente=0):
+    """Gera um perfil horário de carga sintético com ciclo diário e ruído por barra"""
+    rng = np.random.default_rng(semente)
+    horas = np.arange(n_passos)
+    ciclo = 0.6 + 0.4 * np.sin(np.pi * ((horas % 24) - 6) / 12) ** 2
+    ruido = 1 + 0.05 * rng.standard_normal((n_passos, n_barras))
+    return ciclo[:, None] * ruido * np.asarray(carga_base)[None, :]
+
+
+if __name__ == "__main__":
+    from Varredura_Direta_Inversa import AlimentadorRadial, alimentador_sintetico
+
+    print("=== Fluxo de Carga em Série Temporal ===")
+
+    n_barras = int(input("\nNúmero de barras do alimentador sintético (ex: 1000): ") or "1000")
+    n_passos = int(input("Número de passos horários (ex: 8760): ") or "8760")
+
+    de, para, z_serie, S_carga = alimentador_sintetico(n_barras)
+    alimentador = AlimentadorRadial(n_barras, de, para, z_serie)
+    carga = perfil_diario(n_passos, n_barras, S_carga)
+
+    inicio = time.perf_counter()
+    V, iteracoes, convergiu = fluxo_serie_temporal(resolvedor_varredura(alimentador), carga,
+                                                   np.ones(n_barras, dtype=complex))
+    tempo = time.perf_counter() - inicio
+
+    print("\n=== Resultados Finais ===")
+    print(f"Passos convergidos: {convergiu.sum()} de {n_passos}")
+    print(f"Iterações médias por passo: {iteracoes.mean():.2f}")
+    print(f"Tempo total: {tempo:.2f} s ({tempo / n_passos * 1e3:.3f} ms por passo)")
+    print(f"Tensão mínima no período: {np.abs(V).min():.6f} pu")
@@ -0,0 +1,296 @@
+import time
+import numpy as np
+import scipy.sparse as sp
+
+from Método_de_Newton_N_Barras import newton_raphson_n_barras, tipos_de_barra
+from Varredura_Direta_Inversa import AlimentadorRadial, alimentador_sintetico
+
+# Operador de rotação de 120° e tensões equilibradas de sequência positiva (a, b, c)
+OPERADOR_A = np.exp(2j * np.pi / 3)
+SEQUENCIA_POSITIVA = OPERADOR_A ** -np.arange(3)
+
+
+def _ramos_trifasicos(n_ramos, Z_fase, fases=None, Y_shunt=None):
+    """Valida os ramos e zera as linhas e colunas das fases ausentes
+
+    Retorna (Z, fases, Y_shunt) com Z e Y_shunt de forma (n_ramos, 3, 3)
+    e fases booleano de forma (n_ramos, 3).
+    """
+    Z = np.asarray(Z_fase, dtype=complex)
+    if Z.shape != (n_ramos, 3, 3):
+        raise ValueError(f"Z_fase deve ter forma ({n_ramos}, 3, 3), recebido {Z.shape}")
+    fases = np.ones((n_ramos, 3), dtype=bool) if fases is None else np.asarray(fases, dtype=bool)
+    if fases.shape != (n_ramos, 3):
+        raise ValueError(f"fases deve ter forma ({n_ramos}, 3), recebido {fases.shape}")
+    if not fases.any(axis=1).all():
+        raise ValueError("Todo ramo deve ter ao menos uma fase")
+
+    cruzada = fases[:, :, None] & fases[:, None, :]
+    Z = np.where(cruzada, Z, 0)
+    if Y_shunt is not None:
+        Y_shunt = np.where(cruzada, np.asarray(Y_shunt, dtype=complex), 0)
+    return Z, fases, Y_shunt
+
+
+def _tensoes_fonte(V_raiz):
+    """Tensões de fase da fonte: escalar (equilibrada, a-b-c) ou três fasores"""
+    V_raiz = np.asarray(V_raiz, dtype=complex)
+    return V_raiz * SEQUENCIA_POSITIVA if V_raiz.ndim == 0 else V_raiz.reshape(3)
+
+
+def _cargas(S, n_barras, permitidas, tipo):
+    if S is None:
+        return np.zeros((n_barras, 3), dtype=complex)
+    S = np.asarray(S, dtype=complex)
+    if S.shape != (n_barras, 3):
+        raise ValueError(f"Cargas em {tipo} devem ter forma ({n_barras}, 3), recebido {S.shape}")
+    if np.any((S != 0) & ~permitidas):
+        barra = np.flatnonzero(np.any((S != 0) & ~permitidas, axis=1))[0]
+        raise ValueError(f"Carga em {tipo} na barra {barra} usa fase ausente")
+    return S
+
+
+def correntes_de_carga(V, S_estrela, S_delta):
+    """Correntes de fase (n, 3) de cargas de potência constante em estrela e em delta
+
+    S_delta[:, k] é a carga entre as fases k e k+1 (ab, bc, ca).
+    """
+    I = np.conj(np.divide(S_estrela, V, out=np.zeros_like(V), where=S_estrela != 0))
+    V_linha = V - np.roll(V, -1, axis=-1)
+    I_delta = np.conj(np.divide(S_delta, V_linha, out=np.zeros_like(V), where=S_delta != 0))
+    # I_a = I_ab - I_ca, I_b = I_bc - I_ab, I_c = I_ca - I_bc
+    return I + I_delta - np.roll(I_delta, 1, axis=-1)
+
+
+def desequilibrio_tensao(V):
+    """Fator de desequilíbrio |V2| / |V1| por barra (nan nas barras sem as três fases)"""
+    V1 = (V[:, 0] + OPERADOR_A * V[:, 1] + OPERADOR_A ** 2 * V[:, 2]) / 3
+    V2 = (V[:, 0] + OPERADOR_A ** 2 * V[:, 1] + OPERADOR_A * V[:, 2]) / 3
+    return np.abs(V2) / np.abs(V1)
+
+
+class AlimentadorTrifasico:
+    """Varredura direta/inversa trifásica para alimentadores radiais desequilibrados
+
+    Cada ramo tem uma matriz de impedâncias de fase 3x3 (fases ausentes com
+    linhas e colunas nulas). Ordenação e fatoração da matriz K são as do
+    AlimentadorRadial: as três fases formam três lados direitos da mesma
+    substituição triangular, e as quedas Z @ I são produtos de matrizes
+    empilhadas (n_ramos, 3, 3), sem laços sobre barras ou fases.
+    """
+
+    def __init__(self, n_barras, de, para, Z_fase, fases=None, Y_shunt=None, raiz=0):
+        de = np.asarray(de, dtype=np.intp)
+        para = np.asarray(para, dtype=np.intp)
+        Z, fases, Y_shunt = _ramos_trifasicos(de.size, Z_fase, fases, Y_shunt)
+
+        self.radial = AlimentadorRadial(n_barras, de, para, np.zeros(de.size, dtype=complex), raiz)
+        self.n_barras = n_barras
+        self.raiz = raiz
+        barras = self.radial.barras
+        ramo_ordem = self.radial.ramo_da_barra[barras]
+
+        # Fases de cada barra: as do ramo que a alimenta (a raiz tem as três)
+        self.fases = np.ones((n_barras, 3), dtype=bool)
+        self.fases[barras] = fases[ramo_ordem]
+        pai = self.radial.pai[barras]
+        if np.any(self.fases[barras] & ~self.fases[pai]):
+            barra = barras[np.flatnonzero(np.any(self.fases[barras] & ~self.fases[pai], axis=1))[0]]
+            raise ValueError(f"A barra {barra} tem fase que não existe na barra a montante")
+
+        self.Z_ordem = Z[ramo_ordem]
+
+        # Metade do shunt de cada ramo em cada extremidade, acumulada por barra
+        self.Y_barra = None
+        if Y_shunt is not None:
+            self.Y_barra = np.zeros((n_barras, 3, 3), dtype=complex)
+            np.add.at(self.Y_barra, de, Y_shunt / 2)
+            np.add.at(self.Y_barra, para, Y_shunt / 2)
+
+    def varredura(self, S_estrela=None, S_delta=None, V_raiz=1.0, V0=None, tol=1e-6, max_iter=100):
+        """Resolve o fluxo de carga com cargas de potência constante em estrela e em delta
+
+        S_estrela -> (n_barras, 3) potência consumida por fase (pu)
+        S_delta   -> (n_barras, 3) potência consumida entre fases ab, bc, ca (pu)
+        V_raiz    -> módulo da fonte equilibrada ou os três fasores da fonte
+        Retorna (V, I_ramo, convergiu, iteracoes) com V (n_barras, 3) e I_ramo
+        (n_ramos, 3); fases ausentes ficam com nan em V e zero em I_ramo.
+        """
+        if max_iter < 1:
+            raise ValueError("max_iter deve ser pelo menos 1")
+        radial = self.radial
+        barras = radial.barras
+        fases_delta = self.fases & np.roll(self.fases, -1, axis=1)
+        S_estrela = _cargas(S_estrela, self.n_barras, self.fases, "estrela")[barras]
+        S_delta = _cargas(S_delta, self.n_barras, fases_delta, "delta")[barras]
+        Y_ordem = None if self.Y_barra is None else self.Y_barra[barras]
+
+        V_fonte = _tensoes_fonte(V_raiz)
+        if V0 is None:
+            V_ordem = np.tile(V_fonte, (barras.size, 1))
+        else:
+            V_ordem = np.where(self.fases, np.asarray(V0, dtype=complex), V_fonte)[barras]
+
+        origem = np.where(radial.filho_da_raiz[:, None], V_fonte, 0)
+        convergiu = False
+
+        for iteracao in range(1, max_iter + 1):
+            # Varredura inversa: as três fases são colunas da mesma substituição
+            I_carga = correntes_de_carga(V_ordem, S_estrela, S_delta)
+            if Y_ordem is not None:
+                I_carga += (Y_ordem @ V_ordem[:, :, None])[:, :, 0]
+            I_ordem = radial._resolver(I_carga, trans="T")
+
+            # Varredura direta: quedas Z @ I de todos os ramos de uma vez
+            V_novo = radial._resolver(origem - (self.Z_ordem @ I_ordem[:, :, None])[:, :, 0])
+
+            erro = np.max(np.abs(V_novo - V_ordem))
+            V_ordem = V_novo
+            if erro < tol:
+                convergiu = True
+                break
+
+        V = np.empty((self.n_barras, 3), dtype=complex)
+        V[self.raiz] = V_fonte
+        V[barras] = V_ordem
+        V[~self.fases] = np.nan
+
+        I_ramo = np.empty((self.n_barras - 1, 3), dtype=complex)
+        I_ramo[radial.ramo_da_barra[barras]] = I_ordem
+        return V, I_ramo, convergiu, iteracao
+
+
+def ybus_trifasica(n_barras, de, para, Z_fase, fases=None, Y_shunt=None):
+    """Matriz de admitância nodal trifásica (um nó por barra e fase existente)
+
+    Retorna (Ybus, nos): Ybus esparsa restrita aos nós existentes e nos com o
+    índice 3 * barra + fase de cada um deles.
+    """
+    de = np.asarray(de, dtype=np.intp)
+    para = np.asarray(para, dtype=np.intp)
+    Z, fases, Y_shunt = _ramos_trifasicos(de.size, Z_fase, fases, Y_shunt)
+
+    # Inversas empilhadas; as fases ausentes recebem 1 na diagonal e são zeradas depois
+    cruzada = fases[:, :, None] & fases[:, None, :]
+    Y_serie = np.linalg.inv(Z + np.eye(3) * ~fases[:, :, None]) * cruzada
+    Y_proprio = Y_serie if Y_shunt is None else Y_serie + Y_shunt / 2
+
+    fase = np.arange(3)
+    linhas = np.concatenate([(3 * i[:, None, None] + fase[None, :, None]).repeat(3, axis=2)
+                             for i in (de, de, para, para)])
+    colunas = np.concatenate([(3 * k[:, None, None] + fase[None, None, :]).repeat(3, axis=1)
+                              for k in (de, para, de, para)])
+    dados = np.concatenate((Y_proprio, -Y_serie, -Y_serie, Y_proprio))
+    Ybus = sp.coo_matrix((dados.ravel(), (linhas.ravel(), colunas.ravel())),
+                         shape=(3 * n_barras, 3 * n_barras)).tocsr()
+
+    # Fases de cada barra: união das fases dos ramos ligados a ela
+    fases_barra = np.zeros((n_barras, 3), dtype=bool)
+    np.logical_or.at(fases_barra, de, fases)
+    np.logical_or.at(fases_barra, para, fases)
+    nos = np.flatnonzero(fases_barra.ravel())
+    return Ybus[nos][:, nos], nos
+
+
+def newton_trifasico(n_barras, de, para, Z_fase, S_estrela, fases=None, Y_shunt=None, raiz=0, V_raiz=1.0,
+                     tol=1e-6, max_iter=20, rastreador=None):
+    """Newton-Raphson trifásico com cargas em estrela, usando o método de N barras nos nós de fase
+
+    Vale também para redes malhadas. Cargas em delta ligam dois nós e não
+    cabem na formulação por nó; use AlimentadorTrifasico.varredura para elas.
+    Retorna (V, convergiu, iteracoes) com V (n_barras, 3) e nan nas fases ausentes.
+    """
+    Ybus, nos = ybus_trifasica(n_barras, de, para, Z_fase, fases, Y_shunt)
+    S_estrela = np.asarray(S_estrela, dtype=complex).reshape(-1)
+    ausentes = np.ones(3 * n_barras, dtype=bool)
+    ausentes[nos] = False
+    if np.any(S_estrela[ausentes] != 0):
+        raise ValueError(f"Carga em estrela na barra {np.flatnonzero(S_estrela * ausentes)[0] // 3} usa fase ausente")
+
+    V_fonte = _tensoes_fonte(V_raiz)
+    V0 = np.tile(V_fonte, n_barras)[nos]
+    ref = np.flatnonzero(nos // 3 == raiz)
+    pq = tipos_de_barra(nos.size, ref, [])
+    V_nos, convergiu, iteracoes = newton_raphson_n_barras(Ybus, -S_estrela[nos], V0, ref, [], pq, tol,
+                                                          max_iter, rastreador)
+
+    V = np.full(3 * n_barras, np.nan, dtype=complex)
+    V[nos] = V_nos
+    return V.reshape(n_barras, 3), convergiu, iteracoes
+
+
+def alimentador_trifasico_sintetico(n_barras, semente=0, fracao_laterais=0.05, tamanho_lateral=50,
+                                    fracao_delta=0.2):
+    """Alimentador radial desequilibrado com laterais monofásicas e cargas em delta
+
+    Parte do alimentador_sintetico: cada ramo recebe uma matriz de fase com
+    mútuas assimétricas; com probabilidade fracao_laterais um ramo trifásico
+    com até tamanho_lateral barras a jusante inicia uma lateral monofásica,
+    herdada por essas barras. Uma fração
+    das barras trifásicas tem carga em delta. Retorna (de, para, Z_fase,
+    fases, S_estrela, S_delta).
+    """
+    rng = np.random.default_rng(semente)
+    de, para, z_serie, S_carga = alimentador_sintetico(n_barras, semente)
+
+    mutuas = np.array([[1.0, 0.40, 0.30], [0.40, 1.0, 0.35], [0.30, 0.35, 1.0]])
+    Z_fase = z_serie[:, None, None] * mutuas
+
+    # Os pais têm índice menor que os filhos: basta percorrer as barras em ordem.
+    # Laterais só começam em subárvores pequenas, para não tornar monofásico o tronco
+    pai = np.empty(n_barras, dtype=np.intp)
+    pai[para] = de
+    tamanho = np.ones(n_barras, dtype=np.intp)
+    for barra in para[::-1]:
+        tamanho[pai[barra]] += tamanho[barra]
+    fases_barra = np.ones((n_barras, 3), dtype=bool)
+    lateral = (rng.random(n_barras) < fracao_laterais) & (tamanho <= tamanho_lateral)
+    fase_lateral = rng.integers(0, 3, n_barras)
+    for barra in para:
+        if lateral[barra] and fases_barra[pai[barra]].all():
+            fases_barra[barra] = False
+            fases_barra[barra, fase_lateral[barra]] = True
+        else:
+            fases_barra[barra] = fases_barra[pai[barra]]
+    fases = fases_barra[para]
+
+    # Carga por fase do equivalente monofásico, com desequilíbrio aleatório
+    por_fase = S_carga[:, None] * (0.6 + 0.8 * rng.random((n_barras, 3)))
+    S_estrela = np.where(fases_barra, por_fase, 0)
+    delta = fases_barra.all(axis=1) & (rng.random(n_barras) < fracao_delta)
+    S_delta = np.where(delta[:, None], S_estrela, 0)
+    S_estrela[delta] = 0
+    return de, para, Z_fase, fases, S_estrela, S_delta
+
+
+if __name__ == "__main__":
+    print("=== Fluxo de Carga Trifásico Desequilibrado ===")
+
+    n_barras = int(input("\nNúmero de barras do alimentador sintético (ex: 20000): ") or "20000")
+    de, para, Z_fase, fases, S_estrela, S_delta = alimentador_trifasico_sintetico(n_barras)
+
+    inicio = time.perf_counter()
+    alimentador = AlimentadorTrifasico(n_barras, de, para, Z_fase, fases)
+    t_preparo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    V, I_ramo, convergiu, iteracoes = alimentador.varredura(S_estrela, S_delta)
+    t_solucao = time.perf_counter() - inicio
+
+    Vm = np.abs(V)
+    print("\n=== Varredura (cargas em estrela e em delta) ===")
+    print(f"Convergiu: {convergiu} em {iteracoes} iterações")
+    print(f"Tempo de preparação: {t_preparo * 1e3:.2f} ms, tempo de solução: {t_solucao * 1e3:.2f} ms")
+    for k, nome in enumerate("abc"):
+        print(f"Fase {nome}: {alimentador.fases[:, k].sum()} barras, tensão mínima {np.nanmin(Vm[:, k]):.6f} pu")
+    print(f"Desequilíbrio máximo de tensão (|V2|/|V1|): {np.nanmax(desequilibrio_tensao(V)) * 100:.3f} %")
+
+    # Comparação com o Newton trifásico (apenas cargas em estrela)
+    V_varredura, _, _, _ = alimentador.varredura(S_estrela)
+    inicio = time.perf_counter()
+    V_newton, convergiu, iteracoes = newton_trifasico(n_barras, de, para, Z_fase, S_estrela, fases)
+    t_newton = time.perf_counter() - inicio
+
+    print("\n=== Newton (somente cargas em estrela) ===")
+    print(f"Convergiu: {convergiu} em {iteracoes} iterações ({t_newton * 1e3:.2f} ms)")
+    print(f"Maior diferença para a varredura: {np.nanmax(np.abs(V_newton - V_varredura)):.2e} pu")
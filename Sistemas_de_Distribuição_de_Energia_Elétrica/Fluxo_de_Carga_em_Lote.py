@@ -0,0 +1,121 @@
+import time
+import numpy as np
+
+# Fator aplicado ao passo do ângulo no modelo só de P, como em metodo_newton
+AMORTECIMENTO_SOMENTE_P = 0.8
+
+
+def coeficientes_lote(z_linha, z_shunt):
+    """Calcula G21, B21, G22 e B22 do sistema de 2 barras para arrays de impedâncias"""
+    z_linha = np.asarray(z_linha, dtype=complex)
+    z_shunt = np.asarray(z_shunt, dtype=complex)
+
+    Y = 1 / z_linha
+    Y_shunt = np.zeros(np.broadcast(z_linha, z_shunt).shape, dtype=complex)
+    np.divide(1, z_shunt, out=Y_shunt, where=z_shunt != 0)
+
+    Y21 = -Y
+    Y22 = Y + Y_shunt
+    return Y21.real, Y21.imag, Y22.real, Y22.imag
+
+
+def newton_lote(P_esp, Q_esp=None, z_linha=0.05 + 0.25j, z_shunt=1000j, V1=1.0,
+                V2_ini=1.0, theta2_ini=0.0, tol=1e-6, max_iter=20):
+    """Resolve o sistema de 2 barras para vários cenários simultaneamente
+
+    Todos os argumentos aceitam escalares ou arrays (com broadcasting).
+    Com Q_esp=None apenas o ângulo é ajustado para atingir P_esp, mantendo
+    V2 fixo (modelo de metodo_newton, com o mesmo passo amortecido por 0.8);
+    caso contrário a barra 2 é PQ (modelo de PowerFlowNewton). A derivada
+    usada inclui V1·V2, que metodo_newton omite: as iterações por cenário
+    coincidem com as dele quando V1·V2 = 1.
+
+    Retorna (V2, theta2, iteracoes, convergiu) como arrays.
+    """
+    somente_P = Q_esp is None
+    G21, B21, G22, B22 = coeficientes_lote(z_linha, z_shunt)
+
+    arrays = np.broadcast_arrays(P_esp, 0.0 if somente_P else Q_esp, G21, B21, G22, B22, V1, V2_ini, theta2_ini)
+    P_esp, Q_esp, G21, B21, G22, B22, V1, V2, theta2 = [np.array(a, dtype=float).ravel() for a in arrays]
+    formato = arrays[0].shape
+
+    n = P_esp.size
+    iteracoes = np.zeros(n, dtype=np.int64)
+    convergiu = np.zeros(n, dtype=bool)
+
+    # Índices dos cenários que ainda não convergiram
+    ativos = np.arange(n)
+
+    for iteracao in range(max_iter + 1):
+        v1, v2, th = V1[ativos], V2[ativos], theta2[ativos]
+        g21, b21, g22, b22 = G21[ativos], B21[ativos], G22[ativos], B22[ativos]
+        cos_t, sin_t = np.cos(th), np.sin(th)
+
+        # Potências na barra 2
+        P = v2 ** 2 * g22 + v1 * v2 * (g21 * cos_t + b21 * sin_t)
+        DeltaP = P_esp[ativos] - P
+        if somente_P:
+            residuo = np.abs(DeltaP)
+        else:
+            Q = -v2 ** 2 * b22 + v1 * v2 * (g21 * sin_t - b21 * cos_t)
+            DeltaQ = Q_esp[ativos] - Q
+            residuo = np.maximum(np.abs(DeltaP), np.abs(DeltaQ))
+
+        # Cenários convergidos deixam de ser atualizados
+        ok = residuo < tol
+        convergiu[ativos[ok]] = True
+        iteracoes[ativos[ok]] = iteracao
+        manter = ~ok
+        ativos = ativos[manter]
+
+        if ativos.size == 0 or iteracao == max_iter:
+            break
+
+        v1, v2, th = v1[manter], v2[manter], th[manter]
+        g21, b21, g22, b22 = g21[manter], b21[manter], g22[manter], b22[manter]
+        cos_t, sin_t = cos_t[manter], sin_t[manter]
+        DeltaP = DeltaP[manter]
+
+        # Elementos da Jacobiana
+        H22 = v1 * v2 * (-g21 * sin_t + b21 * cos_t)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if somente_P:
+                theta2[ativos] = th + AMORTECIMENTO_SOMENTE_P * DeltaP / H22
+            else:
+                DeltaQ = DeltaQ[manter]
+                N22 = 2 * v2 * g22 + v1 * (g21 * cos_t + b21 * sin_t)
+                M22 = v1 * v2 * (g21 * cos_t + b21 * sin_t)
+                L22 = -2 * v2 * b22 + v1 * (g21 * sin_t - b21 * cos_t)
+
+                # Solução direta do sistema 2x2 de cada cenário
+                det = H22 * L22 - N22 * M22
+                theta2[ativos] = th + (L22 * DeltaP - N22 * DeltaQ) / det
+                V2[ativos] = v2 + (H22 * DeltaQ - M22 * DeltaP) / det
+
+    iteracoes[ativos] = max_iter
+
+    return (V2.reshape(formato), theta2.reshape(formato),
+            iteracoes.reshape(formato), convergiu.reshape(formato))
+
+
+if __name__ == "__main__":
+    print("=== Fluxo de Carga em Lote para o Sistema de 2 Barras ===")
+
+    n_cenarios = int(input("\nNúmero de cenários (ex: 100000): ") or "100000")
+    P_min = float(input("Potência ativa mínima (pu): ") or "-0.8")
+    P_max = float(input("Potência ativa máxima (pu): ") or "-0.1")
+
+    P_esp = np.linspace(P_min, P_max, n_cenarios)
+    Q_esp = 0.05 * P_esp
+
+    inicio = time.perf_counter()
+    V2, theta2, iteracoes, convergiu = newton_lote(P_esp, Q_esp)
+    tempo = time.perf_counter() - inicio
+
+    print("\n=== Resultados Finais ===")
+    print(f"Cenários convergidos: {convergiu.sum()} de {n_cenarios}")
+    print(f"Iterações médias: {iteracoes.mean():.2f}")
+    print(f"Tempo total: {tempo * 1e3:.2f} ms")
+    print(f"Tensão na barra 2: {V2.min():.6f} a {V2.max():.6f} pu")
+    print(f"Ângulo na barra 2: {np.degrees(theta2.min()):.6f}° a {np.degrees(theta2.max()):.6f}°")
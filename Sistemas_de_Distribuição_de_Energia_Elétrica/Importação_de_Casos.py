@@ -0,0 +1,232 @@
+import hashlib
+import math
+import mmap
+import os
+import re
+import numpy as np
+
+from Casos_de_Teste import SistemaEletrico, carregar_caso_json
+from Números_Complexos import converter_complexos
+
+
+DIRETORIO_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "fluxo_de_carga")
+LIMITE_CACHE_BYTES = 256 * 2 ** 20
+
+# Colunas do MATPOWER usadas em SistemaEletrico
+COLUNAS_BARRAS_MATPOWER = [0, 1, 2, 3, 4, 5, 7, 8]          # BUS_I TYPE PD QD GS BS VM VA
+COLUNAS_GERADORES_MATPOWER = [0, 1, 2, 5]                  # GEN_BUS PG QG VG
+COLUNAS_RAMOS_MATPOWER = [0, 1, 2, 3, 4, 8, 9, 10]         # F_BUS T_BUS R X B TAP SHIFT STATUS
+STATUS_GERADOR_MATPOWER = 7
+RATE_A_MATPOWER = 5
+
+_COMENTARIO = re.compile(rb"%[^\n]*")
+_COMENTARIO_OU_FECHAMENTO = re.compile(rb"%[^\n]*|\]")
+
+
+def _matriz_matpower(conteudo, nome):
+    """Converte o bloco 'mpc.<nome> = [ ... ];' em um array 2D sem objetos por linha"""
+    inicio = re.search(rb"mpc\." + nome.encode() + rb"\s*=\s*\[", conteudo)
+    if inicio is None:
+        return None
+    # O bloco termina no primeiro ']' fora de comentários
+    fim = next((m.start() for m in _COMENTARIO_OU_FECHAMENTO.finditer(conteudo, inicio.end()) if m.group() == b"]"),
+               None)
+    if fim is None:
+        raise ValueError(f"Matriz mpc.{nome} sem ']' de fechamento")
+    bloco = _COMENTARIO.sub(b"", conteudo[inicio.end():fim])
+
+    # Número de colunas a partir da primeira linha não vazia
+    linhas = bloco.replace(b";", b"\n").split(b"\n", 64)
+    n_colunas = next(len(linha.split()) for linha in linhas if linha.strip())
+
+    valores = np.fromstring(bloco.replace(b";", b" ").decode("ascii"), sep=" ")
+    return valores.reshape(-1, n_colunas)
+
+
+def importar_matpower(caminho):
+    """Lê um arquivo de caso do MATPOWER (.m) para um SistemaEletrico"""
+    with open(caminho, "rb") as arquivo, mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as conteudo:
+        base = re.search(rb"mpc\.baseMVA\s*=\s*([0-9.eE+-]+)", conteudo)
+        base_mva = float(base.group(1)) if base else 100.0
+        barras = _matriz_matpower(conteudo, "bus")
+        geradores = _matriz_matpower(conteudo, "gen")
+        ramos = _matriz_matpower(conteudo, "branch")
+
+    if barras is None or ramos is None:
+        raise ValueError(f"Arquivo sem as matrizes mpc.bus e mpc.branch: {caminho}")
+    if geradores is None:
+        geradores = np.zeros((0, 10))
+
+    geradores = geradores[geradores[:, STATUS_GERADOR_MATPOWER] > 0]
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    return SistemaEletrico(nome, base_mva, barras[:, COLUNAS_BARRAS_MATPOWER],
+                           geradores[:, COLUNAS_GERADORES_MATPOWER], ramos[:, COLUNAS_RAMOS_MATPOWER],
+                           capacidade_ramos=ramos[:, RATE_A_MATPOWER])
+
+
+def _ler_tabela_csv(caminho):
+    """Lê um CSV com cabeçalho; retorna (nomes das colunas, array de textos)"""
+    with open(caminho, encoding="utf-8") as arquivo:
+        cabecalho = [nome.strip() for nome in arquivo.readline().split(",")]
+        tabela = np.loadtxt(arquivo, dtype=str, delimiter=",", ndmin=2, comments="#")
+    return cabecalho, tabela
+
+
+def _coluna(cabecalho, tabela, nome, padrao):
+    if nome in cabecalho:
+        return tabela[:, cabecalho.index(nome)].astype(float)
+    return np.full(tabela.shape[0], padrao, dtype=float)
+
+
+def importar_csv(arquivo_barras, arquivo_ramos, arquivo_geradores=None, base_mva=100.0, nome=None):
+    """Lê tabelas CSV de barras, ramos e (opcionalmente) geradores
+
+    barras:     barra, tipo, Pd, Qd [, Gs, Bs, Vm, Va]
+    ramos:      de, para, z (retangular ou fasorial) ou r, x [, b, tap, defasagem, estado, capacidade]
+    geradores:  barra, Pg, Qg [, Vg]
+    """
+    cab, tab = _ler_tabela_csv(arquivo_barras)
+    barras = np.column_stack([_coluna(cab, tab, c, p) for c, p in
+                              (("barra", 0), ("tipo", 1), ("Pd", 0), ("Qd", 0), ("Gs", 0), ("Bs", 0),
+                               ("Vm", 1), ("Va", 0))])
+
+    cab, tab = _ler_tabela_csv(arquivo_ramos)
+    if "z" in cab:
+        z_serie, erros = converter_complexos(tab[:, cab.index("z")])
+        if erros:
+            detalhes = "; ".join(f"linha {linha + 2}: '{texto}'" for linha, texto, _ in erros[:10])
+            raise ValueError(f"{len(erros)} impedância(s) inválida(s) em {arquivo_ramos}: {detalhes}")
+    else:
+        z_serie = _coluna(cab, tab, "r", 0) + 1j * _coluna(cab, tab, "x", 0)
+    ramos = np.column_stack((_coluna(cab, tab, "de", 0), _coluna(cab, tab, "para", 0), z_serie.real, z_serie.imag,
+                             _coluna(cab, tab, "b", 0), _coluna(cab, tab, "tap", 0),
+                             _coluna(cab, tab, "defasagem", 0), _coluna(cab, tab, "estado", 1)))
+    capacidade = _coluna(cab, tab, "capacidade", 0)
+
+    if arquivo_geradores is None:
+        geradores = np.zeros((0, 4))
+    else:
+        cab, tab = _ler_tabela_csv(arquivo_geradores)
+        geradores = np.column_stack([_coluna(cab, tab, c, p) for c, p in
+                                     (("barra", 0), ("Pg", 0), ("Qg", 0), ("Vg", 1))])
+
+    nome = nome or os.path.splitext(os.path.basename(arquivo_barras))[0]
+    return SistemaEletrico(nome, base_mva, barras, geradores, ramos, capacidade_ramos=capacidade)
+
+
+def hash_arquivos(*caminhos, tamanho_bloco=1 << 20):
+    """SHA-256 do conteúdo dos arquivos, lido em blocos"""
+    h = hashlib.sha256()
+    for caminho in caminhos:
+        with open(caminho, "rb") as arquivo:
+            for bloco in iter(lambda: arquivo.read(tamanho_bloco), b""):
+                h.update(bloco)
+    return h.hexdigest()
+
+
+def _salvar_cache(caminho, sistema):
+    temporario = caminho + ".tmp.npz"
+    np.savez(temporario, nome=sistema.nome, base_mva=sistema.base_mva, barras=sistema.barras,
+             geradores=sistema.geradores, ramos=sistema.ramos, capacidade_ramos=sistema.capacidade_ramos)
+    os.replace(temporario, caminho)
+
+
+def _ler_cache(caminho):
+    with np.load(caminho) as dados:
+        return SistemaEletrico(str(dados["nome"]), float(dados["base_mva"]), dados["barras"], dados["geradores"],
+                               dados["ramos"], capacidade_ramos=dados["capacidade_ramos"])
+
+
+def limpar_cache(diretorio_cache=DIRETORIO_CACHE, limite_bytes=LIMITE_CACHE_BYTES):
+    """Remove os casos usados há mais tempo até o cache caber em limite_bytes (0 esvazia)
+
+    Retorna o número de bytes liberados.
+    """
+    if not os.path.isdir(diretorio_cache):
+        return 0
+    arquivos = []
+    for entrada in os.scandir(diretorio_cache):
+        if entrada.is_file() and entrada.name.endswith(".npz") and not entrada.name.endswith(".tmp.npz"):
+            info = entrada.stat()
+            arquivos.append((info.st_mtime, info.st_size, entrada.path))
+
+    total = sum(tamanho for _, tamanho, _ in arquivos)
+    liberados = 0
+    for _, tamanho, caminho in sorted(arquivos):
+        if total <= limite_bytes:
+            break
+        try:
+            os.remove(caminho)
+        except FileNotFoundError:
+            pass  # já removido por outro processo
+        total -= tamanho
+        liberados += tamanho
+    return liberados
+
+
+def carregar_caso(*caminhos, cache=True, diretorio_cache=DIRETORIO_CACHE, limite_cache_bytes=LIMITE_CACHE_BYTES,
+                  **opcoes):
+    """Carrega um caso (.m, .json ou CSVs de barras/ramos[/geradores]) usando cache por hash
+
+    O caso já convertido é guardado em <diretorio_cache>/<sha256>.npz; cargas
+    seguintes do mesmo conteúdo leem apenas esse arquivo binário. Cada leitura
+    renova a data do arquivo e, após gravar um caso novo, os usados há mais
+    tempo são removidos até o cache caber em limite_cache_bytes. Com
+    cache=False nada é gravado.
+    """
+    extensao = os.path.splitext(caminhos[0])[1].lower()
+    if extensao == ".m":
+        importar = importar_matpower
+    elif extensao == ".json":
+        importar = carregar_caso_json
+    elif extensao == ".csv":
+        importar = importar_csv
+    else:
+        raise ValueError(f"Formato de caso não suportado: {extensao}")
+
+    if not cache:
+        return importar(*caminhos, **opcoes)
+
+    chave = hash_arquivos(*caminhos)
+    if opcoes:
+        chave = hashlib.sha256((chave + repr(sorted(opcoes.items()))).encode()).hexdigest()
+    arquivo_cache = os.path.join(diretorio_cache, chave + ".npz")
+    if os.path.exists(arquivo_cache):
+        sistema = _ler_cache(arquivo_cache)
+        try:
+            os.utime(arquivo_cache)
+        except OSError:
+            pass  # removido por outro processo depois da leitura
+        return sistema
+
+    sistema = importar(*caminhos, **opcoes)
+    os.makedirs(diretorio_cache, exist_ok=True)
+    _salvar_cache(arquivo_cache, sistema)
+    limpar_cache(diretorio_cache, limite_cache_bytes)
+    return sistema
+
+
+if __name__ == "__main__":
+    import time
+
+    print("=== Importação de Casos (MATPOWER / CSV) ===")
+
+    caminho = input("\nArquivo do caso (.m, .json ou CSV de barras): ").strip()
+    caminhos = [caminho]
+    if caminho.lower().endswith(".csv"):
+        caminhos.append(input("Arquivo CSV de ramos: ").strip())
+        geradores = input("Arquivo CSV de geradores (opcional): ").strip()
+        if geradores:
+            caminhos.append(geradores)
+
+    for tentativa in ("primeira leitura", "leitura com cache"):
+        inicio = time.perf_counter()
+        sistema = carregar_caso(*caminhos)
+        print(f"{tentativa}: {(time.perf_counter() - inicio) * 1e3:.2f} ms")
+
+    print(f"\nCaso: {sistema.nome}")
+    print(f"Barras: {sistema.n_barras}, ramos: {sistema.ramos.shape[0]}, geradores: {sistema.geradores.shape[0]}")
+    print(f"Base: {sistema.base_mva:g} MVA, radial: {sistema.e_radial()}")
+    print(f"Carga total: {sistema.barras[:, 2].sum():.2f} MW, {sistema.barras[:, 3].sum():.2f} Mvar")
+    if not math.isclose(sistema.geradores[:, 1].sum(), 0.0):
+        print(f"Geração total: {sistema.geradores[:, 1].sum():.2f} MW")
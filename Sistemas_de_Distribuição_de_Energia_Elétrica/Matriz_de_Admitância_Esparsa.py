@@ -0,0 +1,69 @@
+import numpy as np
+import scipy.sparse as sp
+
+
+def quadripolos(z_serie, y_shunt=None, tap=None):
+    """Elementos (Y_ff, Y_ft, Y_tf, Y_tt) do modelo π de cada ramo"""
+    y_s = 1 / np.asarray(z_serie, dtype=complex)
+    y_sh = np.zeros(y_s.size, dtype=complex) if y_shunt is None else np.asarray(y_shunt, dtype=complex)
+    a = np.ones(y_s.size, dtype=complex) if tap is None else np.asarray(tap, dtype=complex)
+
+    Y_ff = (y_s + y_sh) / (a * np.conj(a))
+    Y_ft = -y_s / np.conj(a)
+    Y_tf = -y_s / a
+    Y_tt = y_s + y_sh
+    return Y_ff, Y_ft, Y_tf, Y_tt
+
+
+def montar_ybus(n_barras, de, para, z_serie, y_shunt=None, tap=None, y_barra=None):
+    """Monta a matriz de admitância esparsa (CSR) a partir da tabela de ramos
+
+    de, para  -> índices das barras terminais de cada ramo (base 0)
+    z_serie   -> impedância série de cada ramo (pu)
+    y_shunt   -> admitância shunt em cada extremidade do modelo π (pu)
+    tap       -> relação de transformação (complexa para defasadores), lado 'de'
+    y_barra   -> admitância shunt ligada diretamente a cada barra (pu)
+    """
+    de = np.asarray(de, dtype=np.intp)
+    para = np.asarray(para, dtype=np.intp)
+
+    # Elementos do quadripolo de cada ramo
+    Y_ff, Y_ft, Y_tf, Y_tt = quadripolos(z_serie, y_shunt, tap)
+
+    linhas = np.concatenate((de, de, para, para))
+    colunas = np.concatenate((de, para, de, para))
+    valores = np.concatenate((Y_ff, Y_ft, Y_tf, Y_tt))
+
+    if y_barra is not None:
+        barras = np.arange(n_barras, dtype=np.intp)
+        linhas = np.concatenate((linhas, barras))
+        colunas = np.concatenate((colunas, barras))
+        valores = np.concatenate((valores, np.asarray(y_barra, dtype=complex)))
+
+    # A conversão COO -> CSR soma as contribuições repetidas de cada posição
+    Y = sp.coo_matrix((valores, (linhas, colunas)), shape=(n_barras, n_barras)).tocsr()
+    Y.sum_duplicates()
+    return Y
+
+
+def ybus_duas_barras(z_linha, z_shunt):
+    """Matriz de admitância do sistema de 2 barras dos scripts originais"""
+    y_shunt = 0 if z_shunt == 0 else 1 / z_shunt
+    return montar_ybus(2, [0], [1], [z_linha], [y_shunt])
+
+
+if __name__ == "__main__":
+    print("=== Matriz de Admitância Esparsa ===")
+
+    # Alimentador radial de exemplo: 0 - 1 - 2 - 3, com derivação 1 - 4
+    de = [0, 1, 2, 1]
+    para = [1, 2, 3, 4]
+    z_serie = [0.01 + 0.02j, 0.02 + 0.04j, 0.015 + 0.03j, 0.03 + 0.05j]
+    y_shunt = [0.001j, 0.001j, 0.0005j, 0.0005j]
+
+    Y = montar_ybus(5, de, para, z_serie, y_shunt)
+    print(f"\nBarras: {Y.shape[0]}, elementos não nulos: {Y.nnz}")
+    print(np.array_str(Y.toarray(), precision=4, suppress_small=True))
+
+    print("\nSistema de 2 barras (Z_linha = 0.05+0.25j, Z_shunt = 1000j):")
+    print(np.array_str(ybus_duas_barras(0.05 + 0.25j, 1000j).toarray(), precision=4, suppress_small=True))
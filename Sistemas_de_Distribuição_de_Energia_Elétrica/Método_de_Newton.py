@@ -2,6 +2,9 @@ import math
 import cmath
 import numpy as np
 
+from Números_Complexos import converter_complexo
+from Rastreamento import rastreador_interativo
+
 
 def to_phasor(complex_num):
     magnitude = abs(complex_num)
@@ -10,16 +13,7 @@ def to_phasor(complex_num):
 
 
 def input_complex(prompt):
-    value = input(prompt).strip()
-    try:
-        value = value.replace(" ", "")
-        return complex(value)
-    except ValueError:
-        try:
-            magnitude, angle = map(float, value.split('<'))
-            return cmath.rect(magnitude, math.radians(angle))
-        except ValueError:
-            raise ValueError("Formato inválido. Use a forma retangular (ex: 3+4j) ou fasorial (ex: 5<53.13).")
+    return converter_complexo(input(prompt))
 
 
 def calcular_matriz_admitancia(z_linha, z_shunt):
@@ -40,8 +34,11 @@ def calcular_matriz_admitancia(z_linha, z_shunt):
     return Y
 
 
-def metodo_newton(Y, V1, V2_ini, theta2_ini, P_esp, tol=1e-6, max_iter=20):
-    print("\nIniciando método de Newton-Raphson...")
+def metodo_newton(Y, V1, V2_ini, theta2_ini, P_esp, tol=1e-6, max_iter=20, rastreador=None):
+    if rastreador is None:
+        rastreador = rastreador_interativo()
+    if rastreador.eco_resumo:
+        print("\nIniciando método de Newton-Raphson...")
 
     theta2 = theta2_ini
     V2 = V2_ini
@@ -61,10 +58,12 @@ def metodo_newton(Y, V1, V2_ini, theta2_ini, P_esp, tol=1e-6, max_iter=20):
             DeltaP = P_esp - P2
 
             if abs(DeltaP) < tol:
-                print(f"\nConvergência alcançada na iteração {iteracao}!")
-                print(f"Tensão na barra 2: {V2:.6f} pu")
-                print(f"Ângulo na barra 2: {math.degrees(theta2):.6f}°")
-                print(f"Potência calculada: {P2:.6f} pu")
+                if rastreador.eco_resumo:
+                    print(f"\nConvergência alcançada na iteração {iteracao}!")
+                    print(f"Tensão na barra 2: {V2:.6f} pu")
+                    print(f"Ângulo na barra 2: {math.degrees(theta2):.6f}°")
+                    print(f"Potência calculada: {P2:.6f} pu")
+                rastreador.finalizar(True, iteracao)
                 return V2, theta2
 
             # Cálculo CORRETO das derivadas parciais
@@ -72,7 +71,8 @@ def metodo_newton(Y, V1, V2_ini, theta2_ini, P_esp, tol=1e-6, max_iter=20):
 
             # Verificação para evitar divisão por zero
             if abs(H22) < 1e-10:
-                print("Aviso: Jacobiano singular, ajustando θ2 em 0.01 rad")
+                if rastreador.eco_resumo:
+                    print("Aviso: Jacobiano singular, ajustando θ2 em 0.01 rad")
                 theta2 += 0.01
                 continue
 
@@ -82,16 +82,22 @@ def metodo_newton(Y, V1, V2_ini, theta2_ini, P_esp, tol=1e-6, max_iter=20):
             # Atualização com fator de amortecimento para estabilidade
             theta2 += Delta_theta2 * 0.8
 
-            print(f"Iteração {iteracao}: θ2 = {math.degrees(theta2):.6f}°, P2 = {P2:.6f}, ΔP = {DeltaP:.6f}")
+            if rastreador.por_iteracao:
+                rastreador.registrar(iteracao, abs(DeltaP), abs(Delta_theta2 * 0.8), 1.0)
+                if rastreador.eco_iteracao:
+                    print(f"Iteração {iteracao}: θ2 = {math.degrees(theta2):.6f}°, P2 = {P2:.6f}, ΔP = {DeltaP:.6f}")
             iteracao += 1
 
         except Exception as e:
-            print(f"Erro na iteração {iteracao}: {str(e)}")
-            print("Reiniciando com θ2 += 0.01 rad")
+            if rastreador.eco_resumo:
+                print(f"Erro na iteração {iteracao}: {str(e)}")
+                print("Reiniciando com θ2 += 0.01 rad")
             theta2 += 0.01
             continue
 
-    print("\nAtenção: Método não convergiu após", max_iter, "iterações!")
+    if rastreador.eco_resumo:
+        print("\nAtenção: Método não convergiu após", max_iter, "iterações!")
+    rastreador.finalizar(False, max_iter)
     return V2, theta2
 
 
@@ -103,7 +109,8 @@ def main():
     print("Z_linha = 0.05+0.25j (impedância série típica)")
     print("Z_shunt = 1000j (admitância shunt alta)")
     print("V1 = 1.0, V2_ini = 1.0, θ2_ini = 0.1°")
-    print("P_esp entre 0.1 e 0.8 pu para melhor convergência\n")
+    print("P_esp entre 0.1 e 0.8 pu para melhor convergência")
+    print("(perto do limite de carregamento use Fluxo_de_Carga_Continuado.py)\n")
 
     z_linha = input_complex("Insira a impedância de série da linha: ")
     z_shunt = input_complex("Insira a impedância shunt da linha: ")
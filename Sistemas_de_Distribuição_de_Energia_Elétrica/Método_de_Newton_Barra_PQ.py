@@ -1,7 +1,9 @@
 import math
-import cmath
+import warnings
 import numpy as np
-from scipy.misc import derivative
+
+from Números_Complexos import converter_complexo
+from Rastreamento import rastreador_interativo
 
 
 class PowerFlowNewton:
@@ -9,7 +11,7 @@ class PowerFlowNewton:
         self.v1 = 1.0  # Tensão na barra slack (pu)
         self.v2 = 1.0  # Tensão inicial na barra PQ (pu)
         self.theta2 = 0.0  # Ângulo inicial (rad)
-        self.Y_matrix = None
+        self._Y_matrix = None
         self.P_esp = -0.2
         self.Q_esp = -0.01
         # Inicializando os coeficientes
@@ -17,18 +19,26 @@ class PowerFlowNewton:
         self.B21 = 0.0
         self.G22 = 0.0
         self.B22 = 0.0
+        # Contadores do modo desonesto
+        self.fatoracoes = 0
+        self.fatoracoes_economizadas = 0
 
     def input_complex(self, prompt):
         """Função para entrada de números complexos"""
-        value = input(prompt).strip()
-        try:
-            return complex(value.replace(" ", ""))
-        except ValueError:
-            try:
-                mag, ang = map(float, value.split('<'))
-                return cmath.rect(mag, math.radians(ang))
-            except:
-                raise ValueError("Formato inválido. Use 3+4j ou 5<53.13")
+        return converter_complexo(input(prompt))
+
+    @property
+    def Y_matrix(self):
+        return self._Y_matrix
+
+    @Y_matrix.setter
+    def Y_matrix(self, Y):
+        """Guarda a matriz e extrai G21, B21, G22 e B22 uma única vez"""
+        self._Y_matrix = Y
+        self.G21 = Y[1, 0].real
+        self.B21 = Y[1, 0].imag
+        self.G22 = Y[1, 1].real
+        self.B22 = Y[1, 1].imag
 
     def matrix_calc(self, z, shunt):
         """Calcula a matriz de admitância"""
@@ -53,26 +63,30 @@ class PowerFlowNewton:
         if theta_2 is None:
             theta_2 = self.theta2
 
-        self.G21 = self.Y_matrix[1, 0].real
-        self.B21 = self.Y_matrix[1, 0].imag
-        self.G22 = self.Y_matrix[1, 1].real
-        self.B22 = self.Y_matrix[1, 1].imag
+        cos_t = math.cos(theta_2)
+        sin_t = math.sin(theta_2)
 
         # Potência ativa
-        P = (self.v2 ** 2) * self.G22 + self.v1 * self.v2 * (self.G21 * math.cos(theta_2) + self.B21 * math.sin(theta_2))
+        P = (self.v2 ** 2) * self.G22 + self.v1 * self.v2 * (self.G21 * cos_t + self.B21 * sin_t)
 
         # Potência reativa
-        Q = -(self.v2 ** 2) * self.B22 + self.v1 * self.v2 * (self.G21 * math.sin(theta_2) - self.B21 * math.cos(theta_2))
+        Q = -(self.v2 ** 2) * self.B22 + self.v1 * self.v2 * (self.G21 * sin_t - self.B21 * cos_t)
 
         return P, Q
 
     def calculate_jacobian(self):
         """Calcula a matriz Jacobiana"""
+        # Termos comuns: seno e cosseno calculados uma vez
+        cos_t = math.cos(self.theta2)
+        sin_t = math.sin(self.theta2)
+        a = self.G21 * cos_t + self.B21 * sin_t
+        b = self.G21 * sin_t - self.B21 * cos_t
+
         # Elementos da Jacobiana
-        self.H22 = self.v1 * self.v2 * (-self.G21 * math.sin(self.theta2) + self.B21 * math.cos(self.theta2))
-        self.N22 = 2 * self.v2 * self.G22 + self.v1 * (self.G21 * math.cos(self.theta2) + self.B21 * math.sin(self.theta2))
-        self.M22 = self.v1 * self.v2 * (self.G21 * math.cos(self.theta2) + self.B21 * math.sin(self.theta2))
-        self.L22 = -2 * self.v2 * self.B22 + self.v1 * (self.G21 * math.sin(self.theta2) - self.B21 * math.cos(self.theta2))
+        self.H22 = -self.v1 * self.v2 * b
+        self.N22 = 2 * self.v2 * self.G22 + self.v1 * a
+        self.M22 = self.v1 * self.v2 * a
+        self.L22 = -2 * self.v2 * self.B22 + self.v1 * b
 
         J = np.array([
             [self.H22, self.N22],
@@ -80,54 +94,107 @@ class PowerFlowNewton:
         ])
         return J
 
-    def newton_raphson(self, tol=1e-6, max_iter=20):
-        """Implementa o método de Newton-Raphson"""
-        print("\nIniciando método de Newton-Raphson...")
+    def newton_raphson(self, tol=1e-6, max_iter=20, rastreador=None, desonesto=False, razao_refatorar=0.5):
+        """Implementa o método de Newton-Raphson
+
+        Com desonesto=True a fatoração LU do Jacobiano é mantida entre as
+        iterações e refeita apenas quando max(|ΔP|, |ΔQ|) não cai abaixo de
+        razao_refatorar vezes o valor da iteração anterior.
+        """
+        if rastreador is None:
+            rastreador = rastreador_interativo()
+        if rastreador.eco_resumo:
+            print("\nIniciando método de Newton-Raphson...")
+        if desonesto:
+            from scipy.linalg import LinAlgError, LinAlgWarning, lu_factor, lu_solve
+
+        fatores = None
+        norma_anterior = math.inf
+        self.fatoracoes = 0
+        self.fatoracoes_economizadas = 0
 
         for iteration in range(max_iter):
             P, Q = self.calculate_power()
             DeltaP = self.P_esp - P
             DeltaQ = self.Q_esp - Q
+            norma = max(abs(DeltaP), abs(DeltaQ))
 
             # Verificar convergência
             if abs(DeltaP) < tol and abs(DeltaQ) < tol:
-                print(f"\nConvergência alcançada na iteração {iteration}!")
-                print(f"Tensão na barra 2: {self.v2:.6f} pu")
-                print(f"Ângulo na barra 2: {self.theta2:.6f} rad")
+                if rastreador.eco_resumo:
+                    print(f"\nConvergência alcançada na iteração {iteration}!")
+                    print(f"Tensão na barra 2: {self.v2:.6f} pu")
+                    print(f"Ângulo na barra 2: {self.theta2:.6f} rad")
+                    if desonesto:
+                        print(f"Fatorações do Jacobiano: {self.fatoracoes} "
+                              f"({self.fatoracoes_economizadas} economizadas)")
+                rastreador.finalizar(True, iteration, self.fatoracoes)
                 return True
 
-            # Calcular Jacobiano
-            J = self.calculate_jacobian()
-
-            # Resolver sistema linear
-            try:
-                delta = np.linalg.solve(J, np.array([DeltaP, DeltaQ]))
-            except np.linalg.LinAlgError:
-                print("Erro: Jacobiano singular")
-                return False
+            if desonesto:
+                # Refatorar somente quando a redução do resíduo fica lenta
+                if fatores is None or norma > razao_refatorar * norma_anterior:
+                    J = self.calculate_jacobian()
+                    # Pivô nulo (aviso do lu_factor) ou Jacobiano numericamente singular
+                    try:
+                        with warnings.catch_warnings():
+                            warnings.simplefilter("error", LinAlgWarning)
+                            fatores = lu_factor(J)
+                        if np.linalg.cond(J) > 1 / np.finfo(float).eps:
+                            raise LinAlgError("Jacobiano mal condicionado")
+                    except (LinAlgError, LinAlgWarning, ValueError):
+                        if rastreador.eco_resumo:
+                            print("Erro: Jacobiano singular")
+                        rastreador.finalizar(False, iteration, self.fatoracoes)
+                        return False
+                    self.fatoracoes += 1
+                else:
+                    self.fatoracoes_economizadas += 1
+                delta = lu_solve(fatores, np.array([DeltaP, DeltaQ]))
+            else:
+                # Calcular Jacobiano
+                J = self.calculate_jacobian()
+                self.fatoracoes += 1
+
+                # Resolver sistema linear
+                try:
+                    delta = np.linalg.solve(J, np.array([DeltaP, DeltaQ]))
+                except np.linalg.LinAlgError:
+                    if rastreador.eco_resumo:
+                        print("Erro: Jacobiano singular")
+                    rastreador.finalizar(False, iteration, self.fatoracoes)
+                    return False
+            norma_anterior = norma
 
             # Atualizar variáveis
             self.theta2 += delta[0]
             self.v2 += delta[1]
 
-            print(f"Iteração {iteration}:")
-            print(f"  Δθ = {delta[0]:.6f} rad, ΔV = {delta[1]:.6f} pu")
-            print(f"  P = {P:.6f} pu, Q = {Q:.6f} pu")
-            print(f"  ΔP = {DeltaP:.6f} pu, ΔQ = {DeltaQ:.6f} pu")
-
-            print("\n  Elementos da Matriz Jacobiana:")
-            print(f"  H22 = {self.H22:.6f}")
-            print(f"  N22 = {self.N22:.6f}")
-            print(f"  M22 = {self.M22:.6f}")
-            print(f"  L22 = {self.L22:.6f}")
-
-            print("\n  Coeficientes da matriz de Admitância:")
-            print(f"  G21 = {self.G21:.6f}")
-            print(f"  B21 = {self.B21:.6f}")
-            print(f"  G22 = {self.G22:.6f}")
-            print(f"  B22 = {self.B22:.6f}\n")
-
-        print("\nAtenção: Método não convergiu após", max_iter, "iterações!")
+            if rastreador.por_iteracao:
+                rastreador.registrar(iteration, max(abs(DeltaP), abs(DeltaQ)), np.linalg.norm(delta),
+                                     np.linalg.cond(J) if rastreador.estimar_condicionamento else np.nan)
+
+            if rastreador.eco_iteracao:
+                print(f"Iteração {iteration}:")
+                print(f"  Δθ = {delta[0]:.6f} rad, ΔV = {delta[1]:.6f} pu")
+                print(f"  P = {P:.6f} pu, Q = {Q:.6f} pu")
+                print(f"  ΔP = {DeltaP:.6f} pu, ΔQ = {DeltaQ:.6f} pu")
+
+                print("\n  Elementos da Matriz Jacobiana:")
+                print(f"  H22 = {self.H22:.6f}")
+                print(f"  N22 = {self.N22:.6f}")
+                print(f"  M22 = {self.M22:.6f}")
+                print(f"  L22 = {self.L22:.6f}")
+
+                print("\n  Coeficientes da matriz de Admitância:")
+                print(f"  G21 = {self.G21:.6f}")
+                print(f"  B21 = {self.B21:.6f}")
+                print(f"  G22 = {self.G22:.6f}")
+                print(f"  B22 = {self.B22:.6f}\n")
+
+        if rastreador.eco_resumo:
+            print("\nAtenção: Método não convergiu após", max_iter, "iterações!")
+        rastreador.finalizar(False, max_iter, self.fatoracoes)
         return False
 
     def run(self):
@@ -1,9 +1,12 @@
 import math
-import cmath
+import queue
+import threading
 import numpy as np
 from tkinter import *
 from tkinter import ttk, messagebox
 
+from Números_Complexos import converter_complexo
+
 
 class PowerFlowGUI:
     def __init__(self, root):
@@ -15,7 +18,7 @@ class PowerFlowGUI:
         self.v1 = 1.0
         self.v2 = 1.0
         self.theta2 = 0.0
-        self.Y_matrix = None
+        self._Y_matrix = None
         self.P_esp = -0.2
         self.Q_esp = -0.01
         self.G21 = 0.0
@@ -23,6 +26,11 @@ class PowerFlowGUI:
         self.G22 = 0.0
         self.B22 = 0.0
 
+        # Comunicação com a thread de cálculo
+        self.fila = queue.Queue()
+        self.cancelar = threading.Event()
+        self.trabalhador = None
+
         self.create_widgets()
 
     def create_widgets(self):
@@ -60,8 +68,14 @@ class PowerFlowGUI:
         self.Q_esp_entry.insert(0, "-0.01")
 
         # Botões
-        ttk.Button(mainframe, text="Calcular", command=self.run_calculation).grid(column=2, row=7, sticky=W)
+        self.botao_calcular = ttk.Button(mainframe, text="Calcular", command=self.run_calculation)
+        self.botao_calcular.grid(column=2, row=7, sticky=W)
+        self.botao_lote = ttk.Button(mainframe, text="Varredura de P", command=self.run_sweep)
+        self.botao_lote.grid(column=1, row=7, sticky=E)
         ttk.Button(mainframe, text="Limpar", command=self.clear_fields).grid(column=2, row=7, sticky=E)
+        self.botao_cancelar = ttk.Button(mainframe, text="Cancelar", command=self.cancel_calculation,
+                                         state=DISABLED)
+        self.botao_cancelar.grid(column=1, row=7, sticky=W)
 
         # Área de resultados
         self.results_text = Text(mainframe, width=80, height=20, wrap=WORD)
@@ -74,14 +88,20 @@ class PowerFlowGUI:
 
     def input_complex(self, value):
         """Converte string para número complexo"""
-        try:
-            return complex(value.replace(" ", ""))
-        except ValueError:
-            try:
-                mag, ang = map(float, value.split('<'))
-                return cmath.rect(mag, math.radians(ang))
-            except:
-                raise ValueError("Formato inválido. Use 3+4j ou 5<53.13")
+        return converter_complexo(value)
+
+    @property
+    def Y_matrix(self):
+        return self._Y_matrix
+
+    @Y_matrix.setter
+    def Y_matrix(self, Y):
+        """Guarda a matriz e extrai G21, B21, G22 e B22 uma única vez"""
+        self._Y_matrix = Y
+        self.G21 = Y[1, 0].real
+        self.B21 = Y[1, 0].imag
+        self.G22 = Y[1, 1].real
+        self.B22 = Y[1, 1].imag
 
     def matrix_calc(self, z, shunt):
         """Calcula a matriz de admitância"""
@@ -100,42 +120,48 @@ class PowerFlowGUI:
         if theta_2 is None:
             theta_2 = self.theta2
 
-        self.G21 = self.Y_matrix[1, 0].real
-        self.B21 = self.Y_matrix[1, 0].imag
-        self.G22 = self.Y_matrix[1, 1].real
-        self.B22 = self.Y_matrix[1, 1].imag
-
-        P = (self.v2 ** 2) * self.G22 + self.v1 * self.v2 * (
-                    self.G21 * math.cos(theta_2) + self.B21 * math.sin(theta_2))
-        Q = -(self.v2 ** 2) * self.B22 + self.v1 * self.v2 * (
-                    self.G21 * math.sin(theta_2) - self.B21 * math.cos(theta_2))
+        cos_t = math.cos(theta_2)
+        sin_t = math.sin(theta_2)
+        P = (self.v2 ** 2) * self.G22 + self.v1 * self.v2 * (self.G21 * cos_t + self.B21 * sin_t)
+        Q = -(self.v2 ** 2) * self.B22 + self.v1 * self.v2 * (self.G21 * sin_t - self.B21 * cos_t)
 
         return P, Q
 
     def calculate_jacobian(self):
         """Calcula a matriz Jacobiana"""
-        self.H22 = self.v1 * self.v2 * (-self.G21 * math.sin(self.theta2) + self.B21 * math.cos(self.theta2))
-        self.N22 = 2 * self.v2 * self.G22 + self.v1 * (
-                    self.G21 * math.cos(self.theta2) + self.B21 * math.sin(self.theta2))
-        self.M22 = self.v1 * self.v2 * (self.G21 * math.cos(self.theta2) + self.B21 * math.sin(self.theta2))
-        self.L22 = -2 * self.v2 * self.B22 + self.v1 * (
-                    self.G21 * math.sin(self.theta2) - self.B21 * math.cos(self.theta2))
+        cos_t = math.cos(self.theta2)
+        sin_t = math.sin(self.theta2)
+        a = self.G21 * cos_t + self.B21 * sin_t
+        b = self.G21 * sin_t - self.B21 * cos_t
+
+        self.H22 = -self.v1 * self.v2 * b
+        self.N22 = 2 * self.v2 * self.G22 + self.v1 * a
+        self.M22 = self.v1 * self.v2 * a
+        self.L22 = -2 * self.v2 * self.B22 + self.v1 * b
 
         return np.array([[self.H22, self.N22], [self.M22, self.L22]])
 
+    def emit(self, texto):
+        """Envia texto para a área de resultados (seguro fora da thread da interface)"""
+        self.fila.put(("texto", texto))
+
     def newton_raphson(self, tol=1e-6, max_iter=20):
         """Implementa o método de Newton-Raphson"""
-        self.results_text.insert(END, "\nIniciando método de Newton-Raphson...\n")
+        self.emit("\nIniciando método de Newton-Raphson...\n")
 
         for iteration in range(max_iter):
+            if self.cancelar.is_set():
+                self.emit("\nCálculo cancelado pelo usuário.\n")
+                return False
+
             P, Q = self.calculate_power()
             DeltaP = self.P_esp - P
             DeltaQ = self.Q_esp - Q
 
             if abs(DeltaP) < tol and abs(DeltaQ) < tol:
-                self.results_text.insert(END, f"\nConvergência alcançada na iteração {iteration}!\n")
-                self.results_text.insert(END, f"Tensão na barra 2: {self.v2:.6f} pu\n")
-                self.results_text.insert(END, f"Ângulo na barra 2: {self.theta2:.6f} rad\n")
+                self.emit(f"\nConvergência alcançada na iteração {iteration}!\n"
+                          f"Tensão na barra 2: {self.v2:.6f} pu\n"
+                          f"Ângulo na barra 2: {self.theta2:.6f} rad\n")
                 return True
 
             J = self.calculate_jacobian()
@@ -143,63 +169,157 @@ class PowerFlowGUI:
             try:
                 delta = np.linalg.solve(J, np.array([DeltaP, DeltaQ]))
             except np.linalg.LinAlgError:
-                self.results_text.insert(END, "Erro: Jacobiano singular\n")
+                self.emit("Erro: Jacobiano singular\n")
                 return False
 
             self.theta2 += delta[0]
             self.v2 += delta[1]
 
-            self.results_text.insert(END, f"\nIteração {iteration}:\n")
-            self.results_text.insert(END, f"  Δθ = {delta[0]:.6f} rad, ΔV = {delta[1]:.6f} pu\n")
-            self.results_text.insert(END, f"  P = {P:.6f} pu, Q = {Q:.6f} pu\n")
-            self.results_text.insert(END, f"  ΔP = {DeltaP:.6f} pu, ΔQ = {DeltaQ:.6f} pu\n")
-
-            self.results_text.insert(END, "\n  Elementos da Matriz Jacobiana:\n")
-            self.results_text.insert(END, f"  H22 = {self.H22:.6f}\n")
-            self.results_text.insert(END, f"  N22 = {self.N22:.6f}\n")
-            self.results_text.insert(END, f"  M22 = {self.M22:.6f}\n")
-            self.results_text.insert(END, f"  L22 = {self.L22:.6f}\n")
+            self.emit(f"\nIteração {iteration}:\n"
+                      f"  Δθ = {delta[0]:.6f} rad, ΔV = {delta[1]:.6f} pu\n"
+                      f"  P = {P:.6f} pu, Q = {Q:.6f} pu\n"
+                      f"  ΔP = {DeltaP:.6f} pu, ΔQ = {DeltaQ:.6f} pu\n"
+                      "\n  Elementos da Matriz Jacobiana:\n"
+                      f"  H22 = {self.H22:.6f}\n"
+                      f"  N22 = {self.N22:.6f}\n"
+                      f"  M22 = {self.M22:.6f}\n"
+                      f"  L22 = {self.L22:.6f}\n"
+                      "\n  Coeficientes da matriz de Admitância:\n"
+                      f"  G21 = {self.G21:.6f}\n"
+                      f"  B21 = {self.B21:.6f}\n"
+                      f"  G22 = {self.G22:.6f}\n"
+                      f"  B22 = {self.B22:.6f}\n")
+
+        self.emit(f"\nAtenção: Método não convergiu após {max_iter} iterações!\n")
+        return False
 
-            self.results_text.insert(END, "\n  Coeficientes da matriz de Admitância:\n")
-            self.results_text.insert(END, f"  G21 = {self.G21:.6f}\n")
-            self.results_text.insert(END, f"  B21 = {self.B21:.6f}\n")
-            self.results_text.insert(END, f"  G22 = {self.G22:.6f}\n")
-            self.results_text.insert(END, f"  B22 = {self.B22:.6f}\n")
+    def start_worker(self, tarefa):
+        """Executa a tarefa em uma thread separada e acompanha a fila com root.after"""
+        self.cancelar.clear()
+        self.botao_calcular.config(state=DISABLED)
+        self.botao_lote.config(state=DISABLED)
+        self.botao_cancelar.config(state=NORMAL)
 
-        self.results_text.insert(END, f"\nAtenção: Método não convergiu após {max_iter} iterações!\n")
-        return False
+        def executar():
+            try:
+                tarefa()
+            except Exception as e:
+                self.fila.put(("erro", str(e)))
+            finally:
+                self.fila.put(("fim", None))
+
+        self.trabalhador = threading.Thread(target=executar, daemon=True)
+        self.trabalhador.start()
+        self.root.after(50, self.poll_queue)
+
+    def poll_queue(self):
+        """Esvazia a fila e insere todo o texto pendente de uma só vez"""
+        textos = []
+        terminou = False
+        try:
+            while True:
+                tipo, conteudo = self.fila.get_nowait()
+                if tipo == "texto":
+                    textos.append(conteudo)
+                elif tipo == "erro":
+                    messagebox.showerror("Erro", f"Ocorreu um erro:\n{conteudo}")
+                else:
+                    terminou = True
+        except queue.Empty:
+            pass
+
+        if textos:
+            self.results_text.insert(END, "".join(textos))
+            self.results_text.see(END)
+
+        if terminou:
+            self.botao_calcular.config(state=NORMAL)
+            self.botao_lote.config(state=NORMAL)
+            self.botao_cancelar.config(state=DISABLED)
+        else:
+            self.root.after(50, self.poll_queue)
+
+    def cancel_calculation(self):
+        """Solicita a interrupção do cálculo em andamento"""
+        self.cancelar.set()
+
+    def read_inputs(self):
+        """Lê os campos da interface e calcula a matriz de admitância"""
+        z_line = self.input_complex(self.z_line.get())
+        z_shunt = self.input_complex(self.z_shunt.get())
+        self.v2 = float(self.v2_entry.get())
+        self.theta2 = float(self.theta2_entry.get())
+        self.P_esp = float(self.P_esp_entry.get())
+        self.Q_esp = float(self.Q_esp_entry.get())
+        return self.matrix_calc(z_line, z_shunt), z_line, z_shunt
 
     def run_calculation(self):
         """Executa o fluxo de carga"""
         try:
             self.results_text.delete(1.0, END)
 
-            # Obter valores da interface
-            z_line = self.input_complex(self.z_line.get())
-            z_shunt = self.input_complex(self.z_shunt.get())
-            self.v2 = float(self.v2_entry.get())
-            self.theta2 = float(self.theta2_entry.get())
-            self.P_esp = float(self.P_esp_entry.get())
-            self.Q_esp = float(self.Q_esp_entry.get())
-
-            # Calcular matriz de admitância
-            Y_matrix = self.matrix_calc(z_line, z_shunt)
+            # Obter valores da interface e calcular matriz de admitância
+            Y_matrix, _, _ = self.read_inputs()
             self.results_text.insert(END, "\nMatriz de Admitância:\n")
             self.results_text.insert(END, str(np.array_str(Y_matrix, precision=4, suppress_small=True)) + "\n")
 
-            # Executar método
-            self.newton_raphson()
+        except Exception as e:
+            messagebox.showerror("Erro", f"Ocorreu um erro:\n{str(e)}")
+            return
+
+        def tarefa():
+            # Executar método; cancelado, não há resultados finais a mostrar
+            if not self.newton_raphson() and self.cancelar.is_set():
+                return
 
             # Resultados finais
             P_final, Q_final = self.calculate_power()
-            self.results_text.insert(END, "\n=== Resultados Finais ===\n")
-            self.results_text.insert(END, f"Tensão final na barra 2: {self.v2:.6f} pu\n")
-            self.results_text.insert(END, f"Ângulo final na barra 2: {self.theta2:.6f} rad\n")
-            self.results_text.insert(END, f"Potência ativa calculada: {P_final:.6f} pu\n")
-            self.results_text.insert(END, f"Potência reativa calculada: {Q_final:.6f} pu\n")
+            self.emit("\n=== Resultados Finais ===\n"
+                      f"Tensão final na barra 2: {self.v2:.6f} pu\n"
+                      f"Ângulo final na barra 2: {self.theta2:.6f} rad\n"
+                      f"Potência ativa calculada: {P_final:.6f} pu\n"
+                      f"Potência reativa calculada: {Q_final:.6f} pu\n")
+
+        self.start_worker(tarefa)
 
+    def run_sweep(self, n_cenarios=100000, tamanho_lote=10000):
+        """Varre P de 0 até P_esp (com Q proporcional) usando o solucionador em lote"""
+        from Fluxo_de_Carga_em_Lote import newton_lote
+
+        try:
+            self.results_text.delete(1.0, END)
+            _, z_line, z_shunt = self.read_inputs()
         except Exception as e:
             messagebox.showerror("Erro", f"Ocorreu um erro:\n{str(e)}")
+            return
+
+        P_esp = np.linspace(0, self.P_esp, n_cenarios)
+        Q_esp = P_esp * (self.Q_esp / self.P_esp if self.P_esp else 0)
+
+        def tarefa():
+            self.emit(f"\nVarredura de {n_cenarios} cenários de P = 0 a {self.P_esp:.4f} pu...\n")
+            V2 = np.empty(n_cenarios)
+            convergiu = np.zeros(n_cenarios, dtype=bool)
+
+            # Lotes pequenos permitem relatar o progresso e cancelar entre eles
+            for inicio in range(0, n_cenarios, tamanho_lote):
+                if self.cancelar.is_set():
+                    self.emit("\nVarredura cancelada pelo usuário.\n")
+                    return
+                fim = min(inicio + tamanho_lote, n_cenarios)
+                V2[inicio:fim], _, _, convergiu[inicio:fim] = newton_lote(
+                    P_esp[inicio:fim], Q_esp[inicio:fim], z_line, z_shunt, self.v1, self.v2, self.theta2)
+                self.emit(f"  {fim} de {n_cenarios} cenários resolvidos\n")
+
+            validos = V2[convergiu]
+            self.emit("\n=== Resultados da Varredura ===\n"
+                      f"Cenários convergidos: {convergiu.sum()} de {n_cenarios}\n")
+            if validos.size:
+                self.emit(f"Tensão na barra 2: {validos.min():.6f} a {validos.max():.6f} pu\n")
+            if not convergiu.all():
+                self.emit(f"Primeiro cenário sem convergência: P = {P_esp[np.argmin(convergiu)]:.6f} pu\n")
+
+        self.start_worker(tarefa)
 
     def clear_fields(self):
         """Limpa todos os campos de entrada"""
@@ -1,7 +1,9 @@
 import math
 import cmath
 import numpy as np
-from scipy.misc import derivative
+
+from Números_Complexos import converter_complexo
+from Rastreamento import rastreador_interativo
 
 
 # Função para converter para forma fasorial
@@ -11,15 +13,7 @@ def to_phasor(complex_num):
 
 # Função para entrada de números complexos
 def input_complex(prompt):
-    value = input(prompt).strip()
-    try:
-        return complex(value.replace(" ", ""))
-    except ValueError:
-        try:
-            mag, ang = map(float, value.split('<'))
-            return cmath.rect(mag, math.radians(ang))
-        except:
-            raise ValueError("Formato inválido. Use 3+4j ou 5<53.13")
+    return converter_complexo(input(prompt))
 
 
 # Cálculo da matriz de admitância
@@ -44,51 +38,150 @@ def power_equation(theta, matrix, v1, v2):
     return (v2 ** 2) * G22 + v1 * v2 * (G21 * math.cos(theta) + B21 * math.sin(theta))
 
 
-# Método de Newton com derivada numérica
-def newton_method(P_spec, P_calc, epsilon, matrix, v1, v2, theta_init):
+# Matriz B' do sistema de 2 barras (constante durante as iterações)
+def b_linha_duas_barras(matrix, versao="XB"):
+    z = -1 / matrix[1][0]
+    if versao == "XB":
+        # Versão XB: B' desconsidera a resistência série
+        return 1 / z.imag
+    return -(1 / z).imag
+
+
+# Método desacoplado rápido: B' é calculada uma única vez
+def newton_method(P_spec, P_calc, epsilon, matrix, v1, v2, theta_init, versao="XB", rastreador=None):
+    if rastreador is None:
+        rastreador = rastreador_interativo()
     theta = theta_init
     iteration = 0
     max_iter = 100
 
-    while True:
-        # Calcula a derivada numérica usando scipy
-        dp_dtheta = derivative(
-            lambda x: power_equation(x, matrix, v1, v2),
-            theta,
-            dx=1e-6
-        )
-
-        # Verifica se a derivada é muito pequena
-        if abs(dp_dtheta) < 1e-10:
-            print("Aviso: Derivada muito pequena, ajustando theta...")
-            theta += 0.01
-            continue
+    # dP/dθ aproximada por V1 * B' (fixa para todas as iterações)
+    b_linha = v1 * b_linha_duas_barras(matrix, versao)
 
+    if abs(b_linha) < 1e-10:
+        if rastreador.eco_resumo:
+            print("Erro: matriz B' singular")
+        rastreador.finalizar(False, 0)
+        return theta
+
+    while True:
         Delta_P = P_spec - P_calc
         if abs(Delta_P) < epsilon:
-            print(f"\nConvergência alcançada na iteração {iteration}!")
-            print(f"Ângulo final: {math.degrees(theta):.6f}°")
-            print(f"Potência calculada: {P_calc:.6f}")
+            if rastreador.eco_resumo:
+                print(f"\nConvergência alcançada na iteração {iteration}!")
+                print(f"Ângulo final: {math.degrees(theta):.6f}°")
+                print(f"Potência calculada: {P_calc:.6f}")
+            rastreador.finalizar(True, iteration)
             return theta
 
         if iteration >= max_iter:
-            print("\nAtenção: Número máximo de iterações atingido!")
+            if rastreador.eco_resumo:
+                print("\nAtenção: Número máximo de iterações atingido!")
+            rastreador.finalizar(False, iteration)
             return theta
 
-        # Atualiza theta usando Newton-Raphson
-        delta_theta = Delta_P / dp_dtheta
+        # Meia iteração P-θ: ΔP / V = B' Δθ
+        delta_theta = Delta_P / (v2 * b_linha)
         theta += delta_theta
 
         # Recalcula a potência com novo theta
         P_calc = power_equation(theta, matrix, v1, v2)
 
-        print(f"Iteração {iteration}: θ = {math.degrees(theta):.6f}°, P = {P_calc:.6f}, ΔP = {Delta_P:.6f}")
+        if rastreador.por_iteracao:
+            rastreador.registrar(iteration, abs(Delta_P), abs(delta_theta), 1.0)
+            if rastreador.eco_iteracao:
+                print(f"Iteração {iteration}: θ = {math.degrees(theta):.6f}°, P = {P_calc:.6f}, ΔP = {Delta_P:.6f}")
         iteration += 1
 
 
+# Matrizes B' e B'' do método desacoplado rápido para N barras
+def matrizes_b(n_barras, de, para, z_serie, y_shunt=None, tap=None, y_barra=None, versao="XB"):
+    # scipy só é importado pelo caso de N barras (o de 2 barras dispensa)
+    from Matriz_de_Admitância_Esparsa import montar_ybus
+
+    z_serie = np.asarray(z_serie, dtype=complex)
+    n_ramos = z_serie.size
+    sem_resistencia = 1j * z_serie.imag
+
+    # B': sem shunts e com taps nominais; na versão XB também sem resistência
+    z_b_linha = sem_resistencia if versao == "XB" else z_serie
+    B_linha = -montar_ybus(n_barras, de, para, z_b_linha).imag
+
+    # B'': com shunts e taps (sem defasagem); na versão BX sem resistência
+    z_b_duas_linhas = sem_resistencia if versao == "BX" else z_serie
+    tap_modulo = None if tap is None else np.abs(np.asarray(tap, dtype=complex))
+    y_sh = np.zeros(n_ramos, dtype=complex) if y_shunt is None else y_shunt
+    B_duas_linhas = -montar_ybus(n_barras, de, para, z_b_duas_linhas, y_sh, tap_modulo, y_barra).imag
+
+    return B_linha.tocsr(), B_duas_linhas.tocsr()
+
+
+# Fatoração única de B' (barras PV e PQ) e B'' (barras PQ)
+# ordem_barras -> ordem de eliminação das barras (Reordenação_de_Barras); None usa o COLAMD do SuperLU
+def fatorar_matrizes_b(B_linha, B_duas_linhas, pv, pq, ordem_barras=None):
+    from scipy.sparse.linalg import splu
+
+    pvpq = np.concatenate((pv, pq))
+    B_linha = B_linha[pvpq][:, pvpq].tocsc()
+    B_duas_linhas = B_duas_linhas[pq][:, pq].tocsc()
+    if ordem_barras is None:
+        return splu(B_linha), splu(B_duas_linhas)
+
+    from Fatoração_Esparsa import FatoracaoOrdenada
+    from Reordenação_de_Barras import ordem_reduzida
+
+    lu_linha = FatoracaoOrdenada(ordem_reduzida(ordem_barras, pvpq)).fatorar(B_linha)
+    lu_duas_linhas = FatoracaoOrdenada(ordem_reduzida(ordem_barras, pq)).fatorar(B_duas_linhas)
+    return lu_linha, lu_duas_linhas
+
+
+# Fluxo de carga desacoplado rápido para N barras
+def fluxo_desacoplado_rapido(Ybus, S_esp, V0, pv, pq, fatores, tol=1e-6, max_iter=50, rastreador=None):
+    lu_linha, lu_duas_linhas = fatores
+    pv = np.asarray(pv, dtype=np.intp)
+    pq = np.asarray(pq, dtype=np.intp)
+    pvpq = np.concatenate((pv, pq))
+
+    V = np.array(V0, dtype=complex)
+    S_esp = np.asarray(S_esp, dtype=complex)
+    Va = np.angle(V)
+    Vm = np.abs(V)
+
+    for iteracao in range(max_iter):
+        # Meia iteração P-θ: uma substituição progressiva/regressiva com B' fatorada
+        DeltaS = S_esp - V * np.conj(Ybus @ V)
+        DeltaP = DeltaS[pvpq].real
+        norma = max(np.max(np.abs(DeltaP), initial=0.0), np.max(np.abs(DeltaS[pq].imag), initial=0.0))
+        if norma < tol:
+            if rastreador is not None:
+                rastreador.finalizar(True, iteracao)
+            return V, True, iteracao
+
+        delta_theta = lu_linha.solve(DeltaP / Vm[pvpq])
+        Va[pvpq] += delta_theta
+        V = Vm * np.exp(1j * Va)
+
+        # Meia iteração Q-V com B'' fatorada
+        DeltaQ = (S_esp - V * np.conj(Ybus @ V))[pq].imag
+        delta_V = lu_duas_linhas.solve(DeltaQ / Vm[pq])
+        Vm[pq] += delta_V
+        V = Vm * np.exp(1j * Va)
+
+        if rastreador is not None and rastreador.por_iteracao:
+            passo = max(np.max(np.abs(delta_theta), initial=0.0), np.max(np.abs(delta_V), initial=0.0))
+            rastreador.registrar(iteracao, norma, passo)
+
+    DeltaS = S_esp - V * np.conj(Ybus @ V)
+    convergiu = max(np.max(np.abs(DeltaS[pvpq].real), initial=0.0),
+                    np.max(np.abs(DeltaS[pq].imag), initial=0.0)) < tol
+    if rastreador is not None:
+        rastreador.finalizar(convergiu, max_iter)
+    return V, convergiu, max_iter
+
+
 # Programa principal
 if __name__ == "__main__":
-    print("=== Método de Newton para Fluxo de Carga com Derivada Numérica ===")
+    print("=== Método de Newton Desacoplado Rápido para Fluxo de Carga ===")
 
     # Entrada de dados
     print("\nInsira a impedância de linha (ex: 0.1+0.5j ou 0.5<78.69):")
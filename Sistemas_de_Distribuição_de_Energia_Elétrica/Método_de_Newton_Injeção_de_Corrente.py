@@ -0,0 +1,226 @@
+import time
+import numpy as np
+import scipy.sparse as sp
+
+from Fatoração_Esparsa import FatoracaoReutilizavel
+from Método_de_Newton_N_Barras import calcular_potencias
+
+
+class JacobianoInjecaoCorrente:
+    """Jacobiano do método de injeção de corrente em coordenadas retangulares
+
+    Variáveis: (Vr, Vi) intercaladas para cada barra não referência e, ao
+    final, a potência reativa Q de cada barra PV. Equações: resíduos de
+    corrente (real, imaginária) de cada barra e, para as PV, |V|² = V_esp².
+
+    Os blocos 2x2 fora da diagonal são [[G, -B], [B, G]] da Ybus e não mudam
+    entre iterações; apenas os blocos diagonais (termo da carga) e as
+    linhas/colunas das barras PV são recalculados. O padrão de esparsidade e
+    a posição de cada valor em J.data são calculados uma única vez.
+    """
+
+    def __init__(self, Ybus, ref, pv, pq):
+        Y = sp.csr_matrix(Ybus, dtype=complex)
+        Y.sum_duplicates()
+        Y.sort_indices()
+        n = Y.shape[0]
+        self.Ybus = Y
+        self.pv = np.asarray(pv, dtype=np.intp)
+        self.pq = np.asarray(pq, dtype=np.intp)
+        self.barras = np.sort(np.concatenate((self.pv, self.pq)))
+        n_var = 2 * self.barras.size
+        self.dim = n_var + self.pv.size
+
+        posicao = np.full(n, -1, dtype=np.intp)
+        posicao[self.barras] = np.arange(self.barras.size)
+        self.posicao_pv = posicao[self.pv]
+
+        # Blocos da Ybus entre barras não referência
+        linhas_y = np.repeat(np.arange(n), np.diff(Y.indptr))
+        valido = (posicao[linhas_y] >= 0) & (posicao[Y.indices] >= 0)
+        pi = posicao[linhas_y[valido]]
+        pj = posicao[Y.indices[valido]]
+        G = Y.data[valido].real
+        B = Y.data[valido].imag
+        linhas = [2 * pi, 2 * pi, 2 * pi + 1, 2 * pi + 1]
+        colunas = [2 * pj, 2 * pj + 1, 2 * pj, 2 * pj + 1]
+        valores = [G, -B, B, G]
+
+        # Blocos diagonais: garante os quatro elementos mesmo sem entrada na Ybus
+        d = np.arange(self.barras.size)
+        linhas += [2 * d, 2 * d, 2 * d + 1, 2 * d + 1]
+        colunas += [2 * d, 2 * d + 1, 2 * d, 2 * d + 1]
+        valores += [np.zeros(d.size)] * 4
+
+        # Barras PV: coluna de Q e linha da restrição de tensão
+        q = n_var + np.arange(self.pv.size)
+        p = self.posicao_pv
+        linhas += [2 * p, 2 * p + 1, q, q]
+        colunas += [q, q, 2 * p, 2 * p + 1]
+        valores += [np.zeros(p.size)] * 4
+
+        linhas = np.concatenate(linhas)
+        colunas = np.concatenate(colunas)
+        valores = np.concatenate(valores)
+
+        # Posição em J.data de cada elemento da lista (elementos repetidos são somados)
+        ordem = sp.coo_matrix((np.ones(linhas.size), (linhas, colunas)), shape=(self.dim, self.dim)).tocsc()
+        ordem.sort_indices()
+        chave_csc = np.repeat(np.arange(self.dim), np.diff(ordem.indptr)) * self.dim + ordem.indices
+        destino = np.searchsorted(chave_csc, colunas * self.dim + linhas)
+
+        self.indices = ordem.indices
+        self.indptr = ordem.indptr
+        self.base = np.zeros(ordem.nnz)
+        np.add.at(self.base, destino, valores)
+
+        inicio_diagonal = 4 * valido.sum()
+        self.pos_diagonal = destino[inicio_diagonal:inicio_diagonal + 4 * d.size].reshape(4, -1)
+        self.pos_pv = destino[inicio_diagonal + 4 * d.size:].reshape(4, -1)
+
+    def montar(self, V, S):
+        """Jacobiano (CSC) no ponto V, com S as potências especificadas (Q das PV já atualizado)"""
+        Vb = V[self.barras]
+        # Derivada da corrente da carga conj(S / V) em relação a (Vr, Vi): w = -conj(S) / conj(V)²
+        w = -np.conj(S[self.barras]) / np.conj(Vb) ** 2
+        dados = self.base.copy()
+        dados[self.pos_diagonal[0]] -= w.real
+        dados[self.pos_diagonal[1]] -= w.imag
+        dados[self.pos_diagonal[2]] -= w.imag
+        dados[self.pos_diagonal[3]] += w.real
+
+        # Q das PV: ∂I/∂Q = -j / conj(V); restrição: ∂(|V|²) = 2 Vr ΔVr + 2 Vi ΔVi
+        Vpv = V[self.pv]
+        modulo2 = np.abs(Vpv) ** 2
+        dados[self.pos_pv[0]] = -Vpv.imag / modulo2
+        dados[self.pos_pv[1]] = Vpv.real / modulo2
+        dados[self.pos_pv[2]] = 2 * Vpv.real
+        dados[self.pos_pv[3]] = 2 * Vpv.imag
+        return sp.csc_matrix((dados, self.indices, self.indptr), shape=(self.dim, self.dim))
+
+
+def newton_injecao_corrente(Ybus, S_esp, V0, ref, pv, pq, tol=1e-6, max_iter=20, rastreador=None,
+                            jacobiano=None, fatorar=None):
+    """Newton-Raphson por injeção de corrente em coordenadas retangulares
+
+    S_esp -> potência complexa líquida especificada em cada barra (pu); nas
+             barras PV apenas a parte ativa é usada
+    V0    -> tensões iniciais; o módulo de V0 nas barras PV é o especificado
+    jacobiano -> JacobianoInjecaoCorrente pré-calculado para a mesma rede
+    fatorar   -> função de fatoração; por padrão uma FatoracaoReutilizavel,
+                 que reaproveita a ordenação entre as iterações
+    A convergência é verificada nos resíduos de potência (como no método
+    polar) e no módulo das tensões das barras PV. Retorna (V, convergiu, iteracoes).
+    """
+    if jacobiano is None:
+        jacobiano = JacobianoInjecaoCorrente(Ybus, ref, pv, pq)
+    if fatorar is None:
+        fatorar = FatoracaoReutilizavel().fatorar
+    V = np.array(V0, dtype=complex)
+    S = np.array(S_esp, dtype=complex)
+    pv = jacobiano.pv
+    pq = jacobiano.pq
+    barras = jacobiano.barras
+    n_var = 2 * barras.size
+    V_esp2 = np.abs(V[pv]) ** 2
+
+    # Q inicial das PV: o injetado no ponto de partida
+    S_calc = calcular_potencias(Ybus, V)
+    S[pv] = S[pv].real + 1j * S_calc[pv].imag
+
+    for iteracao in range(max_iter + 1):
+        DeltaS = S - S_calc
+        norma = max(np.max(np.abs(DeltaS[barras].real), initial=0.0), np.max(np.abs(DeltaS[pq].imag), initial=0.0),
+                    np.max(np.abs(V_esp2 - np.abs(V[pv]) ** 2), initial=0.0))
+        if norma < tol:
+            if rastreador is not None:
+                rastreador.finalizar(True, iteracao, iteracao)
+            return V, True, iteracao
+
+        if iteracao == max_iter:
+            break
+
+        # Resíduos de corrente (intercalados) e da restrição de tensão das PV
+        DeltaI = np.conj(DeltaS[barras] / V[barras])
+        residuo = np.empty(jacobiano.dim)
+        residuo[0:n_var:2] = DeltaI.real
+        residuo[1:n_var:2] = DeltaI.imag
+        residuo[n_var:] = V_esp2 - np.abs(V[pv]) ** 2
+
+        try:
+            lu = fatorar(jacobiano.montar(V, S))
+        except RuntimeError:
+            if rastreador is not None:
+                if rastreador.eco_resumo:
+                    print("Erro: Jacobiano singular")
+                rastreador.finalizar(False, iteracao, iteracao)
+            return V, False, iteracao
+        delta = lu.solve(residuo)
+
+        if rastreador is not None and rastreador.por_iteracao:
+            rastreador.registrar(iteracao, norma, np.max(np.abs(delta)))
+            if rastreador.eco_iteracao:
+                print(f"Iteração {iteracao}: max|ΔS| = {norma:.6e}, max|Δx| = {np.max(np.abs(delta)):.6e}")
+
+        V[barras] += delta[0:n_var:2] + 1j * delta[1:n_var:2]
+        S[pv] += 1j * delta[n_var:]
+        S_calc = calcular_potencias(Ybus, V)
+
+    if rastreador is not None:
+        rastreador.finalizar(False, max_iter, max_iter)
+    return V, False, max_iter
+
+
+if __name__ == "__main__":
+    from Casos_de_Teste import alimentador_radial_sintetico
+    from Matriz_de_Admitância_Esparsa import ybus_duas_barras
+    from Método_de_Newton_N_Barras import newton_raphson_n_barras
+    from Números_Complexos import converter_complexo
+
+    print("=== Newton por Injeção de Corrente (Coordenadas Retangulares) ===")
+
+    print("\nRecomendação para teste (linha de distribuição, R/X alto):")
+    print("Z_linha = 0.25+0.1j (sem shunt), P = -0.6 pu, Q = -0.3 pu\n")
+    z_linha = converter_complexo(input("Impedância série da linha: ") or "0.25+0.1j")
+    P = float(input("Potência ativa na barra 2 (pu): ") or "-0.6")
+    Q = float(input("Potência reativa na barra 2 (pu): ") or "-0.3")
+    n_barras = int(input("Número de barras do alimentador sintético (ex: 50000): ") or "50000")
+    escala = float(input("Fator de carga do alimentador (ex: 2.0): ") or "2.0")
+
+    # Sistema de 2 barras
+    Ybus = ybus_duas_barras(z_linha, 0)
+    S_esp = np.array([0, P + 1j * Q])
+    V0 = np.ones(2, dtype=complex)
+    ref, pv, pq = np.array([0]), np.array([], dtype=np.intp), np.array([1])
+    V_polar, conv_polar, it_polar = newton_raphson_n_barras(Ybus, S_esp, V0, ref, pv, pq)
+    V_ic, conv_ic, it_ic = newton_injecao_corrente(Ybus, S_esp, V0, ref, pv, pq)
+
+    print("\n=== Sistema de 2 Barras ===")
+    print(f"Polar:               convergiu {conv_polar} em {it_polar} iterações, V2 = {abs(V_polar[1]):.6f} pu")
+    print(f"Injeção de corrente: convergiu {conv_ic} em {it_ic} iterações, V2 = {abs(V_ic[1]):.6f} pu")
+
+    # Alimentador sintético com carga aumentada
+    sistema = alimentador_radial_sintetico(n_barras)
+    S_esp, V0, ref, pv, pq = sistema.dados_fluxo()
+    S_esp = S_esp * escala
+    Ybus = sistema.matriz_admitancia()
+    tol = 1e-9  # cargas de ~1e-5 pu por barra: tolerância abaixo delas
+
+    inicio = time.perf_counter()
+    V_polar, conv_polar, it_polar = newton_raphson_n_barras(Ybus, S_esp, V0, ref, pv, pq, tol)
+    t_polar = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    jacobiano = JacobianoInjecaoCorrente(Ybus, ref, pv, pq)
+    fatoracao = FatoracaoReutilizavel()
+    V_ic, conv_ic, it_ic = newton_injecao_corrente(Ybus, S_esp, V0, ref, pv, pq, tol, jacobiano=jacobiano,
+                                                   fatorar=fatoracao.fatorar)
+    t_ic = time.perf_counter() - inicio
+
+    print(f"\n=== {sistema.nome} (carga x{escala}) ===")
+    print(f"Polar:               convergiu {conv_polar} em {it_polar} iterações, {t_polar * 1e3:.2f} ms")
+    print(f"Injeção de corrente: convergiu {conv_ic} em {it_ic} iterações, {t_ic * 1e3:.2f} ms "
+          f"({fatoracao.reutilizacoes} de {fatoracao.fatoracoes} fatorações com ordenação reaproveitada)")
+    if conv_polar and conv_ic:
+        print(f"Maior diferença entre as soluções: {np.max(np.abs(V_polar - V_ic)):.2e} pu")
+    print(f"Tensão mínima: {np.abs(V_ic).min():.6f} pu")
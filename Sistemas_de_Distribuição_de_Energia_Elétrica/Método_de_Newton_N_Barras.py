@@ -0,0 +1,171 @@
+import time
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator, onenormest, splu
+
+from Matriz_de_Admitância_Esparsa import montar_ybus
+
+
+def calcular_potencias(Ybus, V):
+    """Calcula as potências injetadas S = V * conj(Ybus @ V) em todas as barras"""
+    return V * np.conj(Ybus @ V)
+
+
+def derivadas_potencia(Ybus, V):
+    """Derivadas das potências injetadas em relação ao ângulo e ao módulo das tensões"""
+    n = V.size
+    I = Ybus @ V
+    diag_V = sp.diags(V, format="csr", shape=(n, n))
+    diag_I = sp.diags(I, format="csr", shape=(n, n))
+    diag_V_norm = sp.diags(V / np.abs(V), format="csr", shape=(n, n))
+
+    dS_dVm = diag_V @ (Ybus @ diag_V_norm).conj() + diag_I.conj() @ diag_V_norm
+    dS_dVa = 1j * diag_V @ (diag_I - Ybus @ diag_V).conj()
+    return dS_dVa, dS_dVm
+
+
+def calcular_jacobiano(Ybus, V, pvpq, pq):
+    """Monta a matriz Jacobiana esparsa [[H, N], [M, L]] do método polar"""
+    dS_dVa, dS_dVm = derivadas_potencia(Ybus, V)
+
+    H = dS_dVa[pvpq][:, pvpq].real
+    N = dS_dVm[pvpq][:, pq].real
+    M = dS_dVa[pq][:, pvpq].imag
+    L = dS_dVm[pq][:, pq].imag
+
+    return sp.bmat([[H, N], [M, L]], format="csc")
+
+
+def condicionamento_estimado(J, lu):
+    """Estimativa do número de condição (norma 1) a partir da fatoração LU"""
+    n = J.shape[0]
+    inversa = LinearOperator((n, n), matvec=lu.solve, rmatvec=lambda x: lu.solve(x, trans="T"),
+                             dtype=J.dtype)
+    return onenormest(J) * onenormest(inversa)
+
+
+def newton_raphson_n_barras(Ybus, S_esp, V0, ref, pv, pq, tol=1e-6, max_iter=20, rastreador=None,
+                            desonesto=False, razao_refatorar=0.5, fatorar=splu, nucleo=None):
+    """Implementa o método de Newton-Raphson polar para um sistema de N barras
+
+    S_esp -> potência complexa líquida especificada em cada barra (pu)
+    V0    -> tensões complexas iniciais (módulo das barras ref e PV é mantido)
+    ref, pv, pq -> índices das barras de referência, PV e PQ
+    rastreador  -> Rastreador opcional para registrar as iterações
+    desonesto   -> reaproveita a fatoração LU do Jacobiano (Newton "desonesto"/corda)
+                   enquanto ‖ΔS_k‖ / ‖ΔS_k-1‖ <= razao_refatorar; o número de
+                   fatorações economizadas fica no rastreador
+    fatorar     -> função que fatora o Jacobiano (CSC) e retorna um objeto com
+                   solve; por exemplo FatoracaoReutilizavel().fatorar
+    nucleo      -> NucleoNewton opcional (Núcleos_Acelerados) que calcula as potências
+                   e preenche no lugar o Jacobiano de padrão pré-calculado
+
+    Retorna (V, convergiu, iteracoes).
+    """
+    V = np.array(V0, dtype=complex)
+    S_esp = np.asarray(S_esp, dtype=complex)
+    pv = np.asarray(pv, dtype=np.intp)
+    pq = np.asarray(pq, dtype=np.intp)
+    pvpq = np.concatenate((pv, pq))
+    n_pvpq = pvpq.size
+
+    Va = np.angle(V)
+    Vm = np.abs(V)
+    lu = None
+    norma_anterior = np.inf
+    fatoracoes = 0
+
+    for iteracao in range(max_iter + 1):
+        # Resíduos de potência
+        S_calc = calcular_potencias(Ybus, V) if nucleo is None else nucleo.potencias(V)
+        DeltaS = S_esp - S_calc
+        residuo = np.concatenate((DeltaS[pvpq].real, DeltaS[pq].imag))
+
+        # Verificar convergência
+        norma = np.max(np.abs(residuo), initial=0.0)
+        if norma < tol:
+            if rastreador is not None:
+                rastreador.finalizar(True, iteracao, fatoracoes)
+            return V, True, iteracao
+
+        if iteracao == max_iter:
+            break
+
+        # No modo desonesto o Jacobiano só é refeito quando a redução do resíduo fica lenta
+        if lu is None or not desonesto or norma > razao_refatorar * norma_anterior:
+            J = calcular_jacobiano(Ybus, V, pvpq, pq) if nucleo is None else nucleo.jacobiano(V, S_calc)
+
+            # Resolver sistema linear com fatoração LU esparsa
+            try:
+                lu = fatorar(J)
+            except RuntimeError:
+                if rastreador is not None:
+                    if rastreador.eco_resumo:
+                        print("Erro: Jacobiano singular")
+                    rastreador.finalizar(False, iteracao, fatoracoes)
+                return V, False, iteracao
+            fatoracoes += 1
+        norma_anterior = norma
+        delta = lu.solve(residuo)
+
+        if rastreador is not None and rastreador.por_iteracao:
+            condicionamento = condicionamento_estimado(J, lu) if rastreador.estimar_condicionamento else np.nan
+            rastreador.registrar(iteracao, norma, np.max(np.abs(delta)), condicionamento)
+            if rastreador.eco_iteracao:
+                print(f"Iteração {iteracao}: max|ΔS| = {norma:.6e}, max|Δx| = {np.max(np.abs(delta)):.6e}")
+
+        # Atualizar variáveis
+        Va[pvpq] += delta[:n_pvpq]
+        Vm[pq] += delta[n_pvpq:]
+        V = Vm * np.exp(1j * Va)
+
+    if rastreador is not None:
+        rastreador.finalizar(False, max_iter, fatoracoes)
+    return V, False, max_iter
+
+
+def tipos_de_barra(n_barras, ref, pv):
+    """Retorna os índices das barras PQ, dadas as barras de referência e PV"""
+    pq = np.ones(n_barras, dtype=bool)
+    pq[np.asarray(ref, dtype=np.intp)] = False
+    pq[np.asarray(pv, dtype=np.intp)] = False
+    return np.flatnonzero(pq)
+
+
+if __name__ == "__main__":
+    print("=== Método de Newton-Raphson para Fluxo de Carga em N Barras ===")
+
+    n_barras = int(input("\nNúmero de barras do sistema sintético (ex: 5000): ") or "5000")
+
+    # Rede sintética: alimentador em anel com algumas interligações
+    rng = np.random.default_rng(0)
+    de = np.arange(n_barras - 1)
+    para = np.arange(1, n_barras)
+    extras = rng.integers(0, n_barras, size=(n_barras // 10, 2))
+    extras = extras[extras[:, 0] != extras[:, 1]]
+    de = np.concatenate((de, extras[:, 0]))
+    para = np.concatenate((para, extras[:, 1]))
+    z_serie = (0.0005 + 0.002j) * (1 + rng.random(de.size))
+
+    inicio = time.perf_counter()
+    Ybus = montar_ybus(n_barras, de, para, z_serie, np.full(de.size, 0.0001j))
+    t_ybus = time.perf_counter() - inicio
+
+    ref = np.array([0])
+    pv = np.array([], dtype=np.intp)
+    pq = tipos_de_barra(n_barras, ref, pv)
+
+    S_esp = np.zeros(n_barras, dtype=complex)
+    S_esp[pq] = -(0.001 + 0.0005j) * (1 + rng.random(pq.size))
+    V0 = np.ones(n_barras, dtype=complex)
+
+    inicio = time.perf_counter()
+    V, convergiu, iteracoes = newton_raphson_n_barras(Ybus, S_esp, V0, ref, pv, pq)
+    t_solucao = time.perf_counter() - inicio
+
+    print("\n=== Resultados Finais ===")
+    print(f"Convergiu: {convergiu} em {iteracoes} iterações")
+    print(f"Tempo de montagem da Ybus: {t_ybus * 1e3:.2f} ms")
+    print(f"Tempo de solução: {t_solucao * 1e3:.2f} ms")
+    print(f"Tensão mínima: {np.abs(V).min():.6f} pu (barra {np.argmin(np.abs(V))})")
+    print(f"Ângulo mínimo: {np.degrees(np.angle(V)).min():.6f}°")
@@ -0,0 +1,207 @@
+import time
+import numpy as np
+import scipy.sparse as sp
+
+# Numba é opcional: sem ele os núcleos usam operações vetorizadas do NumPy
+try:
+    from numba import njit
+    NUMBA_DISPONIVEL = True
+except ImportError:
+    NUMBA_DISPONIVEL = False
+
+
+def _potencias_laco(indptr, indices, G, B, Vm, Va, P, Q):
+    """P e Q injetadas percorrendo a Ybus CSR linha a linha"""
+    for i in range(Vm.size):
+        p = 0.0
+        q = 0.0
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            c = np.cos(Va[i] - Va[j])
+            s = np.sin(Va[i] - Va[j])
+            p += Vm[j] * (G[k] * c + B[k] * s)
+            q += Vm[j] * (G[k] * s - B[k] * c)
+        P[i] = Vm[i] * p
+        Q[i] = Vm[i] * q
+
+
+def _derivadas_laco(indptr, indices, G, B, Vm, Va, P, Q, saida):
+    """dP/dθ, dP/dV, dQ/dθ e dQ/dV para cada elemento da Ybus (saida de forma (nnz, 4))"""
+    for i in range(Vm.size):
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            if i == j:
+                saida[k, 0] = -Q[i] - B[k] * Vm[i] ** 2
+                saida[k, 1] = P[i] / Vm[i] + G[k] * Vm[i]
+                saida[k, 2] = P[i] - G[k] * Vm[i] ** 2
+                saida[k, 3] = Q[i] / Vm[i] - B[k] * Vm[i]
+            else:
+                c = np.cos(Va[i] - Va[j])
+                s = np.sin(Va[i] - Va[j])
+                a = G[k] * s - B[k] * c
+                b = G[k] * c + B[k] * s
+                saida[k, 0] = Vm[i] * Vm[j] * a
+                saida[k, 1] = Vm[i] * b
+                saida[k, 2] = -Vm[i] * Vm[j] * b
+                saida[k, 3] = Vm[i] * a
+
+
+if NUMBA_DISPONIVEL:
+    _potencias_laco = njit(cache=True)(_potencias_laco)
+    _derivadas_laco = njit(cache=True)(_derivadas_laco)
+
+
+def _derivadas_numpy(linhas, indices, diagonal, G, B, Vm, Va, P, Q, saida):
+    """Mesmas derivadas de _derivadas_laco, com arrays em vez de laços"""
+    c = np.cos(Va[linhas] - Va[indices])
+    s = np.sin(Va[linhas] - Va[indices])
+    a = G * s - B * c
+    b = G * c + B * s
+    Vi = Vm[linhas]
+    ViVj = Vi * Vm[indices]
+    saida[:, 0] = ViVj * a
+    saida[:, 1] = Vi * b
+    saida[:, 2] = -ViVj * b
+    saida[:, 3] = Vi * a
+
+    # Diagonal: termos próprios escritos com as potências injetadas
+    saida[diagonal, 0] = -Q - B[diagonal] * Vm ** 2
+    saida[diagonal, 1] = P / Vm + G[diagonal] * Vm
+    saida[diagonal, 2] = P - G[diagonal] * Vm ** 2
+    saida[diagonal, 3] = Q / Vm - B[diagonal] * Vm
+
+
+class NucleoNewton:
+    """Potências injetadas e Jacobiano polar com padrão de esparsidade pré-calculado
+
+    O construtor percorre a Ybus uma única vez e guarda, para cada elemento
+    do Jacobiano [[H, N], [M, L]] (CSC), qual derivada de qual elemento da
+    Ybus o preenche. Cada novo Jacobiano apenas calcula as derivadas e
+    reescreve J.data no lugar: o padrão (indptr, indices) não muda, o que
+    também permite reaproveitar a ordenação em FatoracaoReutilizavel.
+
+    Com Numba instalado os laços sobre a Ybus CSR são compilados; sem ele
+    (ou com usar_numba=False) são usadas operações vetorizadas do NumPy.
+    """
+
+    def __init__(self, Ybus, pv, pq, usar_numba=None):
+        Y = sp.csr_matrix(Ybus, dtype=complex)
+        Y.sum_duplicates()
+        Y.sort_indices()
+        n = Y.shape[0]
+        self.Ybus = Y
+        self.G = np.ascontiguousarray(Y.data.real)
+        self.B = np.ascontiguousarray(Y.data.imag)
+        self.linhas = np.repeat(np.arange(n), np.diff(Y.indptr))
+        self.diagonal = np.flatnonzero(self.linhas == Y.indices)
+        if self.diagonal.size != n:
+            raise ValueError("A Ybus deve ter todos os elementos da diagonal")
+        self.usar_numba = NUMBA_DISPONIVEL if usar_numba is None else usar_numba and NUMBA_DISPONIVEL
+
+        pv = np.asarray(pv, dtype=np.intp)
+        pq = np.asarray(pq, dtype=np.intp)
+        pvpq = np.concatenate((pv, pq))
+        n_pvpq = pvpq.size
+        pos_angulo = np.full(n, -1, dtype=np.intp)
+        pos_angulo[pvpq] = np.arange(n_pvpq)
+        pos_modulo = np.full(n, -1, dtype=np.intp)
+        pos_modulo[pq] = n_pvpq + np.arange(pq.size)
+
+        # Blocos H, N, M, L: (posições das linhas, posições das colunas, derivada usada)
+        linhas, colunas, fontes = [], [], []
+        elementos = np.arange(Y.nnz)
+        for bloco, (pos_linha, pos_coluna) in enumerate(((pos_angulo, pos_angulo), (pos_angulo, pos_modulo),
+                                                         (pos_modulo, pos_angulo), (pos_modulo, pos_modulo))):
+            r = pos_linha[self.linhas]
+            c = pos_coluna[Y.indices]
+            valido = (r >= 0) & (c >= 0)
+            linhas.append(r[valido])
+            colunas.append(c[valido])
+            fontes.append(4 * elementos[valido] + bloco)
+        fontes = np.concatenate(fontes)
+
+        # A ordem CSC de cada elemento é obtida convertendo os números 1..nnz
+        dim = n_pvpq + pq.size
+        ordem = sp.coo_matrix((np.arange(1, fontes.size + 1), (np.concatenate(linhas), np.concatenate(colunas))),
+                              shape=(dim, dim)).tocsc()
+        ordem.sort_indices()
+        self.fonte = fontes[ordem.data - 1]
+        self.J = sp.csc_matrix((np.zeros(fontes.size), ordem.indices, ordem.indptr), shape=(dim, dim))
+        self.derivadas = np.empty((Y.nnz, 4))
+        self.P = np.empty(n)
+        self.Q = np.empty(n)
+
+    def potencias(self, V):
+        """S = V * conj(Ybus @ V)"""
+        if self.usar_numba:
+            _potencias_laco(self.Ybus.indptr, self.Ybus.indices, self.G, self.B, np.abs(V), np.angle(V),
+                            self.P, self.Q)
+            return self.P + 1j * self.Q
+        return V * np.conj(self.Ybus @ V)
+
+    def jacobiano(self, V, S=None):
+        """Reescreve no lugar e retorna o Jacobiano (CSC) em V; S são as potências em V, se já calculadas"""
+        if S is None:
+            S = self.potencias(V)
+        Vm = np.abs(V)
+        Va = np.angle(V)
+        P = np.ascontiguousarray(S.real)
+        Q = np.ascontiguousarray(S.imag)
+        if self.usar_numba:
+            _derivadas_laco(self.Ybus.indptr, self.Ybus.indices, self.G, self.B, Vm, Va, P, Q, self.derivadas)
+        else:
+            _derivadas_numpy(self.linhas, self.Ybus.indices, self.diagonal, self.G, self.B, Vm, Va, P, Q,
+                             self.derivadas)
+        np.take(self.derivadas.ravel(), self.fonte, out=self.J.data)
+        return self.J
+
+    def memoria(self):
+        """Bytes dos arrays pré-calculados (padrão do Jacobiano e áreas de trabalho)"""
+        return sum(a.nbytes for a in (self.G, self.B, self.linhas, self.diagonal, self.fonte, self.J.data,
+                                      self.J.indices, self.J.indptr, self.derivadas, self.P, self.Q))
+
+
+if __name__ == "__main__":
+    from Casos_de_Teste import rede_malhada_sintetica
+    from Método_de_Newton_N_Barras import calcular_jacobiano, newton_raphson_n_barras
+
+    print("=== Núcleos Acelerados do Método de Newton ===")
+    print(f"Numba {'disponível' if NUMBA_DISPONIVEL else 'não instalado (usando NumPy)'}")
+
+    n_barras = int(input("\nNúmero de barras da rede sintética (ex: 50000): ") or "50000")
+    repeticoes = int(input("Número de montagens do Jacobiano (ex: 20): ") or "20")
+
+    sistema = rede_malhada_sintetica(n_barras)
+    S_esp, V0, ref, pv, pq = sistema.dados_fluxo()
+    Ybus = sistema.matriz_admitancia()
+    pvpq = np.concatenate((pv, pq))
+
+    inicio = time.perf_counter()
+    nucleo = NucleoNewton(Ybus, pv, pq)
+    t_padrao = time.perf_counter() - inicio
+
+    V = V0 * np.exp(0.01j * np.random.default_rng(0).standard_normal(n_barras))
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        J_ref = calcular_jacobiano(Ybus, V, pvpq, pq)
+    t_sparse = (time.perf_counter() - inicio) / repeticoes
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        J = nucleo.jacobiano(V)
+    t_nucleo = (time.perf_counter() - inicio) / repeticoes
+    diferenca = abs(J - J_ref).max()
+
+    inicio = time.perf_counter()
+    _, convergiu, iteracoes = newton_raphson_n_barras(Ybus, S_esp, V0, ref, pv, pq)
+    t_newton = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    _, convergiu_nucleo, iteracoes_nucleo = newton_raphson_n_barras(Ybus, S_esp, V0, ref, pv, pq, nucleo=nucleo)
+    t_newton_nucleo = time.perf_counter() - inicio
+
+    print("\n=== Resultados Finais ===")
+    print(f"Padrão do Jacobiano pré-calculado em {t_padrao * 1e3:.2f} ms ({J.nnz} elementos)")
+    print(f"Jacobiano por produtos esparsos: {t_sparse * 1e3:.2f} ms")
+    print(f"Jacobiano preenchido no lugar:   {t_nucleo * 1e3:.2f} ms (diferença máxima {diferenca:.2e})")
+    print(f"Newton convencional: {t_newton * 1e3:.2f} ms ({iteracoes} iterações, convergiu: {convergiu})")
+    print(f"Newton com o núcleo: {t_newton_nucleo * 1e3:.2f} ms ({iteracoes_nucleo} iterações, "
+          f"convergiu: {convergiu_nucleo})")
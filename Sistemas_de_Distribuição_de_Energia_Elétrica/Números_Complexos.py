@@ -0,0 +1,76 @@
+import numpy as np
+
+
+MENSAGEM_FORMATO = "Formato inválido. Use a forma retangular (ex: 3+4j) ou fasorial (ex: 5<53.13)."
+
+
+def _converter_em_partes(textos, dtype, linhas, invalidas):
+    """Converte textos em bloco; se houver valor inválido, divide o bloco ao meio
+
+    Um bloco válido custa uma única conversão em C. Os valores inválidos são
+    isolados por bisseção, sem uma exceção por linha.
+    """
+    try:
+        return textos.astype(dtype)
+    except ValueError:
+        if textos.size == 1:
+            invalidas.append(int(linhas[0]))
+            return np.full(1, np.nan, dtype=dtype)
+    meio = textos.size // 2
+    return np.concatenate((_converter_em_partes(textos[:meio], dtype, linhas[:meio], invalidas),
+                           _converter_em_partes(textos[meio:], dtype, linhas[meio:], invalidas)))
+
+
+def converter_complexos(valores):
+    """Converte uma coluna de textos retangulares (3+4j) ou fasoriais (5<53.13) em complex128
+
+    Retorna (valores, erros), onde erros é uma lista de (linha, texto, mensagem).
+    As linhas inválidas ficam como nan+nanj e não interrompem o restante do lote.
+    """
+    textos = np.asarray(valores, dtype=str).reshape(-1)
+    textos = np.char.replace(np.char.replace(np.char.strip(textos), " ", ""), "∠", "<")
+    textos = np.char.replace(textos, "°", "")
+    linhas = np.arange(textos.size)
+    resultado = np.full(textos.size, np.nan, dtype=complex)
+
+    fasorial = np.char.find(textos, "<") >= 0
+    retangular = ~fasorial & (np.char.str_len(textos) > 0)
+    invalidas = np.flatnonzero(~fasorial & ~retangular).tolist()
+
+    if retangular.any():
+        resultado[retangular] = _converter_em_partes(textos[retangular], complex, linhas[retangular], invalidas)
+
+    if fasorial.any():
+        modulo, _, angulo = np.char.partition(textos[fasorial], "<").T
+        modulo = _converter_em_partes(modulo, float, linhas[fasorial], invalidas)
+        angulo = _converter_em_partes(angulo, float, linhas[fasorial], invalidas)
+        resultado[fasorial] = modulo * np.exp(1j * np.radians(angulo))
+
+    invalidas = sorted(set(invalidas))
+    resultado[invalidas] = complex(np.nan, np.nan)
+    originais = np.asarray(valores, dtype=str).reshape(-1)
+    erros = [(linha, str(originais[linha]), MENSAGEM_FORMATO) for linha in invalidas]
+    return resultado, erros
+
+
+def converter_complexo(valor):
+    """Converte um único texto; levanta ValueError se o formato for inválido"""
+    resultado, erros = converter_complexos([valor])
+    if erros:
+        raise ValueError(MENSAGEM_FORMATO)
+    return complex(resultado[0])
+
+
+if __name__ == "__main__":
+    print("=== Conversão de Números Complexos ===")
+    print("Digite valores separados por vírgula (ex: 3+4j, 5<53.13, 0.1+0.2j)")
+
+    entrada = input("\nValores: ").split(",")
+    valores, erros = converter_complexos(entrada)
+
+    for i, valor in enumerate(valores):
+        if not np.isnan(valor):
+            print(f"Linha {i}: {valor.real:.4f} {'+' if valor.imag >= 0 else '-'} {abs(valor.imag):.4f}j  "
+                  f"({abs(valor):.4f} < {np.degrees(np.angle(valor)):.2f}°)")
+    for linha, texto, mensagem in erros:
+        print(f"Linha {linha}: '{texto}' -> {mensagem}")
@@ -0,0 +1,102 @@
+import numpy as np
+
+
+# Níveis de detalhamento
+NIVEL_DESLIGADO = 0
+NIVEL_RESUMO = 1
+NIVEL_ITERACAO = 2
+
+
+class Rastreador:
+    """Registro estruturado das iterações dos métodos de fluxo de carga
+
+    No nível de iteração, cada iteração grava número da solução, iteração,
+    norma do resíduo, tamanho do passo e condicionamento do Jacobiano em
+    um buffer circular pré-alocado. No nível de resumo, apenas contadores
+    por solução são atualizados. Com eco=True as mensagens também são
+    impressas, como nos scripts originais.
+
+    Os atributos por_iteracao, eco_iteracao e eco_resumo são calculados uma
+    vez para que os laços testem apenas um booleano antes de formatar texto.
+
+    O condicionamento do Jacobiano custa várias substituições extras por
+    iteração e só é estimado com estimar_condicionamento=True; sem ele, o
+    buffer registra nan.
+    """
+
+    def __init__(self, nivel=NIVEL_RESUMO, capacidade=4096, eco=False, estimar_condicionamento=False):
+        self.nivel = nivel
+        self.eco = eco
+        self.por_iteracao = nivel >= NIVEL_ITERACAO
+        self.estimar_condicionamento = estimar_condicionamento and self.por_iteracao
+        self.eco_iteracao = eco and nivel >= NIVEL_ITERACAO
+        self.eco_resumo = eco and nivel >= NIVEL_RESUMO
+
+        # Sem rastreamento por iteração o buffer não é alocado
+        if not self.por_iteracao:
+            capacidade = 0
+        self.capacidade = capacidade
+        self.total = 0
+        self.solucao = np.zeros(capacidade, dtype=np.int64)
+        self.iteracao = np.zeros(capacidade, dtype=np.int64)
+        self.norma_residuo = np.zeros(capacidade)
+        self.passo = np.zeros(capacidade)
+        self.condicionamento = np.zeros(capacidade)
+
+        # Contadores do nível de resumo
+        self.n_solucoes = 0
+        self.n_convergidas = 0
+        self.total_iteracoes = 0
+        self.total_fatoracoes = 0
+        self.fatoracoes_economizadas = 0
+
+    def registrar(self, iteracao, norma_residuo, passo, condicionamento=np.nan):
+        """Grava uma iteração no buffer circular (sobrescreve as mais antigas)"""
+        i = self.total % self.capacidade
+        self.solucao[i] = self.n_solucoes
+        self.iteracao[i] = iteracao
+        self.norma_residuo[i] = norma_residuo
+        self.passo[i] = passo
+        self.condicionamento[i] = condicionamento
+        self.total += 1
+
+    def finalizar(self, convergiu, iteracoes, fatoracoes=None):
+        """Encerra uma solução, atualizando os contadores de resumo
+
+        fatoracoes -> número de fatorações do Jacobiano, quando o método pode
+                      reaproveitá-las (as demais iterações contam como economizadas)
+        """
+        if self.nivel >= NIVEL_RESUMO:
+            self.n_convergidas += bool(convergiu)
+            self.total_iteracoes += int(iteracoes)
+            if fatoracoes is not None:
+                self.total_fatoracoes += int(fatoracoes)
+                self.fatoracoes_economizadas += int(iteracoes) - int(fatoracoes)
+        self.n_solucoes += 1
+
+    def exportar(self):
+        """Retorna os registros em ordem cronológica como arrays"""
+        n = min(self.total, self.capacidade)
+        inicio = self.total - n
+        ordem = np.arange(inicio, self.total) % max(self.capacidade, 1)
+        return {
+            "solucao": self.solucao[ordem],
+            "iteracao": self.iteracao[ordem],
+            "norma_residuo": self.norma_residuo[ordem],
+            "passo": self.passo[ordem],
+            "condicionamento": self.condicionamento[ordem],
+            "descartados": inicio,
+            "n_solucoes": self.n_solucoes,
+            "n_convergidas": self.n_convergidas,
+            "total_iteracoes": self.total_iteracoes,
+            "total_fatoracoes": self.total_fatoracoes,
+            "fatoracoes_economizadas": self.fatoracoes_economizadas,
+        }
+
+
+def rastreador_interativo(capacidade=64):
+    """Rastreador com o comportamento dos scripts originais (imprime cada iteração)
+
+    O buffer é pequeno: os métodos de duas barras fazem poucas iterações.
+    """
+    return Rastreador(NIVEL_ITERACAO, capacidade, eco=True)
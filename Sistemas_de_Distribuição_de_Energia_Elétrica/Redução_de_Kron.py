@@ -0,0 +1,359 @@
+import time
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import breadth_first_order, connected_components
+from scipy.sparse.linalg import splu
+
+from Fatoração_Esparsa import FatoracaoReutilizavel, memoria_lu
+from Método_de_Newton_N_Barras import newton_raphson_n_barras
+from Núcleos_Acelerados import NucleoNewton
+
+
+def complemento_schur(Ybus, manter, eliminar):
+    """Y_kk - Y_ke Y_ee⁻¹ Y_ek sem inversas densas
+
+    As barras eliminadas são separadas em componentes conexas. As isoladas
+    (sem vizinhas eliminadas) entram por um produto esparso com 1/Y_pp; cada
+    componente maior tem seu bloco fatorado (LU esparsa) e resolvido apenas
+    para as colunas das barras mantidas que a cercam, o que preenche somente
+    o bloco dessas barras de fronteira.
+    """
+    Y = sp.csr_matrix(Ybus, dtype=complex)
+    Y_kk = Y[manter][:, manter]
+    Y_ke = Y[manter][:, eliminar].tocsc()
+    Y_ek = Y[eliminar][:, manter].tocsr()
+    Y_ee = Y[eliminar][:, eliminar].tocsr()
+
+    n_componentes, rotulo = connected_components(abs(Y_ee), directed=False)
+    tamanho = np.bincount(rotulo, minlength=n_componentes)
+
+    # Barras eliminadas isoladas: Y_ee é diagonal nelas
+    isoladas = np.flatnonzero(tamanho[rotulo] == 1)
+    D = sp.diags(1 / Y_ee.diagonal()[isoladas])
+    reduzida = Y_kk - Y_ke[:, isoladas] @ D @ Y_ek[isoladas]
+
+    linhas, colunas, valores = [], [], []
+    ordem = np.argsort(rotulo, kind="stable")
+    inicios = np.concatenate(([0], np.cumsum(tamanho)))
+    for c in np.flatnonzero(tamanho > 1):
+        e = ordem[inicios[c]:inicios[c + 1]]
+        Y_fe = Y_ke[:, e]
+        fronteira = np.unique(Y_fe.indices)
+        if fronteira.size == 0:
+            continue
+        X = splu(Y_ee[e][:, e].tocsc()).solve(Y_ek[e][:, fronteira].toarray())
+        bloco = Y_fe[fronteira] @ X
+        linhas.append(np.repeat(fronteira, fronteira.size))
+        colunas.append(np.tile(fronteira, fronteira.size))
+        valores.append(np.asarray(bloco).ravel())
+    if valores:
+        n = len(manter)
+        preenchimento = sp.coo_matrix((np.concatenate(valores), (np.concatenate(linhas), np.concatenate(colunas))),
+                                      shape=(n, n))
+        reduzida = reduzida - preenchimento
+    return sp.csr_matrix(reduzida)
+
+
+class ReducaoKron:
+    """Eliminação de barras da Ybus por complemento de Schur (redução de Kron)
+
+    Ybus    -> matriz de admitância (esparsa ou densa, por exemplo a 2x2 de
+               calcular_matriz_admitancia/matrix_calc)
+    manter  -> barras mantidas; as demais são eliminadas
+    Y_reduzida relaciona as correntes e tensões das barras mantidas quando
+    as eliminadas não têm injeção; correntes nas eliminadas são levadas às
+    mantidas por correntes_equivalentes. A fatoração de Y_ee, usada para
+    expandir as tensões, é feita apenas no primeiro pedido.
+    """
+
+    def __init__(self, Ybus, manter):
+        Y = sp.csr_matrix(np.asarray(Ybus) if isinstance(Ybus, list) else Ybus, dtype=complex)
+        n = Y.shape[0]
+        self.manter = np.unique(np.asarray(manter, dtype=np.intp))
+        self.eliminar = np.setdiff1d(np.arange(n), self.manter)
+        self.n_barras = n
+        self.Y_ek = Y[self.eliminar][:, self.manter].tocsr()
+        self.Y_ke = Y[self.manter][:, self.eliminar].tocsr()
+        self.Y_ee = Y[self.eliminar][:, self.eliminar].tocsc()
+        self.Y_reduzida = complemento_schur(Y, self.manter, self.eliminar)
+        self._lu = None
+
+    @property
+    def lu(self):
+        if self._lu is None:
+            self._lu = splu(self.Y_ee)
+        return self._lu
+
+    def correntes_equivalentes(self, I_eliminadas):
+        """-Y_ke Y_ee⁻¹ I_e: injeções nas barras mantidas equivalentes às correntes nas eliminadas"""
+        return -(self.Y_ke @ self.lu.solve(np.asarray(I_eliminadas, dtype=complex)))
+
+    def expandir(self, V_mantidas, I_eliminadas=None):
+        """Tensões de todas as barras: V_e = Y_ee⁻¹ (I_e - Y_ek V_k)"""
+        V = np.zeros(self.n_barras, dtype=complex)
+        V[self.manter] = V_mantidas
+        if self.eliminar.size:
+            b = -(self.Y_ek @ V[self.manter])
+            if I_eliminadas is not None:
+                b = b + I_eliminadas
+            V[self.eliminar] = self.lu.solve(b)
+        return V
+
+    def memoria(self):
+        """Bytes da Ybus reduzida, dos blocos guardados e da fatoração de Y_ee (se feita)"""
+        total = sum(M.data.nbytes + M.indices.nbytes + M.indptr.nbytes
+                    for M in (self.Y_reduzida, self.Y_ek, self.Y_ke, self.Y_ee))
+        if self._lu is not None:
+            total += memoria_lu(self._lu)
+        return total
+
+
+class ModeloReduzido:
+    """Fluxo de carga repetido sobre uma rede reduzida
+
+    reducao -> ReducaoKron da rede (original ou aumentada com barras fictícias)
+    ref, pv -> barras de referência e PV da rede original; as que não forem
+               mantidas deixam de existir no modelo
+    S_fixo  -> injeção somada às das barras mantidas (equivalentes e barras
+               fictícias), na ordem de reducao.manter
+    V_fixo  -> tensão inicial das barras fictícias (índices >= n_original)
+    pv_ficticias -> barras fictícias que mantêm o módulo da tensão
+    I_eliminadas -> correntes constantes nas barras eliminadas, usadas ao expandir
+    A Ybus reduzida, o padrão do Jacobiano e sua ordenação de colunas são
+    preparados uma vez e reaproveitados em todos os cenários.
+    """
+
+    def __init__(self, reducao, n_original, ref, pv, S_fixo=None, V_fixo=None, pv_ficticias=(),
+                 I_eliminadas=None, verificar_eliminadas=False):
+        self.reducao = reducao
+        self.n_original = n_original
+        manter = reducao.manter
+        self.reais = manter[manter < n_original]
+        posicao = np.full(reducao.n_barras, -1, dtype=np.intp)
+        posicao[manter] = np.arange(manter.size)
+        ref = posicao[np.asarray(ref, dtype=np.intp)]
+        if ref.size == 0 or np.any(ref < 0):
+            raise ValueError("A barra de referência deve ser mantida no modelo reduzido")
+        pv = posicao[np.concatenate((np.asarray(pv, dtype=np.intp), np.asarray(pv_ficticias, dtype=np.intp)))]
+        self.ref = ref
+        self.pv = np.sort(pv[pv >= 0])
+        self.pq = np.setdiff1d(np.arange(manter.size), np.concatenate((self.ref, self.pv)))
+        self.S_fixo = np.zeros(manter.size, dtype=complex) if S_fixo is None else np.asarray(S_fixo, dtype=complex)
+        self.V_fixo = V_fixo
+        self.I_eliminadas = I_eliminadas
+        self.verificar_eliminadas = verificar_eliminadas
+
+        self.Ybus = reducao.Y_reduzida
+        self.fatoracao = FatoracaoReutilizavel()
+        self.nucleo = NucleoNewton(self.Ybus, self.pv, self.pq)
+
+    def _completar(self, x, preenchimento):
+        """Vetor da rede original estendido às barras fictícias e restrito às mantidas"""
+        x = np.asarray(x, dtype=complex)
+        if self.reducao.n_barras > self.n_original:
+            x = np.concatenate((x, preenchimento))
+        return x[self.reducao.manter]
+
+    def resolver(self, S_esp, V0, **opcoes):
+        """Newton-Raphson no modelo reduzido; S_esp e V0 na numeração da rede original
+
+        Retorna (V das barras mantidas, convergiu, iteracoes), na ordem de
+        reducao.manter: primeiro as da rede original (reais), depois as
+        fictícias. expandir(V) dá as tensões de todas as barras.
+        """
+        S_esp = np.asarray(S_esp, dtype=complex)
+        if self.verificar_eliminadas and np.any(S_esp[self.reducao.eliminar] != 0):
+            raise ValueError("Injeção não nula em barra eliminada: a redução não vale para este cenário")
+        n_ficticias = self.reducao.n_barras - self.n_original
+        S_red = self._completar(S_esp, np.zeros(n_ficticias)) + self.S_fixo
+        V0_red = self._completar(V0, self.V_fixo if self.V_fixo is not None else np.ones(n_ficticias))
+        V, convergiu, iteracoes = newton_raphson_n_barras(self.Ybus, S_red, V0_red, self.ref, self.pv, self.pq,
+                                                          fatorar=self.fatoracao.fatorar, nucleo=self.nucleo,
+                                                          **opcoes)
+        return V, convergiu, iteracoes
+
+    def expandir(self, V_mantidas):
+        """Tensões de todas as barras da rede original a partir de uma solução do modelo reduzido"""
+        return self.reducao.expandir(V_mantidas, self.I_eliminadas)[:self.n_original]
+
+    def memoria(self):
+        return self.reducao.memoria() + self.fatoracao.memoria() + self.nucleo.memoria()
+
+
+def reduzir_injecao_nula(Ybus, S_esp, ref, pv, manter=()):
+    """Modelo sem as barras PQ de injeção nula (redução de Kron exata)
+
+    manter -> barras que não devem ser eliminadas mesmo sem injeção (monitoradas)
+    As injeções dos cenários resolvidos depois devem continuar nulas nas
+    barras eliminadas; resolver verifica isso.
+    """
+    n = Ybus.shape[0]
+    S_esp = np.asarray(S_esp, dtype=complex)
+    fixas = np.concatenate((np.asarray(ref, dtype=np.intp), np.asarray(pv, dtype=np.intp),
+                            np.asarray(manter, dtype=np.intp)))
+    candidatas = np.ones(n, dtype=bool)
+    candidatas[fixas] = False
+    eliminar = np.flatnonzero(candidatas & (S_esp == 0))
+    reducao = ReducaoKron(Ybus, np.setdiff1d(np.arange(n), eliminar))
+    return ModeloReduzido(reducao, n, ref, pv, verificar_eliminadas=True)
+
+
+def _injecoes_base(Ybus, V_base, S_base):
+    V_base = np.asarray(V_base, dtype=complex)
+    if S_base is None:
+        S_base = V_base * np.conj(Ybus @ V_base)
+    return V_base, np.asarray(S_base, dtype=complex)
+
+
+def equivalente_ward(Ybus, internas, V_base, ref, pv, S_base=None):
+    """Equivalente Ward da rede externa às barras internas
+
+    V_base -> solução do caso base da rede completa
+    S_base -> injeções no caso base (por padrão calculadas de V_base)
+    As barras externas são eliminadas e suas injeções do caso base viram
+    correntes constantes, levadas às barras de fronteira e convertidas em
+    potência com as tensões do caso base. O equivalente é exato no caso
+    base; nos demais cenários as injeções externas ficam fixas.
+    """
+    V_base, S_base = _injecoes_base(Ybus, V_base, S_base)
+    reducao = ReducaoKron(Ybus, internas)
+    externas = reducao.eliminar
+    I_externas = np.conj(S_base[externas] / V_base[externas])
+    I_equivalente = reducao.correntes_equivalentes(I_externas)
+    S_equivalente = V_base[reducao.manter] * np.conj(I_equivalente)
+    return ModeloReduzido(reducao, Ybus.shape[0], ref, pv, S_fixo=S_equivalente, I_eliminadas=I_externas)
+
+
+def equivalente_rei(Ybus, internas, V_base, ref, pv, S_base=None, grupos=None, tol=1e-9):
+    """Equivalente REI (Radial, Equivalente e Independente) da rede externa
+
+    grupos -> listas de barras externas cujas injeções são agregadas; por
+              padrão, as de geração (P > 0) e as de carga
+    Cada grupo é ligado por uma rede de potência nula (GZP) a uma barra
+    fictícia REI que concentra a soma das suas injeções; as barras externas,
+    então sem injeção, são eliminadas por redução de Kron. A barra REI de um
+    grupo com barras PV também é PV. Exato no caso base; nos demais cenários
+    a barra REI mantém a injeção agregada, reagindo às tensões da fronteira.
+    """
+    V_base, S_base = _injecoes_base(Ybus, V_base, S_base)
+    n = Ybus.shape[0]
+    internas = np.unique(np.asarray(internas, dtype=np.intp))
+    externas = np.setdiff1d(np.arange(n), internas)
+    if grupos is None:
+        com_injecao = externas[np.abs(S_base[externas]) > tol]
+        geracao = S_base[com_injecao].real > 0
+        grupos = [com_injecao[geracao], com_injecao[~geracao]]
+    grupos = [np.asarray(g, dtype=np.intp) for g in grupos if len(g)]
+
+    # Rede aumentada: para o grupo j, nó da GZP em n + 2j e barra REI em n + 2j + 1
+    linhas, colunas, valores = [], [], []
+    S_rei, V_rei, pv_ficticias = [], [], []
+    pv_conjunto = set(np.asarray(pv, dtype=np.intp).tolist())
+    for j, grupo in enumerate(grupos):
+        no_gzp, rei = n + 2 * j, n + 2 * j + 1
+        I = np.conj(S_base[grupo] / V_base[grupo])
+        I_total = I.sum()
+        S_total = S_base[grupo].sum()
+        V_r = S_total / np.conj(I_total)
+        # Ramos barra-GZP com y_i (0 - V_i) = I_i e ramo GZP-REI com y_r V_r = I_total
+        y = np.concatenate((-I / V_base[grupo], [I_total / V_r]))
+        a = np.concatenate((grupo, [rei]))
+        b = np.full(a.size, no_gzp)
+        linhas += [a, b, a, b]
+        colunas += [a, b, b, a]
+        valores += [y, y, -y, -y]
+        S_rei.append(S_total)
+        V_rei.append(V_r)
+        if pv_conjunto.intersection(grupo.tolist()):
+            pv_ficticias.append(rei)
+
+    n_aumentada = n + 2 * len(grupos)
+    Y = sp.csr_matrix(Ybus, dtype=complex)
+    Y_aumentada = sp.block_diag((Y, sp.csr_matrix((n_aumentada - n, n_aumentada - n))), format="csr")
+    if valores:
+        Y_aumentada = Y_aumentada + sp.csr_matrix((np.concatenate(valores), (np.concatenate(linhas),
+                                                                              np.concatenate(colunas))),
+                                                  shape=(n_aumentada, n_aumentada))
+
+    barras_rei = n + 2 * np.arange(len(grupos)) + 1
+    reducao = ReducaoKron(Y_aumentada, np.concatenate((internas, barras_rei)))
+    S_fixo = np.zeros(reducao.manter.size, dtype=complex)
+    S_fixo[internas.size:] = S_rei
+    V_fixo = np.zeros(n_aumentada - n, dtype=complex)
+    V_fixo[1::2] = V_rei
+    return ModeloReduzido(reducao, n, ref, pv, S_fixo=S_fixo, V_fixo=V_fixo, pv_ficticias=pv_ficticias)
+
+
+if __name__ == "__main__":
+    from Casos_de_Teste import rede_malhada_sintetica
+    from Método_de_Newton import calcular_matriz_admitancia
+    from Números_Complexos import converter_complexo
+
+    print("=== Redução de Kron e Equivalentes de Rede ===")
+
+    print("\nRecomendação para teste: Z_linha = 0.02+0.06j, Z_shunt = -33.3j\n")
+    z_linha = converter_complexo(input("Impedância série da linha: ") or "0.02+0.06j")
+    z_shunt = converter_complexo(input("Impedância shunt de cada barra: ") or "-33.3j")
+    n_barras = int(input("Número de barras da rede sintética (ex: 20000): ") or "20000")
+    fracao_nula = float(input("Fração de barras sem carga (ex: 0.3): ") or "0.3")
+    fracao_interna = float(input("Fração de barras da área interna (ex: 0.1): ") or "0.1")
+    n_cenarios = int(input("Número de cenários de carga (ex: 10): ") or "10")
+
+    # Admitância vista da barra 2 com a barra 1 eliminada
+    Y = calcular_matriz_admitancia(z_linha, z_shunt)
+    reducao = ReducaoKron(Y, [1])
+    print(f"\nAdmitância equivalente na barra 2 (barra 1 eliminada): {reducao.Y_reduzida[0, 0]:.4f}")
+
+    sistema = rede_malhada_sintetica(n_barras)
+    S_esp, V0, ref, pv, pq = sistema.dados_fluxo()
+    rng = np.random.default_rng(0)
+    S_esp[pq[rng.random(pq.size) < fracao_nula]] = 0
+    Ybus = sistema.matriz_admitancia()
+    tol = 1e-9  # cargas de ~1e-5 pu por barra: tolerância abaixo delas
+    cenarios = [0.8 + 0.4 * rng.random() for _ in range(n_cenarios)]
+
+    # Solução completa de cada cenário (referência)
+    inicio = time.perf_counter()
+    completas = [newton_raphson_n_barras(Ybus, S_esp * escala, V0, ref, pv, pq, tol)[0] for escala in cenarios]
+    t_completo = (time.perf_counter() - inicio) / n_cenarios
+
+    inicio = time.perf_counter()
+    modelo = reduzir_injecao_nula(Ybus, S_esp, ref, pv)
+    t_reducao = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    erro = 0.0
+    for escala, V_completa in zip(cenarios, completas):
+        V_red, convergiu, _ = modelo.resolver(S_esp * escala, V0, tol=tol)
+        erro = max(erro, np.max(np.abs(modelo.expandir(V_red) - V_completa)))
+    t_reduzido = (time.perf_counter() - inicio) / n_cenarios
+
+    print(f"\n=== Barras de injeção nula eliminadas ({sistema.nome}) ===")
+    print(f"Barras: {n_barras} -> {modelo.reais.size}; Ybus: {Ybus.nnz} -> {modelo.Ybus.nnz} não nulos "
+          f"(redução em {t_reducao * 1e3:.2f} ms)")
+    print(f"Por cenário: completo {t_completo * 1e3:.2f} ms, reduzido e expandido {t_reduzido * 1e3:.2f} ms")
+    print(f"Maior diferença nas tensões expandidas: {erro:.2e} pu")
+
+    # Área interna: barras mais próximas da referência
+    grafo = sp.csr_matrix(abs(Ybus) > 0)
+    internas = breadth_first_order(grafo, ref[0], directed=False, return_predecessors=False)
+    internas = np.sort(internas[:int(fracao_interna * n_barras)])
+    V_base = completas[0]
+
+    print(f"\n=== Equivalentes externos (área interna com {internas.size} barras) ===")
+    for nome, construir in (("Ward", equivalente_ward), ("REI", equivalente_rei)):
+        inicio = time.perf_counter()
+        modelo = construir(Ybus, internas, V_base, ref, pv)
+        t_equivalente = time.perf_counter() - inicio
+
+        # Cenários: só a carga interna varia em relação ao caso base
+        erros = []
+        for escala in cenarios:
+            S_cenario = S_esp * cenarios[0]
+            S_cenario[internas] = S_esp[internas] * escala
+            V_red, convergiu, _ = modelo.resolver(S_cenario, V0, tol=tol)
+            V_completa, _, _ = newton_raphson_n_barras(Ybus, S_cenario, V0, ref, pv, pq, tol)
+            erros.append(np.max(np.abs(V_red[:modelo.reais.size] - V_completa[modelo.reais])))
+
+        print(f"{nome}: {modelo.Ybus.shape[0]} barras, {modelo.Ybus.nnz} não nulos, montado em "
+              f"{t_equivalente * 1e3:.2f} ms; erro no caso base {erros[0]:.2e} pu, "
+              f"máximo nos cenários {max(erros):.2e} pu")
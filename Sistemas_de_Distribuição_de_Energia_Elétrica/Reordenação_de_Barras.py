@@ -0,0 +1,200 @@
+import heapq
+import time
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+from scipy.sparse.linalg import splu
+
+from Fatoração_Esparsa import FatoracaoOrdenada
+
+METODOS = ("natural", "rcm", "amd", "tinney1", "tinney2")
+
+
+def grafo_barras(Ybus):
+    """Padrão simétrico das ligações entre barras (CSR booleana, sem a diagonal)"""
+    A = sp.csr_matrix(Ybus)
+    A = (abs(A) + abs(A).T).tocsr()
+    A.setdiag(0)
+    A.eliminate_zeros()
+    A.data[:] = 1
+    return A.astype(bool)
+
+
+def tinney_1(grafo):
+    """Tinney 1: barras em ordem crescente do número de ligações, calculado uma vez"""
+    grau = np.diff(grafo.indptr)
+    return np.argsort(grau, kind="stable")
+
+
+def tinney_2(grafo):
+    """Tinney 2 (grau mínimo): elimina a barra de menor grau no grafo atualizado
+
+    Ao eliminar uma barra, seus vizinhos passam a ser ligados entre si
+    (preenchimento) e seus graus são atualizados. Entradas desatualizadas
+    do heap são descartadas ao serem retiradas.
+    """
+    n = grafo.shape[0]
+    vizinhos = [set(grafo.indices[grafo.indptr[i]:grafo.indptr[i + 1]].tolist()) for i in range(n)]
+    heap = [(len(v), i) for i, v in enumerate(vizinhos)]
+    heapq.heapify(heap)
+    eliminada = np.zeros(n, dtype=bool)
+    ordem = []
+
+    while heap:
+        grau, i = heapq.heappop(heap)
+        if eliminada[i] or grau != len(vizinhos[i]):
+            continue
+        eliminada[i] = True
+        ordem.append(i)
+        adjacentes = vizinhos[i]
+        for j in adjacentes:
+            vizinhos[j].discard(i)
+            vizinhos[j] |= adjacentes - {j}
+            heapq.heappush(heap, (len(vizinhos[j]), j))
+        vizinhos[i] = None
+    return np.array(ordem, dtype=np.intp)
+
+
+def grau_minimo_superlu(grafo):
+    """Grau mínimo aproximado do SuperLU (MMD sobre A + Aᵀ) aplicado ao grafo das barras"""
+    n = grafo.shape[0]
+    # Matriz de diagonal dominante com o padrão do grafo: a fatoração não pivoteia
+    A = sp.csc_matrix(-grafo.astype(float) + sp.diags(np.diff(grafo.indptr) + 1.0))
+    lu = splu(A, permc_spec="MMD_AT_PLUS_A", diag_pivot_thresh=0.0)
+    return np.argsort(lu.perm_c)[:n]
+
+
+def ordenar_barras(Ybus, metodo="amd"):
+    """Ordem de eliminação das barras (ordem[k] é a k-ésima barra eliminada)
+
+    metodo -> "natural", "rcm" (Cuthill-McKee reverso, menor banda), "amd"
+              (grau mínimo do SuperLU), "tinney1" ou "tinney2"
+    """
+    grafo = grafo_barras(Ybus)
+    metodo = metodo.lower()
+    if metodo == "natural":
+        return np.arange(grafo.shape[0])
+    if metodo == "rcm":
+        return reverse_cuthill_mckee(grafo, symmetric_mode=True).astype(np.intp)
+    if metodo == "amd":
+        return grau_minimo_superlu(grafo)
+    if metodo == "tinney1":
+        return tinney_1(grafo)
+    if metodo == "tinney2":
+        return tinney_2(grafo)
+    raise ValueError(f"Método de ordenação desconhecido: {metodo}")
+
+
+def ordem_reduzida(ordem_barras, barras):
+    """Ordem das linhas de uma matriz reduzida às barras dadas (B' ou B''), seguindo ordem_barras"""
+    posicao = np.full(len(ordem_barras), -1, dtype=np.intp)
+    posicao[np.asarray(barras, dtype=np.intp)] = np.arange(len(barras))
+    pos = posicao[ordem_barras]
+    return pos[pos >= 0]
+
+
+def ordem_jacobiano(ordem_barras, pv, pq):
+    """Ordem das variáveis do Jacobiano polar [θ(pv+pq), V(pq)]: θ e V de cada barra lado a lado"""
+    pv = np.asarray(pv, dtype=np.intp)
+    pq = np.asarray(pq, dtype=np.intp)
+    n = len(ordem_barras)
+    n_pvpq = pv.size + pq.size
+    pos_angulo = np.full(n, -1, dtype=np.intp)
+    pos_angulo[np.concatenate((pv, pq))] = np.arange(n_pvpq)
+    pos_modulo = np.full(n, -1, dtype=np.intp)
+    pos_modulo[pq] = n_pvpq + np.arange(pq.size)
+    pares = np.column_stack((pos_angulo[ordem_barras], pos_modulo[ordem_barras])).ravel()
+    return pares[pares >= 0]
+
+
+def estatisticas_fatoracao(A, ordem=None, repeticoes=3):
+    """Não nulos, preenchimento, tempo e memória da fatoração LU de A
+
+    ordem -> ordem simétrica de eliminação; None usa o COLAMD do SuperLU
+    O tempo é o menor de repeticoes fatorações (sem a permutação de A). A
+    memória conta os não nulos de L e U, sem o preenchimento dos supernós.
+    """
+    A = sp.csc_matrix(A)
+    if ordem is not None:
+        fatoracao = FatoracaoOrdenada(ordem)
+        A_ordenada = A.tocsr()[fatoracao.ordem][:, fatoracao.ordem].tocsc()
+    tempo = np.inf
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        if ordem is None:
+            lu = splu(A)
+        else:
+            lu = splu(A_ordenada, permc_spec="NATURAL", diag_pivot_thresh=fatoracao.limiar_pivo,
+                      options={"SymmetricMode": True})
+        tempo = min(tempo, time.perf_counter() - inicio)
+    nnz_fatores = lu.L.nnz + lu.U.nnz - A.shape[0]
+    return {"nnz_matriz": A.nnz, "nnz_fatores": nnz_fatores, "preenchimento": nnz_fatores - A.nnz,
+            "tempo_fatoracao_s": tempo,
+            "memoria_bytes": nnz_fatores * (np.dtype(float).itemsize + np.dtype(np.int32).itemsize)}
+
+
+def comparar_ordenacoes(Ybus, V, pv, pq, metodos=METODOS, matriz="jacobiano", repeticoes=3):
+    """Estatísticas de fatoração do Jacobiano (em V) ou de B' para cada ordenação das barras
+
+    Para B' é usada -Im(Ybus) reduzida às barras PV e PQ, que tem o mesmo
+    padrão de esparsidade. Inclui a linha "colamd", a ordenação padrão do
+    SuperLU usada sem reordenação.
+    """
+    from Método_de_Newton_N_Barras import calcular_jacobiano
+
+    pv = np.asarray(pv, dtype=np.intp)
+    pq = np.asarray(pq, dtype=np.intp)
+    pvpq = np.concatenate((pv, pq))
+    if matriz == "jacobiano":
+        A = calcular_jacobiano(Ybus, V, pvpq, pq)
+    else:
+        A = -sp.csr_matrix(Ybus).imag[pvpq][:, pvpq]
+
+    resultados = [dict(metodo="colamd", tempo_ordenacao_s=0.0, **estatisticas_fatoracao(A, None, repeticoes))]
+    for metodo in metodos:
+        inicio = time.perf_counter()
+        ordem = ordenar_barras(Ybus, metodo)
+        tempo_ordenacao = time.perf_counter() - inicio
+        ordem_var = ordem_jacobiano(ordem, pv, pq) if matriz == "jacobiano" else ordem_reduzida(ordem, pvpq)
+        resultados.append(dict(metodo=metodo, tempo_ordenacao_s=tempo_ordenacao,
+                               **estatisticas_fatoracao(A, ordem_var, repeticoes)))
+    return resultados
+
+
+if __name__ == "__main__":
+    from Casos_de_Teste import caso_padrao, rede_malhada_sintetica
+    from Cache_de_Topologia import CacheTopologia
+
+    print("=== Reordenação de Barras para Fatoração Esparsa ===")
+
+    n_barras = int(input("\nNúmero de barras da rede sintética (ex: 20000): ") or "20000")
+    metodo_cache = input("Ordenação usada no fluxo de carga (natural/rcm/amd/tinney1/tinney2): ") or "tinney2"
+
+    for sistema in (caso_padrao("ieee14"), rede_malhada_sintetica(n_barras)):
+        S_esp, V0, ref, pv, pq = sistema.dados_fluxo()
+        Ybus = sistema.matriz_admitancia()
+        # Sem reordenação, a fatoração de redes grandes tem preenchimento quase denso
+        metodos = METODOS if sistema.n_barras <= 2000 else METODOS[1:]
+        for matriz, titulo in (("jacobiano", "Jacobiano"), ("b_linha", "B'")):
+            print(f"\n=== {sistema.nome}: {titulo} ===")
+            print(f"{'Método':<9}{'nnz(A)':>10}{'nnz(L+U)':>11}{'Preench.':>10}{'Ordenação':>12}"
+                  f"{'Fatoração':>12}{'Memória':>11}")
+            for r in comparar_ordenacoes(Ybus, V0, pv, pq, metodos, matriz):
+                print(f"{r['metodo']:<9}{r['nnz_matriz']:>10}{r['nnz_fatores']:>11}{r['preenchimento']:>10}"
+                      f"{r['tempo_ordenacao_s'] * 1e3:>9.2f} ms{r['tempo_fatoracao_s'] * 1e3:>9.2f} ms"
+                      f"{r['memoria_bytes'] / 2 ** 10:>7.0f} KiB")
+
+    # Fluxo de carga com a ordenação guardada junto da topologia
+    cache = CacheTopologia()
+    rede = cache.obter_sistema(sistema, ordenacao=metodo_cache)
+    rede_padrao = cache.obter_sistema(sistema)
+    V, convergiu, iteracoes = rede.newton(S_esp, V0, tol=1e-9)
+    V_padrao, _, _ = rede_padrao.newton(S_esp, V0, tol=1e-9)
+    V_dr, convergiu_dr, iteracoes_dr = rede.desacoplado(S_esp, V0, tol=1e-9)
+
+    print(f"\n=== Fluxo de carga com ordenação {metodo_cache} ({sistema.nome}) ===")
+    print(f"Newton: convergiu {convergiu} em {iteracoes} iterações; "
+          f"diferença para a ordenação padrão: {np.max(np.abs(V - V_padrao)):.2e} pu")
+    print(f"Desacoplado rápido: convergiu {convergiu_dr} em {iteracoes_dr} iterações; "
+          f"diferença: {np.max(np.abs(V_dr - V_padrao)):.2e} pu")
+    print(f"Tensão mínima: {np.abs(V).min():.6f} pu na barra {sistema.numeros[np.argmin(np.abs(V))]}")
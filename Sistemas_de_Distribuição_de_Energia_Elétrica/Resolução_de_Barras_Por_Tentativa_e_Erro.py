@@ -1,6 +1,10 @@
 import cmath
 import math
-from matplotlib import pyplot as plt
+import numpy as np
+
+from Armazenamento_de_Resultados import GravadorColunar, LeitorColunar
+from Números_Complexos import converter_complexo
+from Rastreamento import rastreador_interativo
 
 # Função para converter um número complexo para a forma fasorial (magnitude < ângulo)
 def to_phasor(complex_num):
@@ -10,19 +14,7 @@ def to_phasor(complex_num):
 
 # Função para aceitar números complexos na forma retangular ou fasorial
 def input_complex(prompt):
-    value = input(prompt)
-    try:
-        # Tenta converter para número complexo na forma retangular
-        return complex(value)
-    except ValueError:
-        # Se falhar, tenta converter da forma fasorial (magnitude < ângulo)
-        magnitude, angle = map(float, value.split('<'))
-        return cmath.rect(magnitude, math.radians(angle))
-
-# Passo 1: insira os valores oriundos do sistema
-v2 = input_complex("Insira um valor para V2 (na forma retangular a+bj ou fasorial magnitude<ângulo): ")
-s2 = input_complex("Insira o valor estipulado da tensão em s2 (na forma retangular a+bj ou fasorial magnitude<ângulo): ")
-z12 = input_complex("Insira o valor da impedância de linha do sistema, por favor: ")
+    return converter_complexo(input(prompt))
 
 # Passo 2: Cálculo de corrente
 def current_calc(s2, v2):
@@ -40,61 +32,104 @@ def display_result(complex_num, label):
     magnitude, angle = to_phasor(complex_num)
     print(f"{label} (Fasorial): {magnitude:.4f} < {angle:.4f}°\n")
 
-# Configuração do método iterativo
-tolerance = 1e-4  # Tolerância para convergência (precisão de 4 casas decimais)
-max_iterations = 100  # Número máximo de iterações para evitar loops infinitos
-iteration = 0  # Contador de iterações
-converged = False  # Flag para verificar se houve convergência
+# Método iterativo de tentativa e erro
+def tentativa_e_erro(v2, s2, z12, tolerance=1e-4, max_iterations=100, rastreador=None):
+    if rastreador is None:
+        rastreador = rastreador_interativo()
 
-# Valores iniciais
-I_prev = 0  # Valor inicial da corrente (pode ser qualquer valor)
-V_prev = 0  # Valor inicial da tensão (pode ser qualquer valor)
+    iteration = 0  # Contador de iterações
+    converged = False  # Flag para verificar se houve convergência
 
-# Listas para armazenar os valores de corrente e tensão
-current_values = []
-voltage_values = []
+    # Valores iniciais
+    I_prev = 0  # Valor inicial da corrente (pode ser qualquer valor)
+    V_prev = 0  # Valor inicial da tensão (pode ser qualquer valor)
 
-while not converged and iteration < max_iterations:
-    iteration += 1
-    print(f"\nIteração {iteration}:")
+    # Arrays pré-alocados para os valores de corrente e tensão
+    current_values = np.empty(max_iterations, dtype=complex)
+    voltage_values = np.empty(max_iterations, dtype=complex)
 
-    # Calcula a corrente
-    I = current_calc(s2, v2)
+    while not converged and iteration < max_iterations:
+        iteration += 1
+        if rastreador.eco_iteracao:
+            print(f"\nIteração {iteration}:")
 
-    # Calcula a tensão na barra de carga
-    V = charge_bar_calc(v2, z12, I)
+        # Calcula a corrente
+        I = current_calc(s2, v2)
 
-    # Armazena os valores de corrente e tensão nas listas
-    current_values.append(I)
-    voltage_values.append(V)
+        # Calcula a tensão na barra de carga
+        V = charge_bar_calc(v2, z12, I)
 
-    # Exibe os resultados
-    display_result(I, "Corrente I")
-    display_result(V, "Tensão V1")
+        # Armazena os valores de corrente e tensão
+        current_values[iteration - 1] = I
+        voltage_values[iteration - 1] = V
 
-    # Verifica a convergência (diferença entre valores consecutivos)
-    if abs(I - I_prev) < tolerance and abs(V - V_prev) < tolerance:
-        converged = True
-        print("Convergência alcançada!")
-    else:
-        # Atualiza os valores anteriores para a próxima iteração
-        I_prev = I
-        V_prev = V
-        # Atualiza v2 para o novo valor de tensão calculado
-        v2 = V
+        # Exibe os resultados
+        if rastreador.por_iteracao:
+            rastreador.registrar(iteration, max(abs(I - I_prev), abs(V - V_prev)), abs(V - v2))
+            if rastreador.eco_iteracao:
+                display_result(I, "Corrente I")
+                display_result(V, "Tensão V1")
+
+        # Verifica a convergência (diferença entre valores consecutivos)
+        if abs(I - I_prev) < tolerance and abs(V - V_prev) < tolerance:
+            converged = True
+            if rastreador.eco_resumo:
+                print("Convergência alcançada!")
+        else:
+            # Atualiza os valores anteriores para a próxima iteração
+            I_prev = I
+            V_prev = V
+            # Atualiza v2 para o novo valor de tensão calculado
+            v2 = V
 
-# Passo 5: Salva os valores de corrente e tensão em um arquivo .txt
-with open("resultados.txt", "w") as file:
-    file.write("Corrente (I)\tTensão (V)\n")  # Cabeçalho
-    for I, V in zip(current_values, voltage_values):
-        file.write(f"{I}\t{V}\n")
+    rastreador.finalizar(converged, iteration)
+    return current_values[:iteration], voltage_values[:iteration], converged
 
-print("Resultados salvos em 'resultados.txt'.")
 
 # Plotagem dos fasores da corrente e da tensão na barra de carga
-plt.figure()
-plt.polar([0, cmath.phase(I)], [0, abs(I)], marker='o', label='Corrente I')
-plt.polar([0, cmath.phase(V)], [0, abs(V)], marker='o', label='Tensão V1')
-plt.title('Fasores da Corrente e Tensão na Barra de Carga')
-plt.legend()
-plt.show()
\ No newline at end of file
+def plotar_fasores(I, V, arquivo=None):
+    """Mostra os fasores em uma janela ou, com arquivo, grava a figura sem abrir janela"""
+    import matplotlib
+    if arquivo is not None:
+        matplotlib.use("Agg")
+    from matplotlib import pyplot as plt
+
+    plt.figure()
+    plt.polar([0, cmath.phase(I)], [0, abs(I)], marker='o', label='Corrente I')
+    plt.polar([0, cmath.phase(V)], [0, abs(V)], marker='o', label='Tensão V1')
+    plt.title('Fasores da Corrente e Tensão na Barra de Carga')
+    plt.legend()
+    if arquivo is None:
+        plt.show()
+    else:
+        plt.savefig(arquivo)
+        plt.close()
+
+
+if __name__ == "__main__":
+    # Passo 1: insira os valores oriundos do sistema
+    v2 = input_complex("Insira um valor para V2 (na forma retangular a+bj ou fasorial magnitude<ângulo): ")
+    s2 = input_complex("Insira o valor estipulado da tensão em s2 (na forma retangular a+bj ou fasorial magnitude<ângulo): ")
+    z12 = input_complex("Insira o valor da impedância de linha do sistema, por favor: ")
+
+    # Configuração do método iterativo
+    tolerance = 1e-4  # Tolerância para convergência (precisão de 4 casas decimais)
+    max_iterations = 100  # Número máximo de iterações para evitar loops infinitos
+
+    current_values, voltage_values, converged = tentativa_e_erro(v2, s2, z12, tolerance, max_iterations)
+    I = current_values[-1]
+    V = voltage_values[-1]
+
+    # Passo 5: Salva os valores de corrente e tensão em formato colunar binário
+    with GravadorColunar("resultados", 2, colunas=["Corrente (I)", "Tensão (V)"]) as gravador:
+        gravador.adicionar(np.column_stack((current_values, voltage_values)))
+
+    print("Resultados salvos em 'resultados/'.")
+
+    # Exportação opcional em texto, no formato do arquivo original
+    if (input("Exportar também para 'resultados.txt'? (s/N): ") or "n").strip().lower().startswith("s"):
+        LeitorColunar("resultados").exportar_texto("resultados.txt")
+        print("Resultados exportados para 'resultados.txt'.")
+
+    # Plotagem dos fasores da corrente e da tensão na barra de carga
+    plotar_fasores(I, V)
\ No newline at end of file
@@ -0,0 +1,239 @@
+import time
+import numpy as np
+from scipy.sparse.linalg import splu
+
+from Método_de_Newton_Desacoplado_Rápido import matrizes_b
+from Método_de_Newton_N_Barras import calcular_jacobiano, tipos_de_barra
+
+
+class FatoresDistribuicao:
+    """PTDF e LODF do modelo linearizado B' θ = P, com B' fatorada uma única vez
+
+    PTDF[l, k] é a variação do fluxo ativo no ramo l por unidade injetada na
+    barra k (retirada na referência); LODF[l, m] é a variação do fluxo no
+    ramo l por unidade de fluxo que passava no ramo m antes da sua saída.
+    As matrizes nunca são montadas inteiras: cada linha da PTDF custa uma
+    substituição com B'ᵀ e cada coluna da LODF uma com B', e ambas ficam
+    guardadas para as consultas seguintes.
+    """
+
+    def __init__(self, n_barras, de, para, z_serie, ref=(0,), versao="XB"):
+        self.n_barras = n_barras
+        self.de = np.asarray(de, dtype=np.intp)
+        self.para = np.asarray(para, dtype=np.intp)
+        z_serie = np.asarray(z_serie, dtype=complex)
+
+        # Susceptância de cada ramo com as mesmas aproximações de B'
+        z_b_linha = 1j * z_serie.imag if versao == "XB" else z_serie
+        self.b = -(1 / z_b_linha).imag
+        B_linha, _ = matrizes_b(n_barras, self.de, self.para, z_serie, versao=versao)
+        self.nao_ref = tipos_de_barra(n_barras, np.asarray(ref, dtype=np.intp), [])
+        self.lu = splu(B_linha[self.nao_ref][:, self.nao_ref].tocsc())
+
+        self.linhas_ptdf = {}
+        self.colunas_lodf = {}
+
+    def angulos(self, P):
+        """Ângulos (θ_ref = 0) para injeções P de forma (n_barras,) ou (n_barras, k)"""
+        P = np.asarray(P, dtype=float)
+        theta = np.zeros(P.shape)
+        theta[self.nao_ref] = self.lu.solve(np.ascontiguousarray(P[self.nao_ref]))
+        return theta
+
+    def fluxos(self, P):
+        """Fluxos ativos do modelo linearizado para injeções P (uma substituição para todos os ramos)"""
+        theta = self.angulos(P)
+        b = self.b if theta.ndim == 1 else self.b[:, None]
+        return b * (theta[self.de] - theta[self.para])
+
+    def ptdf(self, ramos):
+        """Linhas da PTDF dos ramos pedidos, forma (len(ramos), n_barras)"""
+        ramos = np.atleast_1d(np.asarray(ramos, dtype=np.intp))
+        faltam = np.array([r for r in np.unique(ramos) if r not in self.linhas_ptdf], dtype=np.intp)
+        if faltam.size:
+            # Linha l = b_l (e_de - e_para)ᵀ B'⁻¹, obtida de B'ᵀ y = b_l (e_de - e_para)
+            colunas = np.arange(faltam.size)
+            E = np.zeros((self.n_barras, faltam.size))
+            E[self.de[faltam], colunas] = self.b[faltam]
+            E[self.para[faltam], colunas] = -self.b[faltam]
+            Y = np.zeros((self.n_barras, faltam.size))
+            Y[self.nao_ref] = self.lu.solve(np.ascontiguousarray(E[self.nao_ref]), trans="T")
+            for i, ramo in enumerate(faltam):
+                self.linhas_ptdf[ramo] = Y[:, i]
+        return np.array([self.linhas_ptdf[r] for r in ramos])
+
+    def lodf(self, saidas):
+        """Colunas da LODF dos ramos que saem, forma (n_ramos, len(saidas))
+
+        Ramos cuja saída ilha a rede (PTDF própria igual a 1) têm coluna nan.
+        """
+        saidas = np.atleast_1d(np.asarray(saidas, dtype=np.intp))
+        faltam = np.array([m for m in np.unique(saidas) if m not in self.colunas_lodf], dtype=np.intp)
+        if faltam.size:
+            # Transferência de uma unidade de 'de' para 'para' de cada ramo que sai
+            colunas = np.arange(faltam.size)
+            P = np.zeros((self.n_barras, faltam.size))
+            P[self.de[faltam], colunas] = 1.0
+            P[self.para[faltam], colunas] = -1.0
+            F = self.fluxos(P)
+            for i, m in enumerate(faltam):
+                denominador = 1.0 - F[m, i]
+                if abs(denominador) < 1e-9:
+                    coluna = np.full(self.de.size, np.nan)
+                else:
+                    coluna = F[:, i] / denominador
+                    coluna[m] = -1.0
+                self.colunas_lodf[m] = coluna
+        return np.column_stack([self.colunas_lodf[m] for m in saidas])
+
+    def fluxos_incrementais(self, delta_P, ramos=None):
+        """Variação dos fluxos para a variação de injeções delta_P
+
+        Com ramos, usa as linhas guardadas da PTDF (produto matriz-vetor);
+        sem ramos, resolve uma substituição e retorna todos os ramos.
+        """
+        if ramos is None:
+            return self.fluxos(delta_P)
+        return self.ptdf(ramos) @ np.asarray(delta_P, dtype=float)
+
+    def fluxos_pos_contingencia(self, F_base, saida):
+        """Fluxos ativos estimados após a saída de um ramo, dados os fluxos do caso base"""
+        F_base = np.asarray(F_base, dtype=float)
+        return F_base + self.lodf(saida)[:, 0] * F_base[saida]
+
+
+class SensibilidadesTensao:
+    """dθ/dP, dV/dP e dV/dQ a partir do Jacobiano do caso base convergido
+
+    O Jacobiano é fatorado uma vez. Uma variação de injeções custa uma
+    substituição; as linhas de dV/dP e dV/dQ de barras monitoradas custam
+    uma substituição transposta cada e ficam guardadas, de modo que as
+    consultas seguintes para essas barras são produtos matriz-vetor.
+    """
+
+    def __init__(self, Ybus, V, ref, pv, pq):
+        self.V = np.asarray(V, dtype=complex)
+        self.n_barras = self.V.size
+        self.pv = np.asarray(pv, dtype=np.intp)
+        self.pq = np.asarray(pq, dtype=np.intp)
+        self.pvpq = np.concatenate((self.pv, self.pq))
+        self.n_pvpq = self.pvpq.size
+        self.lu = splu(calcular_jacobiano(Ybus, self.V, self.pvpq, self.pq))
+
+        # Posição de cada barra nas linhas/colunas de Vm do Jacobiano (-1 fora das PQ)
+        self.posicao_pq = np.full(self.n_barras, -1, dtype=np.intp)
+        self.posicao_pq[self.pq] = self.n_pvpq + np.arange(self.pq.size)
+        self.linhas = {}
+
+    def variacao(self, delta_P, delta_Q=None):
+        """(ΔVa, ΔVm) em todas as barras para variações de injeção ativa e reativa (pu)"""
+        delta_P = np.asarray(delta_P, dtype=float)
+        delta_Q = np.zeros(self.n_barras) if delta_Q is None else np.asarray(delta_Q, dtype=float)
+        x = self.lu.solve(np.concatenate((delta_P[self.pvpq], delta_Q[self.pq])))
+        delta_Va = np.zeros(self.n_barras)
+        delta_Va[self.pvpq] = x[:self.n_pvpq]
+        delta_Vm = np.zeros(self.n_barras)
+        delta_Vm[self.pq] = x[self.n_pvpq:]
+        return delta_Va, delta_Vm
+
+    def dV(self, barras):
+        """Linhas (dV/dP, dV/dQ) das barras pedidas, cada uma de forma (len(barras), n_barras)
+
+        Barras PV e de referência têm tensão fixa e linhas nulas.
+        """
+        barras = np.atleast_1d(np.asarray(barras, dtype=np.intp))
+        faltam = np.array([b for b in np.unique(barras) if b not in self.linhas], dtype=np.intp)
+        faltam_pq = faltam[self.posicao_pq[faltam] >= 0]
+        for barra in faltam[self.posicao_pq[faltam] < 0]:
+            self.linhas[barra] = (np.zeros(self.n_barras), np.zeros(self.n_barras))
+        if faltam_pq.size:
+            # Linha r de J⁻¹: Jᵀ y = e_r
+            E = np.zeros((self.lu.shape[0], faltam_pq.size))
+            E[self.posicao_pq[faltam_pq], np.arange(faltam_pq.size)] = 1.0
+            Y = self.lu.solve(E, trans="T")
+            for i, barra in enumerate(faltam_pq):
+                dV_dP = np.zeros(self.n_barras)
+                dV_dP[self.pvpq] = Y[:self.n_pvpq, i]
+                dV_dQ = np.zeros(self.n_barras)
+                dV_dQ[self.pq] = Y[self.n_pvpq:, i]
+                self.linhas[barra] = (dV_dP, dV_dQ)
+        return (np.array([self.linhas[b][0] for b in barras]),
+                np.array([self.linhas[b][1] for b in barras]))
+
+    def tensoes_incrementais(self, barras, delta_P, delta_Q=None):
+        """ΔVm das barras monitoradas pelas linhas guardadas de dV/dP e dV/dQ"""
+        dV_dP, dV_dQ = self.dV(barras)
+        delta_Vm = dV_dP @ np.asarray(delta_P, dtype=float)
+        if delta_Q is not None:
+            delta_Vm += dV_dQ @ np.asarray(delta_Q, dtype=float)
+        return delta_Vm
+
+
+if __name__ == "__main__":
+    from Análise_de_Contingências import fluxos_ramos
+    from Casos_de_Teste import caso_padrao, casos_disponiveis
+    from Matriz_de_Admitância_Esparsa import montar_ybus
+    from Método_de_Newton_N_Barras import newton_raphson_n_barras
+
+    print("=== Sensibilidades: PTDF, LODF e dV/dP, dV/dQ ===")
+    print(f"Casos disponíveis: {', '.join(casos_disponiveis())}")
+
+    nome = input("\nCaso (ex: ieee14): ").strip() or "ieee14"
+    n_consultas = int(input("Número de consultas de aumento de carga (ex: 200): ") or "200")
+    sistema = caso_padrao(nome)
+
+    S_esp, V0, ref, pv, pq = sistema.dados_fluxo()
+    Ybus = sistema.matriz_admitancia()
+    de, para, z_serie, y_shunt, tap = sistema.dados_ramos()
+    V_base, _, _ = newton_raphson_n_barras(Ybus, S_esp, V0, ref, pv, pq)
+    F_base = fluxos_ramos(V_base, de, para, z_serie, y_shunt, tap)[0].real
+
+    inicio = time.perf_counter()
+    fatores = FatoresDistribuicao(sistema.n_barras, de, para, z_serie, ref)
+    tensao = SensibilidadesTensao(Ybus, V_base, ref, pv, pq)
+    t_preparo = time.perf_counter() - inicio
+
+    # Consultas: a carga de uma barra PQ cresce 10 % (P e Q)
+    rng = np.random.default_rng(0)
+    barras = rng.choice(pq, n_consultas)
+    monitorados = np.argsort(-np.abs(F_base))[:5]
+    inicio = time.perf_counter()
+    for barra in barras:
+        delta_P = np.zeros(sistema.n_barras)
+        delta_Q = np.zeros(sistema.n_barras)
+        delta_P[barra] = 0.1 * S_esp[barra].real
+        delta_Q[barra] = 0.1 * S_esp[barra].imag
+        fatores.fluxos_incrementais(delta_P, monitorados)
+        tensao.tensoes_incrementais(pq, delta_P, delta_Q)
+    t_consultas = time.perf_counter() - inicio
+
+    # Conferência da última consulta com um Newton completo
+    inicio = time.perf_counter()
+    V_novo, _, _ = newton_raphson_n_barras(Ybus, S_esp + delta_P + 1j * delta_Q, V_base, ref, pv, pq)
+    t_newton = time.perf_counter() - inicio
+    F_novo = fluxos_ramos(V_novo, de, para, z_serie, y_shunt, tap)[0].real
+    erro_fluxo = np.max(np.abs(F_base[monitorados] + fatores.fluxos_incrementais(delta_P, monitorados)
+                               - F_novo[monitorados]))
+    erro_tensao = np.max(np.abs(np.abs(V_base[pq]) + tensao.tensoes_incrementais(pq, delta_P, delta_Q)
+                                - np.abs(V_novo[pq])))
+
+    # Saída do ramo mais carregado que não ilha a rede
+    for saida in np.argsort(-np.abs(F_base)):
+        if not np.isnan(fatores.lodf(saida)[0, 0]):
+            break
+    em_servico = np.arange(de.size) != saida
+    Y_saida = montar_ybus(sistema.n_barras, de[em_servico], para[em_servico], z_serie[em_servico],
+                          y_shunt[em_servico], tap[em_servico], sistema.shunts_de_barra())
+    V_saida, _, _ = newton_raphson_n_barras(Y_saida, S_esp, V_base, ref, pv, pq)
+    F_saida = fluxos_ramos(V_saida, de[em_servico], para[em_servico], z_serie[em_servico],
+                           y_shunt[em_servico], tap[em_servico])[0].real
+    F_estimado = fatores.fluxos_pos_contingencia(F_base, saida)[em_servico]
+
+    print("\n=== Resultados Finais ===")
+    print(f"Preparação (B' e Jacobiano fatorados): {t_preparo * 1e3:.2f} ms")
+    print(f"{n_consultas} consultas: {t_consultas * 1e3:.2f} ms "
+          f"({t_consultas / n_consultas * 1e6:.1f} µs cada; um Newton completo: {t_newton * 1e3:.2f} ms)")
+    print(f"Erro da última consulta: fluxos {erro_fluxo * sistema.base_mva:.3f} MW, tensões {erro_tensao:.2e} pu")
+    print(f"Saída do ramo {int(sistema.numeros[de[saida]])}-{int(sistema.numeros[para[saida]])}: "
+          f"maior erro da LODF {np.max(np.abs(F_estimado - F_saida)) * sistema.base_mva:.2f} MW "
+          f"(maior variação real {np.max(np.abs(F_saida - F_base[em_servico])) * sistema.base_mva:.2f} MW)")
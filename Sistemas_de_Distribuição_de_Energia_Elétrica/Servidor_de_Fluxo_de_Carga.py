@@ -0,0 +1,223 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from Cache_de_Topologia import CacheTopologia
+
+
+def indice_barra(sistema, barra):
+    """Índice interno de uma barra pela numeração externa (KeyError se não existir)"""
+    numero = int(barra)
+    if not 0 <= numero < sistema.indice.size or sistema.indice[numero] < 0:
+        raise KeyError(barra)
+    return sistema.indice[numero]
+
+
+class ServidorFluxo:
+    """Redes residentes por id e execução dos pedidos em um conjunto de threads
+
+    trava_redes protege o dicionário de redes; a trava de cada id serializa
+    os pedidos que usam sua tensão de partida; a trava da RedePreparada,
+    compartilhada por ids carregados do mesmo caso, serializa as soluções.
+    """
+
+    def __init__(self, n_threads=None, orcamento_bytes=512 * 2 ** 20):
+        self.redes = {}
+        self.trava_redes = threading.Lock()
+        self.cache = CacheTopologia(orcamento_bytes)
+        self.trava_cache = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=n_threads or os.cpu_count())
+        self.pedidos = 0
+        self.carregamentos = {}
+
+    # Operações (executadas fora do laço de eventos)
+    def carregar(self, pedido):
+        from Casos_de_Teste import (SistemaEletrico, alimentador_radial_sintetico, caso_padrao,
+                                    rede_malhada_sintetica)
+
+        if "caso" in pedido:
+            caso = pedido["caso"]
+            if os.path.isfile(caso):
+                from Importação_de_Casos import carregar_caso
+                sistema = carregar_caso(caso)
+            else:
+                sistema = caso_padrao(caso)
+        elif "sintetico" in pedido:
+            opcoes = pedido["sintetico"]
+            gerar = rede_malhada_sintetica if opcoes.get("tipo", "malhada") == "malhada" else alimentador_radial_sintetico
+            sistema = gerar(int(opcoes["n_barras"]), int(opcoes.get("semente", 0)))
+        else:
+            sistema = SistemaEletrico(pedido.get("nome", pedido["rede"]), pedido.get("base_mva", 100.0),
+                                      pedido["barras"], pedido["geradores"], pedido["ramos"])
+
+        S_base, V0, ref, pv, pq = sistema.dados_fluxo()
+        S_carga = (sistema.barras[:, 2] + 1j * sistema.barras[:, 3]) / sistema.base_mva
+        ordenacao = pedido.get("ordenacao")
+        with self.trava_cache:
+            self.cache.obter_sistema(sistema, ordenacao=ordenacao)
+        with self.trava_redes:
+            self.redes[pedido["rede"]] = {
+                "sistema": sistema, "ordenacao": ordenacao, "S_geracao": S_base + S_carga, "S_carga": S_carga,
+                "V0": V0, "V": V0, "trava": threading.Lock(), "descarregada": False,
+            }
+        return {"rede": pedido["rede"], "nome": sistema.nome, "barras": sistema.n_barras,
+                "ramos": int((sistema.ramos[:, 7] != 0).sum()), "ref": len(ref), "pv": len(pv), "pq": len(pq)}
+
+    def resolver(self, pedido):
+        with self.trava_redes:
+            entrada = self.redes[pedido["rede"]]
+        sistema = entrada["sistema"]
+        metodo = pedido.get("metodo", "newton")
+        detalhe = pedido.get("detalhe", True)
+        opcoes = {"tol": float(pedido.get("tol", 1e-6))}
+        if "max_iter" in pedido:
+            opcoes["max_iter"] = int(pedido["max_iter"])
+
+        with self.trava_cache:
+            rede = self.cache.obter_sistema(sistema, ordenacao=entrada["ordenacao"])
+        resolver = {"newton": rede.newton, "desacoplado": rede.desacoplado}[metodo]
+
+        resultados = []
+        with entrada["trava"], rede.trava:
+            # Descarregada enquanto este pedido esperava a trava
+            if entrada["descarregada"]:
+                raise KeyError(pedido["rede"])
+            for cenario in pedido.get("cenarios", [{}]):
+                S_esp = entrada["S_geracao"] - float(cenario.get("escala_carga", 1.0)) * entrada["S_carga"]
+                for barra, (P, Q) in cenario.get("injecoes", {}).items():
+                    S_esp[indice_barra(sistema, barra)] += (P + 1j * Q) / sistema.base_mva
+
+                V_ini = entrada["V"] if pedido.get("partida_quente", True) else entrada["V0"]
+                inicio = time.perf_counter()
+                V, convergiu, iteracoes = resolver(S_esp, V_ini, **opcoes)
+                resultado = {"convergiu": bool(convergiu), "iteracoes": int(iteracoes),
+                             "tempo_s": time.perf_counter() - inicio,
+                             "Vm_min": float(np.abs(V).min()), "Vm_max": float(np.abs(V).max()),
+                             "barra_Vm_min": int(sistema.numeros[np.argmin(np.abs(V))])}
+                if detalhe:
+                    resultado["Vm"] = np.abs(V).tolist()
+                    resultado["Va_graus"] = np.degrees(np.angle(V)).tolist()
+                if convergiu:
+                    entrada["V"] = V
+                resultados.append(resultado)
+        return {"rede": pedido["rede"], "metodo": metodo, "resultados": resultados}
+
+    def descarregar(self, pedido):
+        with self.trava_redes:
+            entrada = self.redes.pop(pedido["rede"])
+        # Espera as soluções em andamento nesta rede
+        with entrada["trava"]:
+            entrada["descarregada"] = True
+        return {"rede": pedido["rede"]}
+
+    def listar(self, pedido):
+        with self.trava_redes:
+            return {"redes": {nome: {"nome": r["sistema"].nome, "barras": r["sistema"].n_barras}
+                              for nome, r in self.redes.items()}}
+
+    def estatisticas(self, pedido):
+        with self.trava_redes:
+            n_redes = len(self.redes)
+        with self.trava_cache:
+            return {"pedidos": self.pedidos, "redes": n_redes, "cache": self.cache.estatisticas()}
+
+    async def tratar(self, pedido):
+        """Executa um pedido e retorna a resposta (erros viram respostas com ok = false)"""
+        identificador = pedido.get("id")
+        try:
+            operacao = {"carregar": self.carregar, "resolver": self.resolver, "descarregar": self.descarregar,
+                        "listar": self.listar, "estatisticas": self.estatisticas}[pedido["operacao"]]
+            self.pedidos += 1
+            loop = asyncio.get_running_loop()
+            rede = pedido.get("rede")
+
+            # Pedidos para uma rede ainda em carregamento esperam o fim da carga
+            if operacao != self.carregar and rede in self.carregamentos:
+                await asyncio.wait([self.carregamentos[rede]])
+            futuro = loop.run_in_executor(self.executor, operacao, pedido)
+            if operacao == self.carregar:
+                self.carregamentos[rede] = futuro
+            try:
+                dados = await futuro
+            finally:
+                if self.carregamentos.get(rede) is futuro:
+                    del self.carregamentos[rede]
+            return {"id": identificador, "ok": True, **dados}
+        except KeyError as erro:
+            return {"id": identificador, "ok": False, "erro": f"Campo ou nome desconhecido: {erro}"}
+        except Exception as erro:
+            return {"id": identificador, "ok": False, "erro": f"{type(erro).__name__}: {erro}"}
+
+
+async def servir(servidor, entrada=sys.stdin, saida=sys.stdout):
+    """Lê pedidos JSON (um por linha) e escreve cada resposta assim que fica pronta
+
+    Cada pedido tem "id" e "operacao"; a resposta traz o mesmo "id", "ok" e os
+    dados ou "erro". Exemplos:
+      {"id": 1, "operacao": "carregar", "rede": "r14", "caso": "ieee14"}
+      {"id": 2, "operacao": "carregar", "rede": "r1k", "sintetico": {"tipo": "malhada", "n_barras": 1000}}
+      {"id": 3, "operacao": "resolver", "rede": "r14", "metodo": "newton",
+       "cenarios": [{"escala_carga": 1.0}, {"escala_carga": 1.2, "injecoes": {"9": [-10, -5]}}]}
+      {"id": 4, "operacao": "listar"}, {"operacao": "descarregar", "rede": "r14"},
+      {"operacao": "estatisticas"}, {"operacao": "encerrar"}
+    "caso" aceita um caso de casos/ ou um arquivo (.m, .json); as injeções
+    extras são dadas em MW/Mvar pela numeração externa das barras.
+    "ordenacao" (opcional em "carregar") escolhe a reordenação das barras
+    usada nas fatorações (Reordenação_de_Barras).
+    """
+    loop = asyncio.get_running_loop()
+    leitor = ThreadPoolExecutor(max_workers=1)
+    pendentes = set()
+
+    def escrever(resposta):
+        saida.write(json.dumps(resposta, ensure_ascii=False) + "\n")
+        saida.flush()
+
+    def responder(tarefa):
+        pendentes.discard(tarefa)
+        escrever(tarefa.result())
+
+    while True:
+        linha = await loop.run_in_executor(leitor, entrada.readline)
+        if not linha:
+            break
+        if not linha.strip():
+            continue
+        try:
+            pedido = json.loads(linha)
+            if not isinstance(pedido, dict):
+                raise ValueError("o pedido deve ser um objeto JSON")
+        except ValueError as erro:
+            escrever({"id": None, "ok": False, "erro": f"Pedido inválido: {erro}"})
+            continue
+        if pedido.get("operacao") == "encerrar":
+            break
+
+        # Cada pedido é uma tarefa; a leitura continua enquanto ele é resolvido
+        tarefa = asyncio.ensure_future(servidor.tratar(pedido))
+        pendentes.add(tarefa)
+        tarefa.add_done_callback(responder)
+
+    if pendentes:
+        await asyncio.wait(pendentes)
+    leitor.shutdown()
+    servidor.executor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Processo residente de fluxo de carga (JSON por linha)")
+    parser.add_argument("--threads", type=int, default=None, help="threads para os pedidos (padrão: CPUs)")
+    parser.add_argument("--memoria-mb", type=float, default=512, help="orçamento do cache de topologias")
+    args = parser.parse_args()
+    asyncio.run(servir(ServidorFluxo(args.threads, int(args.memoria_mb * 2 ** 20))))
+
+
+if __name__ == "__main__":
+    main()
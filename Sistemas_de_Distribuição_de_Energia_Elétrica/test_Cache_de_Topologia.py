@@ -0,0 +1,78 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+
+from Cache_de_Topologia import CacheTopologia
+from Casos_de_Teste import caso_padrao, rede_malhada_sintetica
+from Fatoração_Esparsa import FatoracaoReutilizavel
+from Rastreamento import NIVEL_ITERACAO, Rastreador
+
+
+def _matriz(n=30, semente=0):
+    rng = np.random.default_rng(semente)
+    A = sp.random(n, n, density=0.15, random_state=semente) + sp.diags(n + rng.random(n))
+    return sp.csc_matrix(A)
+
+
+def test_fatoracao_reutilizada_resolve_a_transposta():
+    A = _matriz()
+    fatoracao = FatoracaoReutilizavel()
+    fatoracao.fatorar(A)
+    lu = fatoracao.fatorar(A * 2)
+    assert fatoracao.reutilizacoes == 1
+
+    b = np.arange(A.shape[0], dtype=float)
+    referencia = splu(A * 2)
+    assert np.allclose(lu.solve(b), referencia.solve(b))
+    assert np.allclose(lu.solve(b, trans="T"), referencia.solve(b, trans="T"))
+
+
+def test_acertos_e_chave_com_ordenacao():
+    sistema = caso_padrao("ieee14")
+    cache = CacheTopologia()
+    rede = cache.obter_sistema(sistema)
+    assert cache.obter_sistema(sistema) is rede
+    assert cache.obter_sistema(sistema, ordenacao="amd") is not rede
+    estatisticas = cache.estatisticas()
+    assert (estatisticas["acertos"], estatisticas["falhas"], estatisticas["entradas"]) == (1, 2, 2)
+
+
+def test_remocao_lru_dentro_do_orcamento():
+    sistemas = [rede_malhada_sintetica(200, semente) for semente in range(3)]
+    orcamento = 2 * CacheTopologia().obter_sistema(sistemas[0]).memoria() + 1
+    cache = CacheTopologia(orcamento)
+    primeira = cache.obter_sistema(sistemas[0])
+    cache.obter_sistema(sistemas[1])
+    cache.obter_sistema(sistemas[0])
+    cache.obter_sistema(sistemas[2])
+
+    assert cache.remocoes == 1 and cache.memoria <= orcamento
+    # A menos recente (sistemas[1]) saiu; sistemas[0] continua em cache
+    assert cache.obter_sistema(sistemas[0]) is primeira
+    assert cache.falhas == 3
+
+
+def test_cenarios_reaproveitam_a_ordenacao_do_jacobiano():
+    sistema = caso_padrao("ieee14")
+    S_base, V0, _, _, _ = sistema.dados_fluxo()
+    rede = CacheTopologia().obter_sistema(sistema)
+    for escala in (0.9, 1.0, 1.1):
+        V, convergiu, _ = rede.newton(S_base * escala, V0, tol=1e-10)
+        V_dr, convergiu_dr, _ = rede.desacoplado(S_base * escala, V0, tol=1e-10)
+        assert convergiu and convergiu_dr and np.allclose(V, V_dr, atol=1e-8)
+    fatoracao = rede.fatoracao_jacobiano
+    assert fatoracao.reutilizacoes == fatoracao.fatoracoes - 1
+
+
+def test_newton_em_cache_com_rastreamento_por_iteracao():
+    sistema = caso_padrao("ieee14")
+    S_esp, V0, _, _, _ = sistema.dados_fluxo()
+    rede = CacheTopologia().obter_sistema(sistema)
+
+    for estimar in (False, True):
+        rastreador = Rastreador(NIVEL_ITERACAO, estimar_condicionamento=estimar)
+        V, convergiu, iteracoes = rede.newton(S_esp, V0, tol=1e-9, rastreador=rastreador)
+        assert convergiu
+        assert rastreador.exportar()["iteracao"].size == iteracoes
+    assert np.all(rastreador.exportar()["condicionamento"] > 1)
+    assert rede.fatoracao_jacobiano.reutilizacoes > 0
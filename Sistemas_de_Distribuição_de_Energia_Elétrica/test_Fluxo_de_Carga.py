@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from Casos_de_Teste import caso_padrao
+from Fluxo_de_Carga import main
+
+
+def _salvar_csv(caminho, cabecalho, tabela):
+    np.savetxt(caminho, tabela, delimiter=",", header=",".join(cabecalho), comments="")
+
+
+def test_caso_em_csv_de_barras_ramos_e_geradores(tmp_path, capsys):
+    sistema = caso_padrao("ieee14")
+    arquivos = [str(tmp_path / nome) for nome in ("barras.csv", "ramos.csv", "geradores.csv")]
+    _salvar_csv(arquivos[0], ["barra", "tipo", "Pd", "Qd", "Gs", "Bs", "Vm", "Va"], sistema.barras)
+    _salvar_csv(arquivos[1], ["de", "para", "r", "x", "b", "tap", "defasagem", "estado"], sistema.ramos)
+    _salvar_csv(arquivos[2], ["barra", "Pg", "Qg", "Vg"], sistema.geradores)
+
+    assert main(["newton", "--caso", *arquivos, "--tol", "1e-9"]) == 0
+    assert "Convergiu: True" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("caso", [["barras.csv"], ["ieee14", "ramos.csv"]])
+def test_caso_com_arquivos_incompativeis_e_erro_de_uso(caso, capsys):
+    with pytest.raises(SystemExit) as saida:
+        main(["newton", "--caso", *caso])
+    assert saida.value.code == 2
+    assert "--caso" in capsys.readouterr().err
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from Fluxo_de_Carga_Trifásico import AlimentadorTrifasico, alimentador_trifasico_sintetico
+
+
+def _alimentador(n_barras=300):
+    de, para, Z_fase, fases, S_estrela, S_delta = alimentador_trifasico_sintetico(n_barras)
+    alimentador = AlimentadorTrifasico(n_barras, de, para, Z_fase, fases)
+    return alimentador, alimentador.fases, S_estrela, S_delta
+
+
+def test_varredura_trifasica_converge():
+    alimentador, fases, S_estrela, S_delta = _alimentador()
+    V, I_ramo, convergiu, iteracoes = alimentador.varredura(S_estrela, S_delta, tol=1e-10)
+    assert convergiu and iteracoes > 1
+    assert np.all(np.isfinite(V[fases])) and np.all(np.isnan(V[~fases]))
+    assert np.all(np.abs(V[fases]) < 1.0 + 1e-9)
+
+
+def test_varredura_trifasica_exige_uma_iteracao():
+    alimentador, _, S_estrela, S_delta = _alimentador(20)
+    with pytest.raises(ValueError):
+        alimentador.varredura(S_estrela, S_delta, max_iter=0)
@@ -0,0 +1,30 @@
+import numpy as np
+
+from Fluxo_de_Carga_em_Lote import newton_lote
+from Método_de_Newton import metodo_newton
+from Método_de_Newton_Barra_PQ import PowerFlowNewton
+from Rastreamento import NIVEL_RESUMO, Rastreador
+
+Y = np.array([[1 / (0.05 + 0.25j), -1 / (0.05 + 0.25j)], [-1 / (0.05 + 0.25j), 1 / (0.05 + 0.25j)]])
+
+
+def test_somente_p_reproduz_metodo_newton():
+    P_esp = np.array([-0.8, -0.3, 0.2, 0.5])
+    V2, theta2, iteracoes, convergiu = newton_lote(P_esp, z_shunt=0)
+    assert np.all(convergiu) and np.all(V2 == 1.0)
+
+    for k, P in enumerate(P_esp):
+        rastreador = Rastreador(NIVEL_RESUMO)
+        _, theta2_escalar = metodo_newton(Y, 1.0, 1.0, 0.0, P, rastreador=rastreador)
+        assert rastreador.n_convergidas == 1
+        assert iteracoes[k] == rastreador.total_iteracoes
+        assert abs(theta2[k] - theta2_escalar) < 1e-5
+
+
+def test_pq_reproduz_power_flow_newton():
+    V2, theta2, _, convergiu = newton_lote(-0.2, -0.01, z_shunt=0, tol=1e-10)
+    fluxo = PowerFlowNewton()
+    fluxo.Y_matrix = Y
+    fluxo.P_esp, fluxo.Q_esp = -0.2, -0.01
+    assert fluxo.newton_raphson(1e-10, rastreador=Rastreador(NIVEL_RESUMO))
+    assert convergiu and abs(V2 - fluxo.v2) < 1e-8 and abs(theta2 - fluxo.theta2) < 1e-8
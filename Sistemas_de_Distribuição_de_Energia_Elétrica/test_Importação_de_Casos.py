@@ -0,0 +1,55 @@
+import os
+
+import numpy as np
+
+from Importação_de_Casos import carregar_caso, hash_arquivos, importar_matpower, limpar_cache
+
+CASO_MATPOWER = """function mpc = caso_teste
+mpc.baseMVA = 100;
+mpc.bus = [
+	1	3	0	0	0	0	1	1.02	0	135	1	1.1	0.9;	% referência ] observação
+	2	1	20	10	0	0	1	1	0	135	1	1.1	0.9;
+];
+mpc.gen = [
+	1	25	0	300	-300	1.02	100	1	300	0;
+];
+mpc.branch = [
+	1	2	0.01	0.05	0.02	100	100	100	0	0	1	-360	360;	% linha ] única
+];
+"""
+
+
+def _escrever_caso(diretorio, nome="caso_teste.m", conteudo=CASO_MATPOWER):
+    caminho = os.path.join(diretorio, nome)
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.write(conteudo)
+    return caminho
+
+
+def test_colchete_em_comentario_nao_encerra_matriz(tmp_path):
+    sistema = importar_matpower(_escrever_caso(tmp_path))
+    assert sistema.n_barras == 2
+    assert sistema.ramos.shape[0] == 1
+    np.testing.assert_allclose(sistema.barras[1, 2:4], [20, 10])
+    assert sistema.base_mva == 100
+
+
+def test_cache_limitado(tmp_path):
+    diretorio_cache = str(tmp_path / "cache")
+    caminhos = [_escrever_caso(tmp_path, f"caso_{i}.m", CASO_MATPOWER.replace("20\t10", f"{20 + i}\t10"))
+                for i in range(3)]
+    arquivos = [os.path.join(diretorio_cache, hash_arquivos(caminho) + ".npz") for caminho in caminhos]
+
+    sistema = carregar_caso(caminhos[0], diretorio_cache=diretorio_cache)
+    assert carregar_caso(caminhos[0], diretorio_cache=diretorio_cache).barras[1, 2] == sistema.barras[1, 2]
+    limite = 2 * os.path.getsize(arquivos[0])
+
+    # Cabem dois casos: o caso 0, usado de novo, fica e o caso 1 é removido
+    carregar_caso(caminhos[1], diretorio_cache=diretorio_cache, limite_cache_bytes=limite)
+    os.utime(arquivos[1], (0, 0))
+    carregar_caso(caminhos[0], diretorio_cache=diretorio_cache, limite_cache_bytes=limite)
+    carregar_caso(caminhos[2], diretorio_cache=diretorio_cache, limite_cache_bytes=limite)
+    assert [os.path.exists(arquivo) for arquivo in arquivos] == [True, False, True]
+
+    assert limpar_cache(diretorio_cache, 0) > 0
+    assert os.listdir(diretorio_cache) == []
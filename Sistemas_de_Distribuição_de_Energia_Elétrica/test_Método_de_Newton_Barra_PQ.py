@@ -0,0 +1,32 @@
+import numpy as np
+
+from Método_de_Newton_Barra_PQ import PowerFlowNewton
+from Rastreamento import NIVEL_DESLIGADO, Rastreador
+
+
+def _sistema(Y):
+    fluxo = PowerFlowNewton()
+    fluxo.Y_matrix = Y
+    fluxo.P_esp, fluxo.Q_esp = -0.6, -0.3
+    return fluxo
+
+
+def test_desonesto_converge_para_a_mesma_solucao():
+    y = 1 / (0.05 + 0.25j)
+    Y = np.array([[y, -y], [-y, y]])
+    completo = _sistema(Y)
+    desonesto = _sistema(Y)
+    assert completo.newton_raphson(1e-10, rastreador=Rastreador(NIVEL_DESLIGADO))
+    # O Jacobiano reaproveitado converge linearmente: mais iterações que o Newton completo
+    assert desonesto.newton_raphson(1e-10, 50, rastreador=Rastreador(NIVEL_DESLIGADO), desonesto=True)
+    assert desonesto.fatoracoes < completo.fatoracoes
+    assert abs(completo.v2 - desonesto.v2) < 1e-9
+    assert abs(completo.theta2 - desonesto.theta2) < 1e-9
+
+
+def test_desonesto_para_com_jacobiano_singular():
+    # Sem admitância de transferência o Jacobiano é nulo
+    fluxo = _sistema(np.zeros((2, 2), dtype=complex))
+    assert not fluxo.newton_raphson(rastreador=Rastreador(NIVEL_DESLIGADO), desonesto=True)
+    assert fluxo.fatoracoes == 0
+    assert np.isfinite(fluxo.v2) and np.isfinite(fluxo.theta2)
@@ -0,0 +1,29 @@
+import numpy as np
+
+from Casos_de_Teste import caso_padrao
+from Método_de_Newton_N_Barras import newton_raphson_n_barras
+from Rastreamento import NIVEL_ITERACAO, NIVEL_RESUMO, Rastreador, rastreador_interativo
+
+
+def _resolver(rastreador):
+    sistema = caso_padrao("ieee14")
+    S_esp, V0, ref, pv, pq = sistema.dados_fluxo()
+    return newton_raphson_n_barras(sistema.matriz_admitancia(), S_esp, V0, ref, pv, pq, rastreador=rastreador)
+
+
+def test_condicionamento_apenas_sob_pedido():
+    rastreador = Rastreador(NIVEL_ITERACAO)
+    _, convergiu, iteracoes = _resolver(rastreador)
+    registros = rastreador.exportar()
+    assert convergiu and registros["iteracao"].size == iteracoes
+    assert np.all(np.isnan(registros["condicionamento"]))
+
+    rastreador = Rastreador(NIVEL_ITERACAO, estimar_condicionamento=True)
+    _resolver(rastreador)
+    assert np.all(rastreador.exportar()["condicionamento"] > 1)
+
+
+def test_niveis_sem_buffer():
+    assert Rastreador(NIVEL_RESUMO, estimar_condicionamento=True).estimar_condicionamento is False
+    assert Rastreador(NIVEL_RESUMO).capacidade == 0
+    assert rastreador_interativo().capacidade == 64
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from Casos_de_Teste import caso_padrao
+from Método_de_Newton_N_Barras import newton_raphson_n_barras
+from Redução_de_Kron import (ReducaoKron, complemento_schur, equivalente_rei, equivalente_ward,
+                             reduzir_injecao_nula)
+
+TOL = 1e-12
+
+
+@pytest.fixture(scope="module")
+def ieee14():
+    sistema = caso_padrao("ieee14")
+    S_esp, V0, ref, pv, pq = sistema.dados_fluxo()
+    Ybus = sistema.matriz_admitancia()
+    V, convergiu, _ = newton_raphson_n_barras(Ybus, S_esp, V0, ref, pv, pq, TOL)
+    assert convergiu
+    return Ybus, S_esp, V0, ref, pv, V
+
+
+def test_complemento_schur_igual_ao_denso(ieee14):
+    Ybus = ieee14[0]
+    Y = Ybus.toarray()
+    # Eliminadas: barras 7-8-9 ligadas entre si (índices 6, 7, 8) e a barra 13, isolada entre as eliminadas
+    eliminar = np.array([6, 7, 8, 12])
+    manter = np.setdiff1d(np.arange(Y.shape[0]), eliminar)
+    denso = Y[np.ix_(manter, manter)] - Y[np.ix_(manter, eliminar)] @ np.linalg.solve(
+        Y[np.ix_(eliminar, eliminar)], Y[np.ix_(eliminar, manter)])
+    assert np.allclose(complemento_schur(Ybus, manter, eliminar).toarray(), denso, atol=1e-10)
+    assert np.allclose(ReducaoKron(Ybus, manter).Y_reduzida.toarray(), denso, atol=1e-10)
+
+
+def test_injecao_nula_reproduz_o_caso_completo(ieee14):
+    Ybus, S_esp, V0, ref, pv, V_completa = ieee14
+    modelo = reduzir_injecao_nula(Ybus, S_esp, ref, pv)
+    assert modelo.reducao.eliminar.size > 0
+
+    V_red, convergiu, _ = modelo.resolver(S_esp, V0, tol=TOL)
+    assert convergiu
+    assert np.allclose(V_red, V_completa[modelo.reais], atol=1e-10)
+    assert np.allclose(modelo.expandir(V_red), V_completa, atol=1e-10)
+
+
+def test_injecao_em_barra_eliminada_e_rejeitada(ieee14):
+    Ybus, S_esp, V0, ref, pv, _ = ieee14
+    modelo = reduzir_injecao_nula(Ybus, S_esp, ref, pv)
+    S_cenario = S_esp.copy()
+    S_cenario[modelo.reducao.eliminar[0]] = -0.1
+    with pytest.raises(ValueError):
+        modelo.resolver(S_cenario, V0)
+
+
+@pytest.mark.parametrize("construir", [equivalente_ward, equivalente_rei])
+def test_equivalentes_exatos_no_caso_base(ieee14, construir):
+    Ybus, S_esp, V0, ref, pv, V_completa = ieee14
+    internas = np.arange(7)
+    modelo = construir(Ybus, internas, V_completa, ref, pv)
+
+    V_red, convergiu, _ = modelo.resolver(S_esp, V0, tol=TOL)
+    assert convergiu
+    assert np.array_equal(modelo.reais, internas)
+    assert np.allclose(V_red[:modelo.reais.size], V_completa[internas], atol=1e-10)
+    assert np.allclose(modelo.expandir(V_red), V_completa, atol=1e-8)
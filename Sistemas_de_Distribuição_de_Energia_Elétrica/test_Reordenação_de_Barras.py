@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+
+from Cache_de_Topologia import CacheTopologia
+from Casos_de_Teste import caso_padrao
+from Fatoração_Esparsa import FatoracaoOrdenada
+from Rastreamento import NIVEL_ITERACAO, Rastreador
+from Reordenação_de_Barras import METODOS, ordem_jacobiano, ordenar_barras
+
+
+@pytest.mark.parametrize("metodo", METODOS)
+def test_ordenacoes_sao_permutacoes(metodo):
+    sistema = caso_padrao("ieee14")
+    ordem = ordenar_barras(sistema.matriz_admitancia(), metodo)
+    assert np.array_equal(np.sort(ordem), np.arange(sistema.n_barras))
+
+    _, _, _, pv, pq = sistema.dados_fluxo()
+    ordem_var = ordem_jacobiano(ordem, pv, pq)
+    assert np.array_equal(np.sort(ordem_var), np.arange(len(pv) + 2 * len(pq)))
+
+
+def test_fatoracao_ordenada_resolve_a_transposta():
+    rng = np.random.default_rng(0)
+    n = 30
+    A = sp.csc_matrix(sp.random(n, n, density=0.15, random_state=0) + sp.diags(n + rng.random(n)))
+    fatoracao = FatoracaoOrdenada(rng.permutation(n))
+    lu = fatoracao.fatorar(A)
+    b = np.arange(n, dtype=float)
+    assert np.allclose(lu.solve(b), splu(A).solve(b))
+    assert np.allclose(lu.solve(b, trans="T"), splu(A).solve(b, trans="T"))
+
+    assert fatoracao.reutilizacoes == 0
+    fatoracao.fatorar(A * 2)
+    assert (fatoracao.fatoracoes, fatoracao.reutilizacoes) == (2, 1)
+
+
+@pytest.mark.parametrize("metodo", ["rcm", "amd", "tinney2"])
+def test_fluxo_com_ordenacao_igual_ao_padrao(metodo):
+    sistema = caso_padrao("ieee14")
+    S_esp, V0, _, _, _ = sistema.dados_fluxo()
+    cache = CacheTopologia()
+    rede = cache.obter_sistema(sistema, ordenacao=metodo)
+    assert rede is not cache.obter_sistema(sistema)
+
+    V_padrao, _, _ = cache.obter_sistema(sistema).newton(S_esp, V0, tol=1e-10)
+    rastreador = Rastreador(NIVEL_ITERACAO, estimar_condicionamento=True)
+    V, convergiu, _ = rede.newton(S_esp, V0, tol=1e-10, rastreador=rastreador)
+    assert convergiu and np.allclose(V, V_padrao, atol=1e-8)
+    assert np.all(rastreador.exportar()["condicionamento"] > 1)
+
+    V_dr, convergiu_dr, _ = rede.desacoplado(S_esp, V0, tol=1e-10)
+    assert convergiu_dr and np.allclose(V_dr, V_padrao, atol=1e-8)
@@ -0,0 +1,60 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from Servidor_de_Fluxo_de_Carga import ServidorFluxo
+
+CENARIOS = [{"escala_carga": 0.8 + 0.05 * k} for k in range(8)]
+
+
+def _resolver(servidor, rede):
+    resposta = servidor.resolver({"rede": rede, "cenarios": CENARIOS, "tol": 1e-10, "partida_quente": False})
+    return [r["Vm"] for r in resposta["resultados"]]
+
+
+def test_ids_do_mesmo_caso_compartilham_a_rede_sem_conflito():
+    servidor = ServidorFluxo(n_threads=4)
+    for rede in ("a", "b"):
+        servidor.carregar({"rede": rede, "caso": "ieee14"})
+    assert servidor.cache.estatisticas()["entradas"] == 1
+    referencia = _resolver(servidor, "a")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        respostas = list(executor.map(lambda rede: _resolver(servidor, rede), ["a", "b"] * 6))
+    for resposta in respostas:
+        assert np.allclose(resposta, referencia, atol=1e-12)
+    servidor.executor.shutdown()
+
+
+def test_descarregar_espera_a_solucao_em_andamento():
+    servidor = ServidorFluxo(n_threads=2)
+    servidor.carregar({"rede": "a", "caso": "ieee14"})
+    entrada = servidor.redes["a"]
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with entrada["trava"]:
+            descarga = executor.submit(servidor.descarregar, {"rede": "a"})
+            time.sleep(0.1)
+            assert not descarga.done()
+        assert descarga.result(timeout=5) == {"rede": "a"}
+    assert entrada["descarregada"] and "a" not in servidor.listar({})["redes"]
+    with pytest.raises(KeyError):
+        servidor.resolver({"rede": "a"})
+    servidor.executor.shutdown()
+
+
+def test_injecao_em_barra_inexistente_e_rejeitada():
+    servidor = ServidorFluxo(n_threads=1)
+    servidor.carregar({"rede": "a", "caso": "ieee14"})
+    for barra in ("0", "15", "-1"):
+        with pytest.raises(KeyError):
+            servidor.resolver({"rede": "a", "cenarios": [{"injecoes": {barra: [-10, -5]}}]})
+
+    resposta = asyncio.run(servidor.tratar({"id": 1, "operacao": "resolver", "rede": "a",
+                                            "cenarios": [{"injecoes": {"0": [-10, -5]}}]}))
+    assert resposta["ok"] is False and "0" in resposta["erro"]
+    assert servidor.resolver({"rede": "a", "cenarios": [{"injecoes": {"14": [-10, -5]}}]})["resultados"][0]["convergiu"]
+    servidor.executor.shutdown()
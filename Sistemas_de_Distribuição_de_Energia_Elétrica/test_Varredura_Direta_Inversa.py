@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from Casos_de_Teste import alimentador_radial_sintetico
+from Método_de_Newton_N_Barras import newton_raphson_n_barras
+from Varredura_Direta_Inversa import AlimentadorRadial, alimentador_sintetico
+
+
+def test_varredura_concorda_com_newton():
+    sistema = alimentador_radial_sintetico(200)
+    S_esp, V0, ref, pv, pq = sistema.dados_fluxo()
+    de, para, z_serie, _, _ = sistema.dados_ramos()
+    alimentador = AlimentadorRadial(sistema.n_barras, de, para, z_serie)
+
+    V, I_ramo, convergiu, _ = alimentador.varredura(-S_esp, tol=1e-12)
+    V_newton, convergiu_newton, _ = newton_raphson_n_barras(sistema.matriz_admitancia(), S_esp, V0, ref, pv, pq,
+                                                            tol=1e-12)
+    assert convergiu and convergiu_newton
+    np.testing.assert_allclose(V, V_newton, atol=1e-9)
+    np.testing.assert_allclose(I_ramo, (V[de] - V[para]) / z_serie, atol=1e-8)
+
+
+def test_varredura_exige_uma_iteracao():
+    de, para, z_serie, S_carga = alimentador_sintetico(50)
+    alimentador = AlimentadorRadial(50, de, para, z_serie)
+    with pytest.raises(ValueError):
+        alimentador.varredura(S_carga, max_iter=0)
+    _, _, convergiu, iteracoes = alimentador.varredura(S_carga, max_iter=1)
+    assert not convergiu and iteracoes == 1